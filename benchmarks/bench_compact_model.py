@@ -0,0 +1,47 @@
+# encoding: utf-8
+"""Memory of 50k validated list items, dict-backed vs compact (__slots__) models.
+
+    python benchmarks/bench_compact_model.py
+"""
+import os
+import sys
+import gc
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, FloatField, BoolField, ListField
+
+
+def make_model(compact):
+    @schema_model(compact=compact)
+    class Record(object):
+        id = IntField(required=True, min_value=1)
+        name = StringField(max_length=64)
+        score = FloatField(min_value=0.0)
+        active = BoolField()
+        level = IntField(enums=[1, 2, 3])
+    return Record
+
+
+def measure(compact, count):
+    rows = [{"id": i + 1, "name": "user", "score": 1.5, "active": True, "level": 2} for i in range(count)]
+    field = ListField(item_field=make_model(compact))
+    gc.collect()
+    tracemalloc.start()
+    items = field.validate("rows", rows)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del items
+    return current, peak
+
+
+def main(count=50000):
+    for compact in (False, True):
+        current, peak = measure(compact, count)
+        print("{:<8} retained {:>8.1f} MiB  peak {:>8.1f} MiB  ({:.0f} bytes/item)".format(
+            "compact" if compact else "dict", current / 1048576.0, peak / 1048576.0, float(current) / count))
+
+
+if __name__ == "__main__":
+    main()
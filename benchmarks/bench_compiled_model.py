@@ -0,0 +1,43 @@
+# encoding: utf-8
+"""Throughput of schema_model instantiation, interpreted vs compiled.
+
+    python benchmarks/bench_compiled_model.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, FloatField, BoolField, ListField
+
+
+def make_model(compiled):
+    @schema_model(compiled=compiled)
+    class Record(object):
+        id = IntField(required=True, min_value=1)
+        name = StringField(min_length=1, max_length=64)
+        email = StringField(name="mail", max_length=255)
+        score = FloatField(min_value=0.0, max_value=100.0)
+        active = BoolField()
+        level = IntField(enums=[1, 2, 3])
+        tags = ListField(item_field=StringField(max_length=16))
+    return Record
+
+
+ROW = {"id": 42, "name": "alice", "mail": "alice@example.com", "score": 93.5,
+       "active": True, "level": 2, "tags": ["a", "b", "c"]}
+
+
+def main(number=20000):
+    results = {}
+    for compiled in (False, True):
+        model = make_model(compiled)
+        seconds = min(timeit.repeat(lambda: model(**ROW), number=number, repeat=5))
+        results[compiled] = number / seconds
+        print("{:<12} {:>12.0f} models/s".format("compiled" if compiled else "interpreted", results[compiled]))
+    print("speedup      {:>12.2f}x".format(results[True] / results[False]))
+
+
+if __name__ == "__main__":
+    main()
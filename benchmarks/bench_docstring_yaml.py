@@ -0,0 +1,58 @@
+# encoding: utf-8
+"""Endpoint docstring parsing: pure-Python loader, libyaml loader, hash cache.
+
+    python benchmarks/bench_docstring_yaml.py
+"""
+import os
+import sys
+import timeit
+
+import yaml
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openapi.doccache import SwaggerDocCache, YAML_LOADER
+
+DOC = """
+tags:
+  - pet
+summary: Finds Pets by status
+description: Multiple status values can be provided with comma separated strings
+operationId: findPetsByStatus{}
+parameters:
+  - name: status
+    in: query
+    required: false
+    schema:
+      type: string
+      default: available
+      enum: [available, pending, sold]
+responses:
+  '200':
+    description: successful operation
+    content:
+      application/json:
+        schema:
+          type: array
+          items:
+            $ref: '#/components/schemas/Pet'
+"""
+
+
+def main(count=200):
+    docs = [DOC.format(i) for i in range(count)]
+    warm = SwaggerDocCache()
+    for doc in docs:
+        warm.load(doc)
+    runs = (
+        ("SafeLoader", lambda: [yaml.load(doc, Loader=yaml.SafeLoader) for doc in docs]),
+        (YAML_LOADER.__name__, lambda: [yaml.load(doc, Loader=YAML_LOADER) for doc in docs]),
+        ("cache hit", lambda: [warm.load(doc) for doc in docs]),
+    )
+    for label, run in runs:
+        seconds = min(timeit.repeat(run, number=1, repeat=3))
+        print("{:<12} {:>8.1f} ms for {} docstrings".format(label, seconds * 1000, count))
+    print(warm.stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# encoding: utf-8
+"""Parse and encode with each installed JSON backend (orjson, ujson, simplejson, json).
+
+    python benchmarks/bench_json_backends.py
+"""
+import os
+import sys
+import json
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openapi.schema import schema_model, codec
+from openapi.schema.field import IntField, StringField, FloatField, ListField
+
+
+@schema_model
+class Record(object):
+    id = IntField()
+    name = StringField()
+    score = FloatField()
+
+
+def main(count=1000, number=50):
+    rows = [{"id": i, "name": u"user-{}-é".format(i), "score": i * 0.5, "tags": ["a", "b"]} for i in range(count)]
+    body = json.dumps(rows).encode("utf-8")
+    small = json.dumps(rows[0]).encode("utf-8")
+    models = [Record(id=i, name="n", score=1.5) for i in range(count)]
+    field = ListField(item_field=Record)
+
+    for name in codec.available_json_backends():
+        codec.use_json_backend(name)
+        cases = (
+            ("parse small", lambda: codec.loads(small), 1000),
+            ("parse 1k rows", lambda: codec.loads(body), 1),
+            ("encode 1k rows", lambda: codec.dumps(rows), 1),
+            ("encode 1k models", lambda: codec.dumps(models), 1),
+            ("ListField 1k rows", lambda: field.validate("rows", body), 1),
+        )
+        for label, func, scale in cases:
+            best = min(timeit.repeat(func, number=number * scale, repeat=5)) / (number * scale)
+            print("{:<11} {:<18} {:>10.1f} us".format(name, label, best * 1e6))
+    codec.use_json_backend()
+
+
+if __name__ == "__main__":
+    main()
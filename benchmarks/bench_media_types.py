@@ -0,0 +1,73 @@
+# encoding: utf-8
+"""Body size and encode/decode+validate latency: JSON vs MessagePack vs CBOR.
+
+    python benchmarks/bench_media_types.py
+
+Payloads are lists of numeric records (ids, floats, a vector) as sent
+between services; JSON uses the configured backend, see openapi.schema.codec.
+Decoding includes validation by the request body field.
+"""
+import os
+import sys
+import timeit
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from django.conf import settings
+settings.configure(ALLOWED_HOSTS=["*"])
+
+from django.test import RequestFactory
+from openapi import request_body_validator
+from openapi.media import get_media_codec, available_media_types
+from openapi.schema import schema_model, codec as json_codec
+from openapi.schema.field import IntField, FloatField, BoolField, ListField
+
+factory = RequestFactory()
+
+
+@schema_model
+class Sample(object):
+    id = IntField(min_value=0)
+    sensor = IntField(min_value=0)
+    timestamp = IntField(min_value=0)
+    value = FloatField()
+    ok = BoolField()
+    vector = ListField(item_field=FloatField())
+
+
+FIELD = ListField(name="rows", item_field=Sample)
+
+
+def make_rows(count):
+    rnd = random.Random(1)
+    return [{"id": i, "sensor": rnd.randint(0, 1000), "timestamp": 1700000000000 + i, "value": rnd.random() * 1e3,
+             "ok": i % 3 != 0, "vector": [rnd.random() for _ in range(8)]} for i in range(count)]
+
+
+def encoders():
+    yield "application/json", json_codec.dumps, None
+    for content_type in available_media_types():
+        codec = get_media_codec(content_type)
+        yield content_type, codec.dumps, [content_type]
+
+
+def main():
+    print("JSON backend: {}".format(json_codec.codec.name))
+    if len(list(encoders())) == 1:
+        print("install msgpack and/or cbor2 to compare binary formats")
+    for count in (10, 1000):
+        rows = make_rows(count)
+        number = max(1, 20000 // count)
+        print("\n{} records".format(count))
+        for content_type, dumps, media_types in encoders():
+            body = dumps(rows)
+            request = factory.post("/", body, content_type=content_type)
+            encode = min(timeit.repeat(lambda: dumps(rows), number=number, repeat=5)) / number
+            decode = min(timeit.repeat(lambda: request_body_validator(request, FIELD, media_types or ()),
+                                       number=number, repeat=5)) / number
+            print("{:<20} {:>9} bytes  encode {:>9.1f} us  decode+validate {:>9.1f} us".format(
+                content_type, len(body), encode * 1e6, decode * 1e6))
+
+
+if __name__ == "__main__":
+    main()
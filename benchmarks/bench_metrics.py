@@ -0,0 +1,41 @@
+# encoding: utf-8
+"""Cost of the instrumentation hook on a swagger_api view: disabled vs enabled.
+
+    python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from django.conf import settings
+settings.configure(ALLOWED_HOSTS=["*"])
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, metrics
+from openapi.schema.field import IntField
+
+
+@swagger_api(path="/items/{id}", method="get", parameters=[(IntField(name="id"), "path"), (IntField(name="limit"), "query")])
+def get_item(request, id, limit=0):
+    return HttpResponse("ok")
+
+
+def main(number=20000):
+    request = RequestFactory().get("/", {"limit": "5"})
+    raw = get_item.__wrapped__
+    cases = (
+        ("handler only", lambda: raw(request, 1, limit=5)),
+        ("disabled", lambda: get_item(request, "1")),
+        ("enabled", lambda: get_item(request, "1")),
+    )
+    for label, func in cases:
+        if label == "enabled":
+            metrics.enable()
+        best = min(timeit.repeat(func, number=number, repeat=5))
+        print("{:<13} {:>8.2f} us/call".format(label, best / number * 1e6))
+    metrics.disable()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# encoding: utf-8
+"""Cost of schema_model registration: dir() scan vs the __dict__ scan.
+
+    python benchmarks/bench_registration.py
+
+Models are declared in inheritance chains, each level adding fields to an
+already decorated base, the shape where the dir() scan walked the whole
+MRO and every inherited method again.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import openapi.schema
+from openapi.schema import schema_model, profiling
+from openapi.schema.field import IntField, StringField, FloatField, BoolField
+
+
+def dir_names(cls):
+    return [name for name in dir(cls) if not name.startswith('__')]
+
+
+def declare(depth, width):
+    base = object
+    for level in range(depth):
+        attrs = {}
+        for i in range(width):
+            attrs["f{}_{}".format(level, i)] = (IntField(), StringField(), FloatField(), BoolField())[i % 4]
+        base = schema_model(type("Level{}".format(level), (base,), attrs))
+    return base
+
+
+def main(number=20):
+    fast = openapi.schema._attribute_names
+    for depth, width in ((1, 20), (5, 10), (20, 5)):
+        results = {}
+        for name, scan in (("dir", dir_names), ("dict", fast)):
+            openapi.schema._attribute_names = scan
+            try:
+                results[name] = min(timeit.repeat(lambda: declare(depth, width), number=number, repeat=5)) / number
+            finally:
+                openapi.schema._attribute_names = fast
+        print("depth={:<3} width={:<3} dir {:>9.1f} us  dict {:>9.1f} us  x{:.2f}".format(
+            depth, width, results["dir"] * 1e6, results["dict"] * 1e6, results["dir"] / results["dict"]))
+
+    used = profiling.enable()
+    declare(20, 5)
+    profiling.disable()
+    sys.stdout.write("\n" + used.report(limit=5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# encoding: utf-8
+"""Latency of a GET operation with and without cache=.
+
+    python benchmarks/bench_response_cache.py
+
+The handler serializes a list of models, what a cache hit skips; binding
+and validating the query still runs on every call.
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from django.conf import settings
+settings.configure(ALLOWED_HOSTS=["*"])
+
+from django.test import RequestFactory
+from openapi import swagger_api
+from openapi.cache import ResponseCache
+from openapi.response import json_response
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, FloatField
+
+factory = RequestFactory()
+
+
+@schema_model
+class Item(object):
+    id = IntField()
+    name = StringField()
+    price = FloatField()
+
+
+def make_view(cache):
+    @swagger_api(path="/bench/items/{}".format("cached" if cache else "plain"), method="get",
+                 parameters=[(IntField(name="page", min_value=0), "query"), (IntField(name="size", max_value=500), "query")],
+                 cache=cache)
+    def list_items(request, page=0, size=100):
+        start = page * size
+        return json_response([Item(id=i, name="item{}".format(i), price=i * 0.5) for i in range(start, start + size)])
+    return list_items
+
+
+def main(number=2000):
+    request = factory.get("/", {"page": "2", "size": "100"})
+    for name, cache in (("no cache", None), ("cache=60", ResponseCache(ttl=60))):
+        view = make_view(cache)
+        seconds = min(timeit.repeat(lambda: view(request), number=number // 10 if cache is None else number, repeat=5))
+        seconds /= number // 10 if cache is None else number
+        print("{:<10} {:>10.1f} us".format(name, seconds * 1e6))
+
+
+if __name__ == "__main__":
+    main()
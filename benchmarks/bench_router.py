@@ -0,0 +1,63 @@
+# encoding: utf-8
+"""Resolve path + method: one url() per path vs the single-pattern trie router.
+
+    python benchmarks/bench_router.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from django.conf import settings
+settings.configure(ROOT_URLCONF=__name__, ALLOWED_HOSTS=["*"])
+urlpatterns = []
+
+from django.http import HttpResponse
+from django.urls import get_resolver, clear_url_caches
+from openapi import swagger_api, _Swagger
+from openapi.schema.field import IntField
+
+
+def register(count):
+    for i in range(count):
+        if i % 2:
+            @swagger_api(path="/service{}/items/{{id}}".format(i), method="get", parameters=[(IntField(name="id"), "path")])
+            def view(request, id):
+                return HttpResponse()
+        else:
+            @swagger_api(path="/service{}/items".format(i), method="post")
+            def view(request):
+                return HttpResponse()
+
+
+def resolve_with(patterns, paths):
+    global urlpatterns
+    urlpatterns = patterns
+    clear_url_caches()
+    resolver = get_resolver()
+    resolver.resolve(paths[0])
+    def run():
+        for path in paths:
+            resolver.resolve(path)
+    return run
+
+
+def main(count=800):
+    register(count)
+    paths = ["/service{}/items/42".format(i) for i in range(1, count, 2)] + \
+            ["/service{}/items".format(i) for i in range(0, count, 2)]
+    url_list = resolve_with(_Swagger.gen_django_urls(), paths)
+    trie = resolve_with(_Swagger.gen_django_urls(use_router=True), paths)
+    router = _Swagger.router
+    def trie_and_method():
+        trie()
+        for path in paths:
+            router.resolve(path, "get")
+
+    for label, run in (("url list", url_list), ("router", trie_and_method)):
+        seconds = min(timeit.repeat(run, number=5, repeat=3))
+        print("{:<9} {:>10.0f} resolutions/s".format(label, 5 * len(paths) / seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# encoding: utf-8
+"""to_dict of 10k nested models, generic loop (baseline commit) vs cached serializers.
+
+    python benchmarks/bench_to_dict.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, FloatField, ListField, ObjectField
+
+
+def make_models(compact):
+    @schema_model(compact=compact)
+    class Tag(object):
+        name = StringField()
+        weight = IntField(default=1)
+
+    @schema_model(compact=compact)
+    class Record(object):
+        id = IntField(required=True)
+        name = StringField()
+        score = FloatField()
+        tags = ListField(item_field=Tag)
+        owner = ObjectField(Tag)
+    return Record
+
+
+def main(count=10000, repeat=5):
+    row = {"id": 1, "name": "user", "score": 1.5, "tags": [{"name": "a"}, {"name": "b", "weight": 2}],
+           "owner": {"name": "root"}}
+    for compact in (False, True):
+        Record = make_models(compact)
+        items = [Record(**row) for _ in range(count)]
+        for label, kwargs in (("plain", {}), ("is_default", {"is_default": True}), ("remove", {"remove": ["tags"]})):
+            best = min(timeit.repeat(lambda: [item.to_dict(**kwargs) for item in items], number=1, repeat=repeat))
+            print("{:<8} {:<11} {:>8.1f} ms".format("compact" if compact else "dict", label, best * 1000))
+
+
+if __name__ == "__main__":
+    main()
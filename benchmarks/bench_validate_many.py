@@ -0,0 +1,34 @@
+# encoding: utf-8
+"""Per-object ListField validation vs Model.validate_many on homogeneous rows.
+
+    python benchmarks/bench_validate_many.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from openapi.schema import schema_model, batch
+from openapi.schema.field import IntField, StringField, FloatField, ListField
+
+
+@schema_model
+class Record(object):
+    id = IntField(required=True, min_value=1)
+    name = StringField(min_length=1, max_length=64)
+    score = FloatField(min_value=0.0, max_value=100.0)
+    level = IntField(enums=[1, 2, 3])
+
+
+def main(count=50000):
+    rows = [{"id": i + 1, "name": "user{}".format(i), "score": 50.5, "level": 1 + i % 3} for i in range(count)]
+    per_object = ListField(item_field=Record)
+    batched = ListField(item_field=Record, batch=True)
+    print("numpy: {}".format("yes" if batch.load_numpy() is not None else "no (array fallback)"))
+    for label, field in (("per-object", per_object), ("validate_many", batched)):
+        seconds = min(timeit.repeat(lambda: field.validate("rows", rows), number=1, repeat=3))
+        print("{:<14} {:>10.0f} rows/s".format(label, count / seconds))
+
+
+if __name__ == "__main__":
+    main()
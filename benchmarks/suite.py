@@ -0,0 +1,268 @@
+# encoding: utf-8
+"""Benchmark suite: validation, serialization, request binding and spec generation.
+
+    python benchmarks/suite.py --output before.json
+    python benchmarks/suite.py --baseline before.json --threshold 0.25
+
+Cases scale model width, nesting depth, list length and endpoint count.
+Results are seconds per operation (best of --repeat runs) saved as JSON.
+With --baseline, the exit status is 1 when a case is slower than the
+baseline by more than threshold; compare runs from the same machine.
+"""
+import os
+import sys
+import json
+import time
+import timeit
+import argparse
+import platform
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from django.conf import settings
+settings.configure(ROOT_URLCONF=__name__, ALLOWED_HOSTS=["*"])
+urlpatterns = []
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+import openapi
+from openapi import swagger_api, swagger_setup, _Swagger
+from openapi.schema import schema_model, Fieldset, allowed_paths
+from openapi.schema.field import IntField, StringField, FloatField, BoolField, ListField, ObjectField, AnyOfField
+
+factory = RequestFactory()
+
+# (case id, setup) -- setup() returns the zero-argument callable to time
+CASES = []
+
+
+def case(name):
+    def register(setup):
+        CASES.append((name, setup))
+        return setup
+    return register
+
+
+def make_model(width, depth=0, prefix="M", field="f"):
+    attrs = {}
+    for i in range(width):
+        attrs["{}{}".format(field, i)] = (IntField(min_value=0), StringField(max_length=64), FloatField(min_value=0.0), BoolField())[i % 4]
+    if depth:
+        attrs["child"] = ObjectField(make_model(width, depth - 1, prefix, field))
+    return schema_model(type("{}{}x{}".format(prefix, width, depth), (object,), attrs))
+
+
+def make_row(width, depth=0):
+    row = {}
+    for i in range(width):
+        row["f{}".format(i)] = (i, "value{}".format(i), i + 0.5, True)[i % 4]
+    if depth:
+        row["child"] = make_row(width, depth - 1)
+    return row
+
+
+for width in (5, 20, 80):
+    @case("construct/width={}".format(width))
+    def construct_width(width=width):
+        model, row = make_model(width), make_row(width)
+        return lambda: model(**row)
+
+for depth in (1, 3, 6):
+    @case("construct/depth={}".format(depth))
+    def construct_depth(depth=depth):
+        model, row = make_model(5, depth), make_row(5, depth)
+        return lambda: model(**row)
+
+for length in (10, 100, 1000):
+    @case("validate/list/length={}".format(length))
+    def validate_list(length=length):
+        field, rows = ListField(item_field=make_model(10)), [make_row(10)] * length
+        return lambda: field.validate("rows", rows)
+
+for depth in (1, 3, 6):
+    @case("validate/object/depth={}".format(depth))
+    def validate_object(depth=depth):
+        field, row = ObjectField(make_model(5, depth)), make_row(5, depth)
+        return lambda: field.validate("object", row)
+
+for width in (5, 20):
+    @case("validate/anyof/width={}".format(width))
+    def validate_anyof(width=width):
+        # the row only matches the last candidate, the first has none of its properties
+        field = AnyOfField([make_model(width, prefix="A", field="a"), make_model(width, prefix="B")])
+        row = make_row(width)
+        return lambda: field.validate("anyof", row)
+
+for width in (5, 20, 80):
+    @case("to_dict/width={}".format(width))
+    def to_dict_width(width=width):
+        obj = make_model(width)(**make_row(width))
+        return lambda: obj.to_dict()
+
+for depth in (1, 3, 6):
+    @case("to_dict/depth={}".format(depth))
+    def to_dict_depth(depth=depth):
+        obj = make_model(5, depth)(**make_row(5, depth))
+        return lambda: obj.to_dict()
+
+for depth in (1, 3, 6):
+    @case("to_dict/fieldset/depth={}".format(depth))
+    def to_dict_fieldset(depth=depth):
+        # one property per level, what ?fields=f0,child.f0,... asks for
+        model = make_model(5, depth)
+        paths = ["child." * level + "f0" for level in range(depth + 1)]
+        fieldset = Fieldset.parse(allowed_paths(model, max_depth=depth + 1), paths)
+        obj = model(**make_row(5, depth))
+        return lambda: obj.to_dict(fieldset=fieldset)
+
+for length in (10, 100, 1000):
+    @case("to_dict/list/length={}".format(length))
+    def to_dict_list(length=length):
+        model = schema_model(type("Rows", (object,), {"rows": ListField(item_field=make_model(10))}))
+        obj = model(rows=[make_row(10)] * length)
+        return lambda: obj.to_dict()
+
+for count in (5, 30):
+    @case("request/query/params={}".format(count))
+    def request_query(count=count):
+        fields = [(IntField(name="q{}".format(i), min_value=0), "query") for i in range(count)]
+        query = dict(("q{}".format(i), str(i)) for i in range(count))
+
+        @swagger_api(path="/bench/query{}".format(count), method="get", parameters=fields)
+        def view(request, **params):
+            return params
+        return lambda: view(factory.get("/", query))
+
+for length in (10, 100, 1000):
+    @case("request/body/length={}".format(length))
+    def request_body(length=length):
+        body = json.dumps([make_row(10)] * length)
+
+        @swagger_api(path="/bench/body{}".format(length), method="post",
+                     request_body=ListField(name="rows", item_field=make_model(10)))
+        def view(request, rows):
+            return rows
+        return lambda: view(factory.post("/", body, content_type="application/json"))
+
+
+def reset_swagger():
+    """Fresh registries, returns the previous ones for restore_swagger."""
+    names = ("paths", "models", "parameters", "global_tags", "handlers", "component_schemas", "pending")
+    saved = dict((name, getattr(_Swagger, name)) for name in names)
+    saved["router"] = _Swagger.router
+    for name in names:
+        setattr(_Swagger, name, type(saved[name])())
+    _Swagger.router = None
+    return saved
+
+
+def restore_swagger(saved):
+    for name, value in saved.items():
+        setattr(_Swagger, name, value)
+
+
+DOCSTRING = """
+    list items of a service
+    ---
+    summary: list items
+    responses:
+      '200':
+        description: OK
+    """
+
+for count in (10, 100, 1000):
+    @case("spec/endpoints={}".format(count))
+    def spec_endpoints(count=count):
+        model = make_model(10)
+
+        def run():
+            saved = reset_swagger()
+            try:
+                for i in range(count):
+                    @swagger_api(path="/service{}/items/{{id}}".format(i), method="post", tags=["s{}".format(i % 10)],
+                                 parameters=[(IntField(name="id"), "path"), (StringField(name="q"), "query")],
+                                 request_body=ListField(name="rows", item_field=model),
+                                 responses=[{"response": model}])
+                    def view(request, id, q=None, rows=None):
+                        return HttpResponse()
+                    view.__doc__ = DOCSTRING
+                return swagger_setup(title="bench", version="1.0.0")
+            finally:
+                restore_swagger(saved)
+        return run
+
+
+def measure(func, min_time, repeat):
+    """Best seconds per call, calls per run scaled so a run takes min_time."""
+    number = 1
+    while True:
+        elapsed = timeit.timeit(func, number=number)
+        if elapsed >= min_time:
+            break
+        number *= max(2, min(10, int(min_time / max(elapsed, 1e-9)) + 1))
+    times = [elapsed] + timeit.repeat(func, number=number, repeat=repeat - 1)
+    return min(times) / number, number
+
+
+def run(pattern="", min_time=0.2, repeat=5, out=sys.stdout):
+    results = {}
+    for name, setup in CASES:
+        if pattern and pattern not in name:
+            continue
+        seconds, number = measure(setup(), min_time, repeat)
+        results[name] = {"seconds": seconds, "number": number}
+        out.write("{:<32} {:>12.2f} us\n".format(name, seconds * 1e6))
+    return {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "numpy": openapi.schema.batch.load_numpy() is not None,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold, out=sys.stdout):
+    """Print ratios against baseline, return the ids slower than 1 + threshold."""
+    regressions = []
+    for name, result in sorted(current["results"].items()):
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        ratio = result["seconds"] / before["seconds"]
+        slower = ratio > 1 + threshold
+        if slower:
+            regressions.append(name)
+        out.write("{:<32} {:>12.2f} -> {:>12.2f} us  x{:.2f}{}\n".format(
+            name, before["seconds"] * 1e6, result["seconds"] * 1e6, ratio, "  REGRESSION" if slower else ""))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="openapi benchmark suite")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 is 25%%")
+    parser.add_argument("--filter", default="", help="only cases whose id contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    current = run(args.filter, args.min_time, args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            sys.stderr.write("{} cases regressed by more than {:.0%}: {}\n".format(
+                len(regressions), args.threshold, ", ".join(regressions)))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,9 @@
 import yaml
 import inspect
 import re
+import threading
 from functools import wraps
+from timeit import default_timer
 import logging
 from openapi.schema.field import (
     Field,
@@ -13,9 +15,19 @@ from openapi.schema.field import (
     StringField,
     AnyOfField,
     SchemaBaseModel,
+    string_types,
 )
 from django.conf.urls import url
 from django.http import HttpRequest, HttpResponse
+from openapi.router import Router, iscoroutinefunction
+from openapi.doccache import doc_cache
+from openapi.stream import request_body_stream_validator, NDJSON_CONTENT_TYPE
+from openapi import metrics
+from openapi.media import check_media_types, request_codec
+from openapi.cache import response_cache
+from openapi.schema import profiling
+from openapi.schema import codec as json_codec
+from openapi.schema.fieldset import Fieldset, allowed_paths, nested_model
 
 OPEN_API_VERSION = "3.0.0"
 SWAGGER_DOC_SEPARATOR = "---"
@@ -27,42 +39,196 @@ class _Swagger(object):
     parameters = []
     global_tags = []
     handlers = {}
+    router = None
+    # SchemaModel class -> generated schema, see _component_schema
+    component_schemas = {}
+    pending = []
+    # bumped on every declaration, spec caches compare against it
+    generation = 0
+    # a prebuilt document, see openapi.export.use_spec_artifact
+    artifact = None
+    # guards every write to the registries above, reentrant because
+    # warmup() can record more fragments while it runs
+    lock = threading.RLock()
 
     @staticmethod
-    def gen_django_urls():
-        return [url(r"^%s$" % api_url.lstrip('/'), route_hander(api_url)) for api_url, _ in _Swagger.handlers.items()]
+    def defer(func, *args):
+        """Record a spec fragment builder, run by warmup()."""
+        with _Swagger.lock:
+            _Swagger.pending.append((func, args))
+            _Swagger.generation += 1
 
+    @staticmethod
+    def gen_django_urls(use_router=False, prefix=""):
+        prefix = prefix.lstrip('/')
+        if use_router:
+            with _Swagger.lock:
+                if _Swagger.router is None:
+                    _Swagger.router = Router(_Swagger.handlers)
+            return _Swagger.router.django_urls(prefix)
+        return [url(r"^%s%s$" % (prefix, api_url.lstrip('/')), route_hander(api_url)) for api_url, _ in _Swagger.handlers.items()]
 
-def swagger_setup(
+
+def gen_swagger_doc(
     title="", servers=[], version="", description="", term="", contact={}, tags=[], securitySchemes={}
+):
+    """
+    Assemble the OpenAPI document from everything registered so far.
+
+    With a spec artifact in use, that document is returned as is and the
+    arguments are ignored.
+    """
+    if _Swagger.artifact is not None:
+        return _Swagger.artifact.doc
+    with _Swagger.lock:
+        warmup()
+        for tag in tags:
+            if tag not in _Swagger.global_tags:
+                _Swagger.global_tags.append(tag)
+        # snapshots, later declarations do not change a returned document
+        paths, models = dict(_Swagger.paths), dict(_Swagger.models)
+        parameters, global_tags = list(_Swagger.parameters), list(_Swagger.global_tags)
+    return {
+        "openapi": OPEN_API_VERSION,
+        "info": {
+            "title": title,
+            "version": version,
+            "description": description,
+            "termsOfService": term,
+            "contact": contact,
+        },
+        "servers": servers,
+        "paths": paths,
+        "components": {
+            "schemas": models,
+            "parameters": {param['name']: param for param in parameters},
+            "securitySchemes": securitySchemes
+        },
+        "tags": global_tags,
+    }
+
+
+COMPONENT_REF_PREFIX = "#/components/"
+HTTP_METHODS = ('get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace')
+
+
+def _collect_refs(node, refs):
+    """Add every "#/components/<section>/<name>" $ref under node to refs as (section, name)."""
+    if isinstance(node, dict):
+        ref = node.get("$ref")
+        if isinstance(ref, string_types) and ref.startswith(COMPONENT_REF_PREFIX):
+            section, _, name = ref[len(COMPONENT_REF_PREFIX):].partition("/")
+            refs.add((section, name))
+        for value in node.values():
+            _collect_refs(value, refs)
+    elif isinstance(node, list):
+        for value in node:
+            _collect_refs(value, refs)
+
+
+def _tag_name(tag):
+    return tag.get("name") if isinstance(tag, dict) else tag
+
+
+def gen_swagger_shard(tag=None, prefix=None, **setup_kwargs):
+    """
+    The part of the document for one tag and/or path prefix.
+
+    Only the operations with the tag (under the prefix) are kept, with the
+    components they reach directly or through other components. Raises
+    LookupError when nothing matches. setup_kwargs are those of
+    gen_swagger_doc.
+    """
+    doc = gen_swagger_doc(**setup_kwargs)
+    paths = {}
+    for path, operations in doc["paths"].items():
+        if prefix and not (path == prefix or path.startswith(prefix.rstrip('/') + '/')):
+            continue
+        selected = dict((method, operation) for method, operation in operations.items()
+                        if not tag or method not in HTTP_METHODS or tag in (operation.get("tags") or []))
+        if any(method in HTTP_METHODS for method in selected):
+            paths[path] = selected
+    if not paths:
+        raise LookupError("no operation matches tag={} prefix={}".format(tag, prefix))
+
+    components = doc["components"]
+    reached = set()
+    pending = set()
+    _collect_refs(paths, pending)
+    while pending:
+        ref = pending.pop()
+        if ref in reached:
+            continue
+        reached.add(ref)
+        section, name = ref
+        _collect_refs(components.get(section, {}).get(name), pending)
+    shard_components = dict((section, {}) for section in ("schemas", "parameters"))
+    for section, name in reached:
+        if name in components.get(section, {}):
+            shard_components.setdefault(section, {})[name] = components[section][name]
+    shard_components["securitySchemes"] = components["securitySchemes"]
+
+    used_tags = set()
+    for operations in paths.values():
+        for method, operation in operations.items():
+            if method in HTTP_METHODS:
+                used_tags.update(operation.get("tags") or [])
+    # a new top level, the full document may be shared (spec artifact)
+    shard = dict(doc)
+    shard["paths"] = paths
+    shard["components"] = shard_components
+    shard["tags"] = [t for t in doc["tags"] if _tag_name(t) in used_tags]
+    return shard
+
+
+def swagger_setup(
+    title="", servers=[], version="", description="", term="", contact={}, tags=[], securitySchemes={},
+    use_router=False, url_prefix=""
 ):
     """
     openapi: 3.0
+
+    use_router=True mounts every swagger_api path under one Django pattern
+    resolved by openapi.router.Router instead of one url() per path.
     """
-    _Swagger.global_tags.extend(tags)
     return {
-        "django_urls": _Swagger.gen_django_urls(),
-        "swagger_doc": {
-            "openapi": OPEN_API_VERSION,
-            "info": {
-                "title": title,
-                "version": version,
-                "description": description,
-                "termsOfService": term,
-                "contact": contact,
-            },
-            "servers": servers,
-            "paths": _Swagger.paths,
-            "components": {
-                "schemas": _Swagger.models,
-                "parameters": {param['name']: param for param in _Swagger.parameters},
-                "securitySchemes": securitySchemes
-            },
-            "tags": _Swagger.global_tags,
-        }
+        "django_urls": _Swagger.gen_django_urls(use_router, url_prefix),
+        "swagger_doc": gen_swagger_doc(title=title, servers=servers, version=version, description=description,
+                                       term=term, contact=contact, tags=tags, securitySchemes=securitySchemes),
     }
 
 
+def warmup():
+    """
+    Build every spec fragment recorded by swagger_api and the register_* decorators.
+
+    swagger_setup calls it on demand; call it from AppConfig.ready or a
+    gunicorn hook to pay the cost at boot instead.
+    """
+    with _Swagger.lock:
+        pending = _Swagger.pending
+        # the document is prebuilt, fragments wait until the artifact is dropped
+        if not pending or _Swagger.artifact is not None:
+            return
+        with profiling.timed("spec"):
+            while pending:
+                fragments = list(pending)
+                del pending[:]
+                for func, args in fragments:
+                    func(*args)
+    doc_cache.save()
+
+
+def enable_swagger_doc_cache(path):
+    """Persist parsed endpoint docstrings to path, see openapi.doccache."""
+    doc_cache.configure(path)
+
+
+def swagger_doc_cache_stats():
+    """Hit/miss counts of the endpoint docstring cache."""
+    return doc_cache.stats()
+
+
 def _extract_swagger_definition(endpoint_doc):
     """Extract swagger definition after SWAGGER_DOC_SEPARATOR"""
     endpoint_doc = endpoint_doc.splitlines()
@@ -89,7 +255,8 @@ def build_swagger_docs(endpoint_doc):
                 "parameters": [],
                 "security": [],
             }
-        end_point_swagger_doc = yaml.safe_load(endpoint_doc)
+        with profiling.timed("yaml"):
+            end_point_swagger_doc = doc_cache.load(endpoint_doc)
         if not isinstance(end_point_swagger_doc, dict):
             raise yaml.YAMLError()
         return end_point_swagger_doc
@@ -108,8 +275,8 @@ def _parser_parameter(field):
         return schema
 
     if isinstance(field, ObjectField):
-        if isinstance(field.classobj, SchemaBaseModel):
-            gen_model_doc(field.classobj)
+        if _is_model(field.classobj):
+            return _component_ref(field.classobj)
         schema["$ref"] = "#/components/schemas/{}".format(field.classobj.__name__)
         return schema
 
@@ -120,15 +287,15 @@ def _parser_parameter(field):
     elif isinstance(field, BoolField):
         schema["type"] = "boolean"
     elif isinstance(field, SchemaBaseModel):
-        gen_model_doc(field)
-        schema["$ref"] = "#/components/schemas/{}".format(field.__name__)
-        return schema
+        return _component_ref(type(field))
     elif isinstance(field, StringField):
         schema["type"] = "string"
         if field.min_length:
             schema["minLength"] = field.min_length
         if field.max_length:
             schema["maxLength"] = field.max_length
+        if field.pattern:
+            schema["pattern"] = field.pattern
     elif isinstance(field, AnyOfField):
         schema["type"] = "array"
         schema["anyOf"] = []
@@ -140,9 +307,7 @@ def _parser_parameter(field):
         return schema
     else:
         if issubclass(field, SchemaBaseModel):
-            gen_model_doc(field)
-            schema["$ref"] = "#/components/schemas/{}".format(field.__name__)
-            return schema
+            return _component_ref(field)
 
     if field.default:
         schema["default"] = field.default
@@ -190,34 +355,92 @@ def _gen_model_doc(model):
     return default
 
 
+def _is_model(model):
+    return inspect.isclass(model) and issubclass(model, SchemaBaseModel)
+
+
+def _component_schema(model):
+    """
+    Generate the schema of a SchemaModel class once, memoized by class.
+
+    The entry is stored before its properties are generated, so a model
+    reached again through its own fields resolves to a $ref instead of
+    recursing.
+    """
+    schema = _Swagger.component_schemas.get(model)
+    if schema is None:
+        schema = {"type": "object", "properties": {}}
+        _Swagger.component_schemas[model] = schema
+        schema.update(_gen_model_doc(model))
+    return schema
+
+
+def _component_ref(model):
+    """$ref to model, registering it in components/schemas."""
+    schema = _component_schema(model)
+    _Swagger.models.setdefault(model.__name__, schema)
+    return {"$ref": "#/components/schemas/{}".format(model.__name__)}
+
+
+def _gen_item_doc(model):
+    if _is_model(model):
+        return _component_schema(model)
+    return _gen_model_doc(model)
+
+
 def gen_model_doc(model):
     default = {"type": "array"}
     if isinstance(model, ListField):
-        default["items"] = _gen_model_doc(model.item_field)
+        default["items"] = _gen_item_doc(model.item_field)
     else:
-        default = _gen_model_doc(model)
+        default = _gen_item_doc(model)
     return default
 
 
-def gen_request_body(model, content_type="application/json"):
+def gen_request_body(model, content_type="application/json", media_types=()):
+    """media_types, e.g. application/msgpack, are listed with the same schema."""
+    schema = gen_model_doc(model)
+    content = {content_type: {"schema": schema}}
+    for media_type in media_types:
+        content.setdefault(media_type, {"schema": schema})
     return {
         "description": model.__doc__ if model.__doc__ else "",
-        "content": {content_type: {"schema": gen_model_doc(model)}},
+        "content": content,
     }
 
 
-def gen_response(model, status=200, content_type="application/json"):
+def gen_response(model, status=200, content_type="application/json", stream=False, media_types=()):
+    """
+    stream=True marks a response produced by openapi.stream.streaming_response.
+    With content_type application/x-ndjson the schema is that of one line.
+    media_types are listed with the same schema, streams excepted.
+    """
+    if content_type == NDJSON_CONTENT_TYPE and isinstance(model, ListField):
+        schema = _gen_item_doc(model.item_field)
+    else:
+        schema = gen_model_doc(model)
+    media = {"schema": schema}
+    content = {content_type: media}
+    if stream:
+        media["x-stream"] = True
+    else:
+        for media_type in media_types:
+            content.setdefault(media_type, {"schema": schema})
     return {
         str(status): {
             "description": model.__doc__ if model.__doc__ else "",
-            "content": {content_type: {"schema": gen_model_doc(model)}},
+            "content": content,
         }
     }
 
 
+def _register_model(model):
+    _Swagger.models[model.__name__] = _component_schema(model) if _is_model(model) else gen_model_doc(model)
+
+
 def register_swagger_object_model(model):
     """Register model definition in swagger"""
-    _Swagger.models[model.__name__] = gen_model_doc(model)
+    _Swagger.defer(_register_model, model)
     return model
 
 
@@ -257,30 +480,71 @@ def gen_parameter_doc(model, in_pos):
     return parameters
 
 
+def gen_fieldset_parameters(paths):
+    """The fields and exclude query parameters of sparse_fields, paths are the allowed values."""
+    parameters = []
+    for name, description in (("fields", "only these properties, comma separated dotted paths"),
+                              ("exclude", "leave these properties out, comma separated dotted paths")):
+        parameters.append({
+            "in": "query",
+            "name": name,
+            "description": description,
+            "required": False,
+            "style": "form",
+            "explode": False,
+            "schema": {"type": "array", "items": {"type": "string", "enum": list(paths)}},
+        })
+    return parameters
+
+
+def _sparse_fields_model(sparse_fields, responses):
+    """The model whose properties fields/exclude select."""
+    model = sparse_fields
+    if sparse_fields is True:
+        model = None
+        for response in responses:
+            if type(response) == dict and str(response.get('status', 200)) == '200':
+                model = response.get('response')
+                break
+    found = nested_model(model)
+    if found is None:
+        raise ValueError("sparse_fields needs a schema_model class, or True with a 200 response of one")
+    return found
+
+
+def _register_parameter(model, in_pos):
+    _Swagger.parameters.extend(gen_parameter_doc(model, in_pos))
+
+
 def register_swagger_query_parameter(model):
     """Register parameter definition in swagger"""
-    _Swagger.parameters.extend(gen_parameter_doc(model, "query"))
+    _Swagger.defer(_register_parameter, model, "query")
     return model
 
 
 def register_swagger_header_parameter(model):
     """Register parameter definition in swagger"""
-    _Swagger.parameters.extend(gen_parameter_doc(model, "header"))
+    _Swagger.defer(_register_parameter, model, "header")
     return model
 
 
 def register_swagger_cookie_parameter(model):
     """Register parameter definition in swagger"""
-    _Swagger.parameters.extend(gen_parameter_doc(model, "cookie"))
+    _Swagger.defer(_register_parameter, model, "cookie")
     return model
 
 
 def register_swagger_path_parameter(model):
     """Register parameter definition in swagger"""
-    _Swagger.parameters.extend(gen_parameter_doc(model, "path"))
+    _Swagger.defer(_register_parameter, model, "path")
     return model
 
 
+def _freeze(model):
+    if isinstance(model, Field):
+        model.freeze()
+
+
 def swagger_api(
     path="",
     method="get",
@@ -292,6 +556,10 @@ def swagger_api(
     summary="",
     description="",
     security=[],
+    stream_request_body=False,
+    media_types=[],
+    cache=None,
+    sparse_fields=False,
 ):
     """
     @schema_model
@@ -315,52 +583,84 @@ def swagger_api(
     description="",
 
     security=[]
+
+    stream_request_body=True binds request_body, a named ListField, as a
+    generator of items validated while the JSON array is read from the
+    request, see openapi.stream.
+
+    media_types=["application/msgpack", "application/cbor"] also accepts
+    request bodies in those encodings and lists them in the spec, see
+    openapi.media.
+
+    cache=ResponseCache(ttl=60, vary=["Accept-Language"]) (or cache=60)
+    serves a GET operation from a cache keyed on its validated parameters,
+    see openapi.cache.
+
+    sparse_fields=True accepts ?fields=id,author.name and ?exclude=... for
+    the model of the 200 response (or pass the model class), validates the
+    paths and binds them as the fieldset argument, a Fieldset for to_dict,
+    json_response or media_response. See openapi.schema.fieldset.
     """
-    paths = {}
     method = method.lower()
     if not method in ('get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace'):
         raise ValueError("method is must be (get, post, put, patch, delete, head, options, trace)")
-    
-    if type(path) == str and path != "":
-        paths = _Swagger.paths.get(path, {})
 
     if not summary:
         summary = path.split("/")[-1]
 
-    default = {
-        method: {
-            "summary": "{} {}".format(method, summary),
-            "description": description,
-            "responses": {"200": {"description": "OK"}},
-            "parameters": [],
-            "security": security,
-        }
-    }
-    if tags:
-        default[method]["tags"] = tags
+    if stream_request_body and not (isinstance(request_body, ListField) and request_body.name):
+        raise ValueError("stream_request_body needs a named ListField request_body")
+    check_media_types(media_types)
+    cache = response_cache(cache)
+    if cache is not None and method != "get":
+        raise ValueError("cache is only supported on get operations")
+    if cache is not None and security:
+        # responses depend on who asks, never share them
+        cache = cache.secured()
+    fieldset_model = _sparse_fields_model(sparse_fields, responses) if sparse_fields else None
+    # allowed fieldset paths, listed on first use
+    fieldset_paths = {}
+
+    def get_fieldset_paths():
+        paths = fieldset_paths.get("paths")
+        if paths is None:
+            paths = fieldset_paths["paths"] = tuple(allowed_paths(fieldset_model))
+        return paths
+
+    def gen_path_doc(func):
+        paths = {}
+        if type(path) == str and path != "":
+            # copied, documents already handed out keep their paths
+            paths = dict(_Swagger.paths.get(path, {}))
 
-    for model, pos in parameters:
-        default[method]["parameters"].extend(gen_parameter_doc(model=model, in_pos=pos))
-        
-    if request_body and (isinstance(request_body, (Field, SchemaBaseModel)) or issubclass(request_body, SchemaBaseModel)):
-        default[method]["requestBody"] = gen_request_body(request_body, request_content_type)
-    
-    for response in responses:
-        if type(response) == dict and (isinstance(response['response'], (Field, SchemaBaseModel)) or issubclass(response['response'], SchemaBaseModel)):
-            default[method]["responses"].update(gen_response(response['response'], 
-                                                             response.get('status', 200), 
-                                                             response.get('content_type', 'application/json')))
+        default = {
+            method: {
+                "summary": "{} {}".format(method, summary),
+                "description": description,
+                "responses": {"200": {"description": "OK"}},
+                "parameters": [],
+                "security": security,
+            }
+        }
+        if tags:
+            default[method]["tags"] = tags
 
-    def bind(func):
-        validators = {}
         for model, pos in parameters:
-            if not type(pos) in (str, unicode) or not pos.upper() in ('PATH', 'QUERY'):
-                raise ValueError("Only use 'PATH or 'QUERY")
+            default[method]["parameters"].extend(gen_parameter_doc(model=model, in_pos=pos))
+        if fieldset_model is not None:
+            default[method]["parameters"].extend(gen_fieldset_parameters(get_fieldset_paths()))
             
-            path_query = validators.get(pos.upper(), [])
-            path_query.append(model)
-            validators[pos.upper()] = path_query
+        if request_body and (isinstance(request_body, (Field, SchemaBaseModel)) or issubclass(request_body, SchemaBaseModel)):
+            default[method]["requestBody"] = gen_request_body(request_body, request_content_type, media_types)
         
+        for response in responses:
+            if type(response) == dict and (isinstance(response['response'], (Field, SchemaBaseModel)) or issubclass(response['response'], SchemaBaseModel)):
+                default[method]["responses"].update(gen_response(response['response'], 
+                                                                 response.get('status', 200), 
+                                                                 response.get('content_type', 'application/json'),
+                                                                 response.get('stream', False),
+                                                                 media_types))
+
         doc = inspect.getdoc(func)
         if doc:
             api = build_swagger_docs(doc)
@@ -372,51 +672,136 @@ def swagger_api(
                 
                 for model, pos in parameters:
                     api.get("parameters", []).extend(gen_parameter_doc(model=model, in_pos=pos))
+                if fieldset_model is not None:
+                    api.setdefault("parameters", []).extend(gen_fieldset_parameters(get_fieldset_paths()))
 
                 if request_body and (isinstance(request_body, (Field, SchemaBaseModel)) or issubclass(request_body, SchemaBaseModel)):
-                    api["requestBody"] = gen_request_body(request_body, request_content_type)
+                    api["requestBody"] = gen_request_body(request_body, request_content_type, media_types)
                 for response in responses:
                     if type(response) == dict and \
                         (isinstance(response['response'], (Field, SchemaBaseModel)) or issubclass(response['response'], SchemaBaseModel)):
                         api["responses"].update(gen_response(response['response'], 
                                                              response.get('status', 200), 
-                                                             response.get('content_type', 'application/json')))
+                                                             response.get('content_type', 'application/json'),
+                                                             response.get('stream', False),
+                                                             media_types))
 
                 paths.update({method: api})
             else:
                 paths.update(default)
         else:
             paths.update(default)
+        if cache is not None:
+            cache.document(paths[method])
         _Swagger.paths[path] = paths
 
-        @wraps(func)
-        def api_wraps(*argc, **kwags):
+    def bind(func):
+        used = profiling.profiler
+        if used is None:
+            return bind_view(func)
+        start = default_timer()
+        api_wraps = bind_view(func)
+        used.record("endpoint", "{} {}".format(method.upper(), path), default_timer() - start)
+        return api_wraps
+
+    def bind_view(func):
+        validators = {}
+        _freeze(request_body)
+        for response in responses:
+            if type(response) == dict:
+                _freeze(response.get('response'))
+        for model, pos in parameters:
+            _freeze(model)
+            if not type(pos) in string_types or not pos.upper() in ('PATH', 'QUERY'):
+                raise ValueError("Only use 'PATH or 'QUERY")
+            
+            path_query = validators.get(pos.upper(), [])
+            path_query.append(model)
+            validators[pos.upper()] = path_query
+
+        bind_query = compile_query_validator(validators)
+
+        # the document is only built when the spec is first needed
+        _Swagger.defer(gen_path_doc, func)
+
+        operation = "{} {}".format(method.upper(), path)
+        body_name = getattr(request_body, "name", None) or getattr(request_body, "__name__", None) or "body"
+
+        def bind_parameters(argc):
             request = argc[0]
             new_args = [request]
             new_kwags = {}
             # validator in path
             for (arg, validator) in zip(argc[1:], validators.get('PATH', [])):
                 if isinstance(validator, (StringField, IntField, FloatField, BoolField)):
-                    new_args.append(validator.validate(validator.name, arg))
+                    try:
+                        new_args.append(validator.validate(validator.name, arg))
+                    except ValueError as e:
+                        metrics.tag_field(e, validator.name)
+                        raise
                 else:
                     raise Exception("Data type error.")
                 
             # validator in query
-            new_kwags.update(query_validator(request, validators))
-
+            new_kwags.update(bind_query(request))
+            if fieldset_model is not None:
+                try:
+                    new_kwags["fieldset"] = Fieldset.parse(get_fieldset_paths(), request.GET.get("fields"),
+                                                           request.GET.get("exclude"))
+                except ValueError as e:
+                    metrics.tag_field(e, "fields")
+                    raise
+            return new_args, new_kwags
+
+        def bind_body(request, new_kwags):
             # validator in request body
-            if request_body:
-                new_kwags.update(request_body_validator(request, request_body))
-            return func(*new_args, **new_kwags)
+            try:
+                if stream_request_body and request_codec(request, media_types) is None:
+                    new_kwags.update(request_body_stream_validator(request, request_body))
+                elif stream_request_body:
+                    # binary bodies are decoded whole, the view still gets an iterator
+                    params = request_body_validator(request, request_body, media_types)
+                    new_kwags[request_body.name] = iter(params[request_body.name])
+                elif request_body:
+                    new_kwags.update(request_body_validator(request, request_body, media_types))
+            except ValueError as e:
+                metrics.tag_field(e, body_name)
+                raise
+
+        def bind_arguments(argc):
+            new_args, new_kwags = bind_parameters(argc)
+            bind_body(argc[0], new_kwags)
+            return new_args, new_kwags
+
+        if iscoroutinefunction(func):
+            from openapi.asyncview import async_api_wraps, async_cached
+            handler = async_cached(cache, func, operation) if cache is not None else func
+            api_wraps = async_api_wraps(handler, operation, bind_parameters, bind_body)
+        else:
+            # called with the validated arguments, which the cache keys on
+            handler = cache.wrap(func, operation) if cache is not None else func
+
+            @wraps(func)
+            def api_wraps(*argc, **kwags):
+                collector = metrics.collector
+                if collector is not None:
+                    return metrics.call(collector, operation, handler, argc, bind_parameters, bind_body)
+                new_args, new_kwags = bind_arguments(argc)
+                return handler(*new_args, **new_kwags)
         url_path = re.sub(r'\{\w+\}', r'([^/]+)', path)
-        handers = _Swagger.handlers.get(url_path, {})
-        handers[method] = api_wraps
-        _Swagger.handlers[url_path] = handers
+        with _Swagger.lock:
+            handers = _Swagger.handlers.get(url_path, {})
+            handers[method] = api_wraps
+            _Swagger.handlers[url_path] = handers
         return api_wraps
 
     return bind
 
 def route_hander(url_path):
+    if any(iscoroutinefunction(h) for h in _Swagger.handlers.get(url_path, {}).values()):
+        from openapi.asyncview import async_route_hander
+        return async_route_hander(url_path, _Swagger.handlers)
+
     def hander(*argc, **kwags):
         request = argc[0]
         if not isinstance(request, HttpRequest): 
@@ -428,57 +813,107 @@ def route_hander(url_path):
         return HttpResponse(status=405)
     return hander
 
-def request_body_validator(request, validate_model):
+def request_body_validator(request, validate_model, media_types=()):
     params = {}
     if not isinstance(request, HttpRequest): 
         raise Exception("request is bad.")
     
+    # bytes are parsed by the JSON backend directly, see openapi.schema.codec
     body = request.body if request.body else None
+    codec = request_codec(request, media_types)
+    if codec is not None and body is not None:
+        try:
+            body = codec.loads(body)
+        except Exception as e:
+            raise ValueError("request body is not valid {}: {}".format(codec.content_type, e))
     if isinstance(validate_model, (ListField, ObjectField)):
-        validate_model.is_to_dict = True
-        obj = validate_model.validate(validate_model.name or validate_model.__class__.__name__, body)
+        obj = validate_model.validate(validate_model.name or validate_model.__class__.__name__, body, to_dict=True)
         if validate_model.name:
             params[validate_model.name] = obj
     elif issubclass(validate_model, SchemaBaseModel):
-        params.update(validate_model(body).to_dict())
+        params.update(_model_from_body(validate_model, body).to_dict())
     else:
         raise Exception("Bind query parameters failed.")
     return params
 
-def query_validator(request, validators={}):
-    params = {}
-    if not isinstance(request, HttpRequest): 
-        raise Exception("request is bad.")
-    
-    get_params = request.GET.copy()
-    post_params = request.POST.copy()
-    all_params = get_params.copy()
-    all_params.update(post_params)
+def _model_from_body(validate_model, body):
+    """validate_model built from the declared properties of a JSON or decoded body."""
+    if body is None:
+        body = {}
+    elif isinstance(body, (bytes,) + string_types):
+        body = json_codec.loads(body)
+    if not isinstance(body, dict):
+        raise ValueError("request body should be an object")
+    known = validate_model.get_validate_func_map()
+    try:
+        return validate_model(**dict((name, value) for name, value in body.items() if name in known))
+    except TypeError as e:
+        raise ValueError("request body does not fit {}: {}".format(validate_model.__name__, e))
+
+
+def _object_to_dict(validate):
+    def validator(value):
+        value = validate(value)
+        return value.to_dict() if isinstance(value, SchemaBaseModel) else value
+    return validator
+
+def compile_query_validator(validators={}):
+    """
+    Build the QUERY binding plan once, return bind(request) -> params.
 
+    Wire names are resolved to compiled validators up front, so a request
+    is bound in one pass over request.GET and request.POST without copying
+    them. Repeated keys keep all their values: a scalar field takes the
+    last one, a ListField takes them all (or one JSON array), an
+    ObjectField gets a list for a repeated key.
+    """
+    plan = []
     for validator in validators.get('QUERY', []):
         if isinstance(validator, (StringField, IntField, FloatField, BoolField)):
-            for key, value in all_params.items():
-                if key == validator.name:
-                    params[key] = validator.validate(validator.name, value)
-
+            plan.append(('scalar', validator.name, validator.compile(validator.name)))
         elif isinstance(validator, ListField):
-            for k, v in all_params.items():
-                if k == validator.name and type(v) == list:
-                    validator.is_to_dict = True
-                    lst = validator.validate(validator.name, v)
-                    params[k] = lst
+            plan.append(('list', validator.name, validator.compile(validator.name, to_dict=True)))
         elif isinstance(validator, ObjectField):
-            validator.is_to_dict = True
-            _all_params = {}
-            for key, values in all_params.items():
-                if len(values) > 1:
-                    _all_params[key] = values
-                else:
-                    _all_params[key] = all_params.get(key)
-            params[validator.name] = validator.validate(validator.name, _all_params)
-        elif issubclass(validator, SchemaBaseModel):
-            _params = {key: value for key, value in all_params.items()}
-            params.update(validator(**_params).to_dict())
+            plan.append(('object', validator.name, _object_to_dict(validator.compile(validator.name))))
+        elif isinstance(validator, type) and issubclass(validator, SchemaBaseModel):
+            plan.append(('model', None, validator))
         else:
             raise Exception("Bind query parameters failed.")
-    return params
+    plan = tuple(plan)
+    # ObjectField and SchemaModel validators see every parameter
+    wanted = None if any(kind in ('object', 'model') for kind, _, _ in plan) else \
+        frozenset(name for _, name, _ in plan)
+
+    def bind(request):
+        if not isinstance(request, HttpRequest):
+            raise Exception("request is bad.")
+        raw = {}
+        for source in (request.GET, request.POST):
+            for key, values in source.lists():
+                if wanted is None or key in wanted:
+                    raw[key] = raw[key] + values if key in raw else values
+        params = {}
+        for kind, name, validate in plan:
+            try:
+                if kind == 'scalar':
+                    if name in raw:
+                        params[name] = validate(raw[name][-1])
+                elif kind == 'list':
+                    if name in raw:
+                        values = raw[name]
+                        if len(values) == 1 and values[0].lstrip().startswith('['):
+                            values = values[0]
+                        params[name] = validate(values)
+                elif kind == 'object':
+                    params[name] = validate({key: values if len(values) > 1 else values[-1]
+                                             for key, values in raw.items()})
+                else:
+                    params.update(validate(**{key: values[-1] for key, values in raw.items()}).to_dict())
+            except ValueError as e:
+                metrics.tag_field(e, name or validate.__name__)
+                raise
+        return params
+    return bind
+
+def query_validator(request, validators={}):
+    return compile_query_validator(validators)(request)
@@ -0,0 +1,118 @@
+"""
+async def support for swagger_api, for Django's ASGI stack.
+
+Only imported once an async def handler is declared, so the rest of the
+package keeps working where this syntax does not exist.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async, async_to_sync
+from django.http import HttpRequest, HttpResponse
+from django.urls import URLPattern
+from django.urls.resolvers import RegexPattern
+
+from openapi import metrics
+from openapi.router import iscoroutinefunction
+
+
+def async_api_wraps(func, operation, bind_parameters, bind_body):
+    """
+    Validate the path, query and body like the sync wrapper, then await func.
+
+    Validation is CPU only (ASGIRequest has read the body already), so it
+    runs on the event loop.
+    """
+    @wraps(func)
+    async def api_wraps(*argc, **kwags):
+        used = metrics.collector
+        if used is None:
+            new_args, new_kwags = bind_parameters(argc)
+            bind_body(argc[0], new_kwags)
+            return await func(*new_args, **new_kwags)
+        new_args, new_kwags, start = metrics.bind(used, operation, argc, bind_parameters, bind_body)
+        token = metrics.enter((used, operation))
+        try:
+            response = await func(*new_args, **new_kwags)
+        finally:
+            metrics.leave(token)
+        metrics.finish(used, operation, start, response)
+        return response
+    return api_wraps
+
+
+def async_cached(cache, func, operation):
+    """ResponseCache.wrap for an async def handler."""
+    @wraps(func)
+    async def cached(request, *args, **kwargs):
+        base, response = cache.lookup(operation, request, args, kwargs)
+        if response is not None:
+            return response
+        response = await func(request, *args, **kwargs)
+        if isinstance(response, HttpResponse):
+            response = cache.store(base, request, response)
+        return response
+    return cached
+
+
+async def call_handler(handler, argc, kwags):
+    """Await an async handler, run a sync one in a thread."""
+    if iscoroutinefunction(handler):
+        return await handler(*argc, **kwags)
+    return await sync_to_async(handler)(*argc, **kwags)
+
+
+def run_async(handler, argc, kwags):
+    """Run an async handler to completion from a sync view."""
+    return async_to_sync(handler)(*argc, **kwags)
+
+
+def async_route_hander(url_path, handlers):
+    """route_hander for a path with at least one async def handler."""
+    async def hander(*argc, **kwags):
+        request = argc[0]
+        if not isinstance(request, HttpRequest):
+            return HttpResponse(status=404)
+        _hander = handlers.get(url_path, {}).get(str(request.method).lower(), None)
+        if callable(_hander):
+            return await call_handler(_hander, argc, kwags)
+        return HttpResponse(status=405)
+    return hander
+
+
+def async_dispatch(router):
+    """
+    Router.dispatch as an async view.
+
+    Sync handlers it reaches run through sync_to_async: under ASGI in
+    one shared thread, one at a time, under WSGI after an async_to_sync
+    round trip. async_router_url only sends it the paths with an async
+    def handler.
+    """
+    async def dispatch(request, path="", **kwags):
+        try:
+            handler, args = router.resolve(path, str(request.method))
+        except LookupError:
+            return HttpResponse(status=404)
+        if handler is None:
+            return HttpResponse(status=405)
+        return await call_handler(handler, [request] + args, kwags)
+    return dispatch
+
+
+class _AsyncPathPattern(RegexPattern):
+    """Matches only the paths the router resolves to an async def handler."""
+
+    def __init__(self, router, regex):
+        RegexPattern.__init__(self, regex, is_endpoint=True)
+        self.router = router
+
+    def match(self, path):
+        match = RegexPattern.match(self, path)
+        if match and self.router.is_async(match[2]["path"]):
+            return match
+        return None
+
+
+def async_router_url(router, prefix=""):
+    """The async pattern of Router.django_urls, mounted before the sync one."""
+    return URLPattern(_AsyncPathPattern(router, r"^%s(?P<path>.*)$" % prefix), async_dispatch(router))
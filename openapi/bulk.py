@@ -0,0 +1,185 @@
+# encoding: utf-8
+"""
+Validate JSONL/CSV dumps with a schema_model class on all cores.
+
+    python -m openapi.bulk myapp.models:Record dump-*.jsonl --rejects rejects.jsonl
+
+Every record goes through Model(**record), the same Field.validate rules
+the API applies. Records are read as a stream and validated in chunks by
+a process pool; rejected records are written in input order as JSON lines
+{"file", "line", "error", "record"}. Throughput is reported on stderr and
+the exit status is 1 when any record was rejected.
+"""
+import io
+import sys
+import csv
+import gzip
+import json
+import time
+import argparse
+import importlib
+import multiprocessing
+from collections import deque
+
+from openapi.schema import codec as json_codec
+
+CHUNK_SIZE = 5000
+
+_model = None
+
+
+def load_model(path):
+    """Import "package.module:Model" or "package.module.Model"."""
+    if ":" in path:
+        module_name, name = path.split(":", 1)
+    else:
+        module_name, _, name = path.rpartition(".")
+    if not module_name or not name:
+        raise ValueError("model should be a dotted path like package.module:Model, got {}".format(path))
+    model = importlib.import_module(module_name)
+    for attr in name.split("."):
+        model = getattr(model, attr)
+    return model
+
+
+def _open(path):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return io.open(path, encoding="utf-8", newline="")
+
+
+def _file_format(path, fmt=None):
+    if fmt:
+        return fmt
+    name = path[:-3] if path.endswith(".gz") else path
+    return "csv" if name.lower().endswith(".csv") else "jsonl"
+
+
+def iter_records(path, fmt=None):
+    """
+    Yield (line number, record) from one file.
+
+    JSONL records are the raw line, decoded in the workers. CSV records are
+    dicts of the row, empty cells are left out like a missing JSON key.
+    """
+    with _open(path) as f:
+        if _file_format(path, fmt) == "csv":
+            reader = csv.DictReader(f)
+            for row in reader:
+                # the last physical line of the row, the same for unquoted rows
+                yield reader.line_num, dict((key, value) for key, value in row.items() if value != "" and key is not None)
+        else:
+            for number, line in enumerate(f, 1):
+                if line.strip():
+                    yield number, line
+
+
+def iter_chunks(paths, fmt=None, chunk_size=CHUNK_SIZE):
+    """Yield (path, [(line number, record), ...]), a chunk never spans files."""
+    for path in paths:
+        chunk = []
+        for item in iter_records(path, fmt):
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                yield path, chunk
+                chunk = []
+        if chunk:
+            yield path, chunk
+
+
+def _init_worker(model_path):
+    global _model
+    _model = load_model(model_path)
+
+
+def validate_chunk(task, model=None):
+    """Return (path, record count, [(line number, error, record), ...])."""
+    model = model or _model
+    path, chunk = task
+    rejects = []
+    for number, record in chunk:
+        try:
+            row = json_codec.loads(record) if not isinstance(record, dict) else record
+        except ValueError as e:
+            rejects.append((number, "invalid JSON: {}".format(e), record))
+            continue
+        if not isinstance(row, dict):
+            rejects.append((number, "record should be a JSON object", record))
+            continue
+        try:
+            model(**row)
+        except (ValueError, TypeError) as e:
+            rejects.append((number, str(e), record))
+    return path, len(chunk), rejects
+
+
+def _validate_in_pool(model_path, tasks, workers):
+    """Ordered results with at most 2 chunks per worker in flight."""
+    pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(model_path,))
+    try:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(validate_chunk, (task,)))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def run(model_path, paths, rejects_file=None, workers=None, chunk_size=CHUNK_SIZE, fmt=None):
+    """Validate paths, write rejects to rejects_file, return the summary dict."""
+    workers = workers or multiprocessing.cpu_count()
+    tasks = iter_chunks(paths, fmt, chunk_size)
+    if workers == 1:
+        model = load_model(model_path)
+        results = (validate_chunk(task, model) for task in tasks)
+    else:
+        results = _validate_in_pool(model_path, tasks, workers)
+
+    start = time.time()
+    total = rejected = 0
+    for path, count, rejects in results:
+        total += count
+        rejected += len(rejects)
+        if rejects_file is not None:
+            for number, error, record in rejects:
+                if not isinstance(record, dict):
+                    record = record.rstrip("\r\n")
+                rejects_file.write(json.dumps({"file": path, "line": number, "error": error, "record": record}) + "\n")
+    elapsed = time.time() - start
+    return {
+        "records": total,
+        "valid": total - rejected,
+        "rejected": rejected,
+        "seconds": elapsed,
+        "records_per_second": total / elapsed if elapsed else 0.0,
+        "workers": workers,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m openapi.bulk", description=__doc__.strip().split("\n")[0])
+    parser.add_argument("model", help="schema_model class, package.module:Model")
+    parser.add_argument("files", nargs="+", help="JSONL or CSV files, optionally .gz")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="input format, by file extension by default")
+    parser.add_argument("--rejects", default="-", help="where rejected records go, '-' for stdout")
+    parser.add_argument("--workers", type=int, default=None, help="processes, the number of cores by default")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="records per task")
+    args = parser.parse_args(argv)
+
+    if args.rejects == "-":
+        summary = run(args.model, args.files, sys.stdout, args.workers, args.chunk_size, args.format)
+    else:
+        with io.open(args.rejects, "w", encoding="utf-8") as rejects_file:
+            summary = run(args.model, args.files, rejects_file, args.workers, args.chunk_size, args.format)
+    sys.stderr.write("{records} records, {valid} valid, {rejected} rejected in {seconds:.2f}s "
+                     "({records_per_second:.0f} records/s, {workers} workers)\n".format(**summary))
+    return 1 if summary["rejected"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+# encoding: utf-8
+"""
+Response caching for GET operations that only depend on their parameters.
+
+    @swagger_api(path="/users/{id}", method="get", parameters=[(IntField(name="id"), "path")],
+                 cache=ResponseCache(ttl=60, max_entries=10000, vary=["Accept-Language"]))
+    def get_user(request, id):
+        ...
+
+The key is the operation, the validated path and query values (after
+defaults and type conversion, so ?id=01 and ?id=1 share an entry) and the
+values of the vary headers: those of vary= and those the handler names in
+its own Vary header (media_response sends Vary: Accept), remembered per
+arguments the way Django's cache middleware learns them. Operations
+declaring security are cached private and keyed on Authorization and
+Cookie too. Parameter values must be JSON (or have __json__), anything
+else raises TypeError rather than keying on an unstable repr.
+
+200 responses are stored serialized, by default in a per-process LRU;
+DjangoCacheBackend shares them through Django's cache framework. Responses
+carry ETag, Cache-Control: max-age and Vary, a matching If-None-Match gets
+a 304. A response that sets its own Cache-Control or Vary: * is not
+stored. cache=60 is short for ResponseCache(ttl=60).
+"""
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from django.http import HttpResponse, HttpResponseNotModified
+
+from openapi.schema.codec import json_default
+
+# request headers that identify the user of a secured operation
+CREDENTIAL_HEADERS = ("Authorization", "Cookie")
+
+
+class LRUBackend(object):
+    """At most max_entries entries in this process, least recently used evicted first."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            item = self.entries.get(key)
+            if item is None:
+                return None
+            expires, entry = item
+            if expires <= time.time():
+                del self.entries[key]
+                return None
+            # most recently used last
+            del self.entries[key]
+            self.entries[key] = item
+            return entry
+
+    def set(self, key, entry, ttl):
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = (time.time() + ttl, entry)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class DjangoCacheBackend(object):
+    """Entries in one of settings.CACHES, shared by every process using it."""
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, entry, ttl):
+        self.cache.set(key, entry, ttl)
+
+
+def _etag(content):
+    return '"{}"'.format(hashlib.sha1(content).hexdigest())
+
+
+def _header_name(name):
+    if name.lower() in ("content-type", "content-length"):
+        return name.upper().replace("-", "_")
+    return "HTTP_" + name.upper().replace("-", "_")
+
+
+def _key_default(obj):
+    try:
+        return json_default(obj)
+    except TypeError:
+        raise TypeError("cache keys are built from JSON values, {!r} is not one".format(obj))
+
+
+def _hash(value):
+    raw = json.dumps(value, sort_keys=True, default=_key_default, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _merge_vary(names, more):
+    seen = set(name.lower() for name in names)
+    names = list(names)
+    for name in more:
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names
+
+
+def _vary_names(response):
+    return [name.strip() for name in response.get("Vary", "").split(",") if name.strip()]
+
+
+class ResponseCache(object):
+    """
+    The cache= option of swagger_api.
+
+    ttl is in seconds; max_entries sizes the default LRUBackend; vary names
+    request headers that change the response; private=True sends
+    Cache-Control: private so shared caches keep out.
+    """
+
+    def __init__(self, ttl=60, max_entries=1024, vary=[], backend=None, private=False):
+        if ttl <= 0:
+            raise ValueError("cache ttl should be positive, got {}".format(ttl))
+        self.ttl = ttl
+        self.vary = list(vary)
+        self.backend = backend if backend is not None else LRUBackend(max_entries)
+        self.private = private
+        self.cache_control = "{}, max-age={}".format("private" if private else "public", int(ttl))
+
+    def secured(self):
+        """The cache of an operation declaring security: private, keyed on the credentials."""
+        return ResponseCache(self.ttl, vary=_merge_vary(self.vary, CREDENTIAL_HEADERS), backend=self.backend,
+                             private=True)
+
+    def clear(self):
+        """Drop every entry, for backends with a clear method such as LRUBackend."""
+        self.backend.clear()
+
+    def base_key(self, operation, args, kwargs):
+        """Key of the validated arguments, stable across processes."""
+        return _hash([operation, list(args), kwargs])
+
+    def key(self, base, request, names):
+        headers = [[name.lower(), request.META.get(_header_name(name))] for name in names]
+        return "openapi:{}:{}".format(base, _hash(headers))
+
+    def vary_names(self, base):
+        """vary= plus the names the handler answered with before for these arguments."""
+        return _merge_vary(self.vary, self.backend.get("openapi-vary:{}".format(base)) or [])
+
+    def lookup(self, operation, request, args, kwargs):
+        """(base key, response built from the stored entry or None)."""
+        base = self.base_key(operation, args, kwargs)
+        entry = self.backend.get(self.key(base, request, self.vary_names(base)))
+        if entry is None:
+            return base, None
+        status, content, headers, etag = entry
+        if etag in request.META.get("HTTP_IF_NONE_MATCH", ""):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, status=status)
+        for name, value in headers:
+            if name.lower() == "vary" or not isinstance(response, HttpResponseNotModified):
+                response[name] = value
+        return base, self.decorate(response, etag)
+
+    def store(self, base, request, response):
+        """Save a 200 response, return it with the cache headers."""
+        if response.status_code != 200 or getattr(response, "streaming", False) or response.has_header("Cache-Control"):
+            return response
+        names = _merge_vary(self.vary_names(base), _vary_names(response))
+        if "*" in names:
+            return response
+        response["Vary"] = ", ".join(names)
+        content = response.content
+        etag = _etag(content)
+        headers = [(name, value) for name, value in response.items() if name.lower() != "etag"]
+        self.backend.set("openapi-vary:{}".format(base), names, self.ttl)
+        self.backend.set(self.key(base, request, names), (response.status_code, content, headers, etag), self.ttl)
+        return self.decorate(response, etag)
+
+    def decorate(self, response, etag):
+        response["ETag"] = etag
+        response["Cache-Control"] = self.cache_control
+        names = _merge_vary(_vary_names(response), self.vary)
+        if names:
+            response["Vary"] = ", ".join(names)
+        return response
+
+    def wrap(self, func, operation):
+        """func looked up in the cache first, an async def handler is wrapped by openapi.asyncview."""
+        @wraps(func)
+        def cached(request, *args, **kwargs):
+            base, response = self.lookup(operation, request, args, kwargs)
+            if response is not None:
+                return response
+            response = func(request, *args, **kwargs)
+            if isinstance(response, HttpResponse):
+                response = self.store(base, request, response)
+            return response
+        return cached
+
+    def document(self, operation_doc):
+        """Describe the cache in the operation of the spec."""
+        operation_doc["x-cache"] = {"ttl": self.ttl, "vary": self.vary, "private": self.private}
+        responses = operation_doc.setdefault("responses", {})
+        ok = responses.get("200")
+        if isinstance(ok, dict):
+            headers = ok.setdefault("headers", {})
+            headers["ETag"] = {"description": "hash of the response body", "schema": {"type": "string"}}
+            headers["Cache-Control"] = {"description": self.cache_control, "schema": {"type": "string"}}
+        responses.setdefault("304", {"description": "Not Modified, the If-None-Match ETag is current"})
+        return operation_doc
+
+
+def response_cache(option):
+    """The ResponseCache of a swagger_api cache= value, None for no caching."""
+    if option is None or option is False:
+        return None
+    if isinstance(option, ResponseCache):
+        return option
+    if isinstance(option, (int, float)) and not isinstance(option, bool):
+        return ResponseCache(ttl=option)
+    raise ValueError("cache should be a ResponseCache or a ttl in seconds, got {!r}".format(option))
@@ -0,0 +1,73 @@
+import os
+import copy
+import pickle
+import atexit
+import hashlib
+import threading
+
+import yaml
+
+from openapi.fileutil import write_atomic
+
+# libyaml's loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class SwaggerDocCache(object):
+    """
+    Parsed endpoint docstrings keyed by a hash of the extracted YAML text.
+
+    With a path set, entries are pickled there so unchanged docstrings are
+    not parsed again across restarts. The file is trusted input, keep it
+    somewhere only the deployment can write.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self.lock = threading.Lock()
+
+    def configure(self, path):
+        self.path = path
+        if path and os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    entries = pickle.load(f)
+                if isinstance(entries, dict):
+                    entries.update(self.entries)
+                    self.entries = entries
+            except Exception:
+                # a stale or truncated cache file is just a cold cache
+                pass
+
+    def load(self, text):
+        """yaml.safe_load(text), served from the cache when possible."""
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            value = yaml.load(text, Loader=YAML_LOADER)
+            self.entries[key] = value
+            self.dirty = True
+        # callers update the returned document in place
+        return copy.deepcopy(value)
+
+    def save(self):
+        if not self.path or not self.dirty:
+            return
+        with self.lock:
+            write_atomic(self.path, pickle.dumps(self.entries, 2), ".swagger-doc-cache")
+            self.dirty = False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries),
+                "loader": YAML_LOADER.__name__}
+
+
+doc_cache = SwaggerDocCache()
+atexit.register(doc_cache.save)
@@ -0,0 +1,139 @@
+# encoding: utf-8
+"""
+Build the spec once (e.g. in CI) and serve the file at runtime.
+
+    python -m openapi.export --settings mysite.settings --module myapp.api --output openapi.json
+
+imports the API modules, runs swagger_setup and writes the document with
+sorted keys, next to openapi.json.sha256 holding its content hash. At
+runtime, before the API modules are imported:
+
+    from openapi.export import use_spec_artifact
+    use_spec_artifact("openapi.json")
+
+gen_swagger_doc, swagger_setup and the spec views then serve that file;
+swagger_api still wires up request validation and records its document
+fragments without building them, so gen_model_doc and docstring parsing
+never run unless use_spec_artifact(None) goes back to the built document.
+"""
+import io
+import os
+import sys
+import json
+import hashlib
+import argparse
+import importlib
+
+import yaml
+
+from openapi import _Swagger, swagger_setup
+from openapi.fileutil import write_atomic
+
+HASH_SUFFIX = ".sha256"
+# libyaml's loader when PyYAML was built with it
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _is_yaml(path):
+    return path.endswith((".yaml", ".yml"))
+
+
+def dump_spec(doc, fmt="json"):
+    """Deterministic bytes of doc: sorted keys, fixed separators."""
+    if fmt == "yaml":
+        return yaml.safe_dump(doc, default_flow_style=False, allow_unicode=True, sort_keys=True).encode("utf-8")
+    return json.dumps(doc, sort_keys=True, indent=2, separators=(",", ": "), ensure_ascii=False).encode("utf-8")
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def export_spec(path, **setup_kwargs):
+    """Write the current document to path (.yaml/.yml or JSON) and path.sha256, return the hash."""
+    doc = swagger_setup(**setup_kwargs)["swagger_doc"]
+    content = dump_spec(doc, "yaml" if _is_yaml(path) else "json")
+    digest = content_hash(content)
+    write_atomic(path, content, ".openapi-export")
+    write_atomic(path + HASH_SUFFIX, "{}  {}\n".format(digest, os.path.basename(path)).encode("utf-8"), ".openapi-export")
+    return digest
+
+
+class SpecArtifact(object):
+    """
+    An exported document, read once.
+
+    content is the JSON encoding served as is by the spec views (for a
+    YAML artifact it is encoded once at load), doc the parsed document.
+    """
+
+    def __init__(self, path, verify=True):
+        self.path = path
+        with open(path, "rb") as f:
+            raw = f.read()
+        self.hash = content_hash(raw)
+        if verify and os.path.exists(path + HASH_SUFFIX):
+            with io.open(path + HASH_SUFFIX, encoding="utf-8") as f:
+                fields = f.read().split()
+            if not fields:
+                raise ValueError("{}{} is empty, expected the content hash of {}".format(path, HASH_SUFFIX, path))
+            expected = fields[0]
+            if expected != self.hash:
+                raise ValueError("{} does not match its content hash {}".format(path, expected))
+        text = raw.decode("utf-8")
+        if _is_yaml(path):
+            self.doc = yaml.load(text, Loader=YAML_LOADER)
+            self.content = dump_spec(self.doc)
+        else:
+            self.doc = json.loads(text)
+            self.content = raw
+        if not isinstance(self.doc, dict):
+            raise ValueError("{} is not an OpenAPI document".format(path))
+
+
+def use_spec_artifact(path, verify=True):
+    """Serve the document exported to path from now on, None goes back to building it."""
+    with _Swagger.lock:
+        _Swagger.artifact = SpecArtifact(path, verify) if path else None
+        # recorded fragments stay pending, warmup builds them once the artifact is dropped
+        _Swagger.generation += 1
+    return _Swagger.artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m openapi.export", description="Write the OpenAPI document to a file.")
+    parser.add_argument("--module", action="append", default=[], required=True,
+                        help="module declaring swagger_api views, repeatable")
+    parser.add_argument("--output", required=True, help="file to write, .yaml/.yml for YAML, JSON otherwise")
+    parser.add_argument("--settings", help="Django settings module, when the API modules need one")
+    parser.add_argument("--title", default="")
+    parser.add_argument("--version", default="")
+    parser.add_argument("--description", default="")
+    parser.add_argument("--server", action="append", default=[], help="server URL, repeatable")
+    parser.add_argument("--setup-kwargs", default="{}", help="other swagger_setup arguments as a JSON object")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    from django.conf import settings
+    if args.settings:
+        os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+        import django
+        django.setup()
+    elif not settings.configured and not os.environ.get("DJANGO_SETTINGS_MODULE"):
+        settings.configure()
+
+    for module in args.module:
+        importlib.import_module(module)
+    setup_kwargs = json.loads(args.setup_kwargs)
+    for key in ("title", "version", "description"):
+        if getattr(args, key):
+            setup_kwargs[key] = getattr(args, key)
+    if args.server:
+        setup_kwargs["servers"] = [{"url": url} for url in args.server]
+    digest = export_spec(args.output, **setup_kwargs)
+    sys.stdout.write("{}  {}\n".format(digest, args.output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
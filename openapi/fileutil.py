@@ -0,0 +1,16 @@
+import os
+import tempfile
+
+
+def write_atomic(path, content, prefix=".openapi"):
+    """Write the bytes content to path through a temporary file next to it, then rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=prefix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        getattr(os, "replace", os.rename)(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,53 @@
+# encoding: utf-8
+"""
+Report what importing API modules costs in model and endpoint registration.
+
+    python -m openapi.importcost --settings mysite.settings --module myapp.api
+
+imports the modules with openapi.schema.profiling enabled, runs warmup()
+and prints the totals and the slowest models and endpoints.
+"""
+import os
+import sys
+import argparse
+import importlib
+from timeit import default_timer
+
+from openapi.schema import profiling
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m openapi.importcost",
+                                     description="Report the registration cost of API modules.")
+    parser.add_argument("--module", action="append", default=[], required=True,
+                        help="module declaring models and swagger_api views, repeatable")
+    parser.add_argument("--settings", help="Django settings module, when the API modules need one")
+    parser.add_argument("--limit", type=int, default=10, help="slowest models and endpoints listed")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    from django.conf import settings
+    if args.settings:
+        os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+        import django
+        django.setup()
+    elif not settings.configured and not os.environ.get("DJANGO_SETTINGS_MODULE"):
+        settings.configure()
+
+    from openapi import warmup
+    used = profiling.enable()
+    try:
+        start = default_timer()
+        for module in args.module:
+            importlib.import_module(module)
+        imported = default_timer() - start
+        warmup()
+    finally:
+        profiling.disable()
+    sys.stdout.write("import           {:>10.2f} ms\n".format(imported * 1e3))
+    sys.stdout.write(used.report(args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
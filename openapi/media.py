@@ -0,0 +1,180 @@
+# encoding: utf-8
+"""
+Binary request and response bodies: MessagePack and CBOR.
+
+    @swagger_api(path="/points", method="post", request_body=ListField(name="rows", item_field=Point),
+                 media_types=[MSGPACK_CONTENT_TYPE, CBOR_CONTENT_TYPE])
+    def post_points(request, rows):
+        return media_response(request, rows, media_types=[MSGPACK_CONTENT_TYPE])
+
+A request whose Content-Type is one of media_types is decoded by that
+codec, then validated by the same fields as a JSON body; the spec lists
+the media types next to application/json. media_response picks the
+encoding from the Accept header, JSON when nothing else is acceptable.
+
+msgpack and cbor2 are optional, register_media_codec adds other formats.
+"""
+from django.http import HttpResponse
+
+from openapi.response import JSON_CONTENT_TYPE, json_response, to_data
+from openapi.schema.codec import json_default
+
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+CBOR_CONTENT_TYPE = "application/cbor"
+
+
+class MediaCodec(object):
+    """loads(bytes) and dumps(obj) -> bytes of one media type."""
+
+    def __init__(self, content_type, loads, dumps):
+        self.content_type = content_type
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return "<MediaCodec {}>".format(self.content_type)
+
+
+def _msgpack():
+    import msgpack
+
+    def loads(value):
+        return msgpack.unpackb(value, raw=False)
+
+    def dumps(obj):
+        return msgpack.packb(obj, default=json_default, use_bin_type=True)
+    return MediaCodec(MSGPACK_CONTENT_TYPE, loads, dumps)
+
+
+def _cbor():
+    import cbor2
+
+    def default(encoder, value):
+        encoder.encode(json_default(value))
+
+    def dumps(obj):
+        return cbor2.dumps(obj, default=default)
+    return MediaCodec(CBOR_CONTENT_TYPE, cbor2.loads, dumps)
+
+
+# content type -> factory, called on first use
+_FACTORIES = {MSGPACK_CONTENT_TYPE: _msgpack, CBOR_CONTENT_TYPE: _cbor}
+_codecs = {}
+
+
+def register_media_codec(content_type, loads, dumps):
+    """Accept and emit content_type with loads(bytes) and dumps(obj) -> bytes."""
+    codec = MediaCodec(content_type, loads, dumps)
+    _FACTORIES[content_type] = lambda: codec
+    _codecs[content_type] = codec
+    return codec
+
+
+def unregister_media_codec(content_type):
+    """Forget a codec added by register_media_codec."""
+    _FACTORIES.pop(content_type, None)
+    _codecs.pop(content_type, None)
+
+
+def get_media_codec(content_type):
+    """The codec of content_type, raises ImportError when its package is not installed."""
+    if content_type not in _FACTORIES:
+        raise ValueError("no codec for media type {}".format(content_type))
+    codec = _codecs.get(content_type)
+    if codec is None:
+        codec = _codecs[content_type] = _FACTORIES[content_type]()
+    return codec
+
+
+def check_media_types(media_types):
+    """Fail at declaration on unknown types or codecs whose package is not installed."""
+    for content_type in media_types:
+        if content_type not in _FACTORIES:
+            raise ValueError("media_types should be registered media types, got {}".format(content_type))
+        try:
+            get_media_codec(content_type)
+        except ImportError as e:
+            raise ImportError("media type {} needs its codec package: {}".format(content_type, e))
+
+
+def available_media_types():
+    """The registered media types whose package is installed."""
+    types = []
+    for content_type in sorted(_FACTORIES):
+        try:
+            get_media_codec(content_type)
+            types.append(content_type)
+        except ImportError:
+            pass
+    return types
+
+
+def _media_type(value):
+    return value.split(";", 1)[0].strip().lower()
+
+
+def request_codec(request, media_types):
+    """The codec of the request Content-Type when it is one of media_types, else None."""
+    if not media_types:
+        return None
+    content_type = _media_type(request.META.get("CONTENT_TYPE", ""))
+    if content_type in media_types:
+        return get_media_codec(content_type)
+    return None
+
+
+def parse_accept(value):
+    """[(media type, q), ...] of an Accept header, best first, stable."""
+    accepted = []
+    for index, part in enumerate(value.split(",")):
+        params = part.split(";")
+        media = params[0].strip().lower()
+        if not media:
+            continue
+        q = 1.0
+        for param in params[1:]:
+            key, _, number = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(number)
+                except ValueError:
+                    q = 0.0
+        accepted.append((-q, index, media))
+    accepted.sort()
+    return [(media, -q) for q, _, media in accepted]
+
+
+def negotiate(request, media_types):
+    """The content type to answer with: one of media_types or JSON."""
+    accept = request.META.get("HTTP_ACCEPT", "")
+    offered = [JSON_CONTENT_TYPE] + list(media_types)
+    for media, q in parse_accept(accept):
+        if q <= 0:
+            continue
+        if media in offered:
+            return media
+        if media in ("*/*", "application/*"):
+            return JSON_CONTENT_TYPE
+    return JSON_CONTENT_TYPE
+
+
+def media_response(request, data, status=200, media_types=None, is_default=False, only=[], remove=[], fieldset=None,
+                   **kwargs):
+    """
+    HttpResponse of data encoded in the best media type the client accepts.
+
+    media_types defaults to every installed binary codec; models are
+    converted like json_response does. kwargs go to HttpResponse.
+    """
+    if media_types is None:
+        media_types = available_media_types()
+    content_type = negotiate(request, media_types)
+    if content_type == JSON_CONTENT_TYPE:
+        response = json_response(data, status, is_default, only, remove, fieldset, **kwargs)
+    else:
+        data = to_data(data, is_default, only, remove, fieldset)
+        response = HttpResponse(get_media_codec(content_type).dumps(data), status=status,
+                                content_type=content_type, **kwargs)
+    if media_types:
+        response["Vary"] = "Accept"
+    return response
@@ -0,0 +1,271 @@
+# encoding: utf-8
+"""
+Per-operation instrumentation of the swagger_api wrappers.
+
+Disabled by default: the wrappers only check that `collector` is None.
+
+    from openapi import metrics
+    collector = metrics.enable()
+    urlpatterns.append(url(r'^metrics$', metrics.metrics_view))
+
+Each call of a swagger_api view records, labelled with its operation
+("GET /users/{id}"):
+
+- the seconds spent in the bind (path and query), validate (request
+  body) and handler phases, plus any metrics.timer(phase) blocks run by
+  the handler, e.g. around to_dict;
+- validation failures by parameter;
+- request (Content-Length) and response payload sizes.
+
+Any object with the methods of Collector can be enabled instead of the
+in-process one.
+"""
+import threading
+from bisect import bisect_left
+from timeit import default_timer
+
+from django.http import HttpResponse
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+SECONDS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# the enabled collector, None when instrumentation is off
+collector = None
+
+
+class Collector(object):
+    """The instrumentation surface, every method is a no-op here."""
+
+    def observe(self, operation, phase, seconds):
+        pass
+
+    def failure(self, operation, field):
+        pass
+
+    def size(self, operation, direction, size):
+        """direction is "request" or "response", size in bytes."""
+        pass
+
+
+class Histogram(object):
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for le, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            yield le, total
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _le(value):
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+class InProcessCollector(Collector):
+    """Histograms and counters kept in memory, exported as Prometheus text."""
+
+    def __init__(self, seconds_buckets=SECONDS_BUCKETS, bytes_buckets=BYTES_BUCKETS):
+        self.seconds_buckets = tuple(seconds_buckets)
+        self.bytes_buckets = tuple(bytes_buckets)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.phases = {}
+            self.failures = {}
+            self.sizes = {}
+
+    def observe(self, operation, phase, seconds):
+        key = (operation, phase)
+        with self.lock:
+            histogram = self.phases.get(key)
+            if histogram is None:
+                histogram = self.phases[key] = Histogram(self.seconds_buckets)
+            histogram.observe(seconds)
+
+    def failure(self, operation, field):
+        key = (operation, field)
+        with self.lock:
+            self.failures[key] = self.failures.get(key, 0) + 1
+
+    def size(self, operation, direction, size):
+        key = (operation, direction)
+        with self.lock:
+            histogram = self.sizes.get(key)
+            if histogram is None:
+                histogram = self.sizes[key] = Histogram(self.bytes_buckets)
+            histogram.observe(size)
+
+    def _histogram_lines(self, lines, metric, histograms, label):
+        for (operation, value), histogram in sorted(histograms.items()):
+            labels = 'operation="{}",{}="{}"'.format(_label(operation), label, _label(value))
+            for le, count in histogram.cumulative():
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(metric, labels, _le(le), count))
+            lines.append("{}_sum{{{}}} {}".format(metric, labels, repr(histogram.sum)))
+            lines.append("{}_count{{{}}} {}".format(metric, labels, histogram.count))
+
+    def prometheus_text(self):
+        lines = []
+        with self.lock:
+            lines.append("# HELP openapi_phase_seconds Seconds spent per phase of a swagger_api operation.")
+            lines.append("# TYPE openapi_phase_seconds histogram")
+            self._histogram_lines(lines, "openapi_phase_seconds", self.phases, "phase")
+            lines.append("# HELP openapi_validation_failures_total Rejected requests by parameter.")
+            lines.append("# TYPE openapi_validation_failures_total counter")
+            for (operation, field), count in sorted(self.failures.items()):
+                lines.append('openapi_validation_failures_total{{operation="{}",field="{}"}} {}'.format(
+                    _label(operation), _label(field), count))
+            lines.append("# HELP openapi_payload_bytes Request and response body sizes.")
+            lines.append("# TYPE openapi_payload_bytes histogram")
+            self._histogram_lines(lines, "openapi_payload_bytes", self.sizes, "direction")
+        return "\n".join(lines) + "\n"
+
+
+def enable(new_collector=None):
+    """Turn instrumentation on, return the collector (an InProcessCollector by default)."""
+    global collector
+    collector = new_collector if new_collector is not None else InProcessCollector()
+    return collector
+
+
+def disable():
+    global collector
+    collector = None
+
+
+def metrics_view(request):
+    """Django view exporting the enabled InProcessCollector."""
+    if collector is None or not hasattr(collector, "prometheus_text"):
+        return HttpResponse(status=404)
+    return HttpResponse(collector.prometheus_text(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def tag_field(error, field):
+    """Remember which parameter a ValueError came from, the innermost one wins."""
+    if getattr(error, "field", None) is None:
+        error.field = field
+
+
+# (collector, operation) of the running handler, for timer()
+if contextvars is not None:
+    _current = contextvars.ContextVar("openapi_operation", default=None)
+
+    def enter(current):
+        return _current.set(current)
+
+    def leave(token):
+        _current.reset(token)
+
+    def _get_current():
+        return _current.get()
+else:
+    _local = threading.local()
+
+    def enter(current):
+        previous = getattr(_local, "current", None)
+        _local.current = current
+        return previous
+
+    def leave(token):
+        _local.current = token
+
+    def _get_current():
+        return getattr(_local, "current", None)
+
+
+class timer(object):
+    """
+    Time a block of a handler as its own phase:
+
+        with metrics.timer("serialize"):
+            data = user.to_dict()
+
+    Does nothing outside an instrumented swagger_api call.
+    """
+    __slots__ = ("phase", "current", "start")
+
+    def __init__(self, phase):
+        self.phase = phase
+
+    def __enter__(self):
+        self.current = _get_current()
+        if self.current is not None:
+            self.start = default_timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.current is not None:
+            used, operation = self.current
+            used.observe(operation, self.phase, default_timer() - self.start)
+        return False
+
+
+def bind(used, operation, argc, bind_parameters, bind_body):
+    """
+    Run the bind and validate phases of an instrumented call.
+
+    Returns (new_args, new_kwags, handler start time).
+    """
+    request = argc[0]
+    length = request.META.get("CONTENT_LENGTH")
+    if length:
+        try:
+            used.size(operation, "request", int(length))
+        except ValueError:
+            pass
+    phase, start = "bind", default_timer()
+    try:
+        new_args, new_kwags = bind_parameters(argc)
+        now = default_timer()
+        used.observe(operation, phase, now - start)
+        phase, start = "validate", now
+        bind_body(request, new_kwags)
+    except ValueError as e:
+        used.observe(operation, phase, default_timer() - start)
+        used.failure(operation, getattr(e, "field", None) or "unknown")
+        raise
+    now = default_timer()
+    used.observe(operation, phase, now - start)
+    return new_args, new_kwags, now
+
+
+def finish(used, operation, start, response):
+    used.observe(operation, "handler", default_timer() - start)
+    if not getattr(response, "streaming", False):
+        content = getattr(response, "content", None)
+        if content is not None:
+            used.size(operation, "response", len(content))
+
+
+def call(used, operation, func, argc, bind_parameters, bind_body):
+    """An instrumented call of a sync swagger_api view."""
+    new_args, new_kwags, start = bind(used, operation, argc, bind_parameters, bind_body)
+    token = enter((used, operation))
+    try:
+        response = func(*new_args, **new_kwags)
+    finally:
+        leave(token)
+    finish(used, operation, start, response)
+    return response
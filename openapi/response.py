@@ -0,0 +1,36 @@
+# encoding: utf-8
+"""Responses encoded by the configured JSON backend, see openapi.schema.codec."""
+from django.http import HttpResponse
+
+from openapi.schema.codec import dumps
+from openapi.schema.field import SchemaBaseModel
+
+JSON_CONTENT_TYPE = "application/json"
+
+
+def to_data(data, is_default=False, only=[], remove=[], fieldset=None):
+    """
+    A SchemaModel, or a list of them, through to_dict, anything else as is.
+    A fieldset also filters plain dicts, see openapi.schema.fieldset.
+    """
+    if isinstance(data, SchemaBaseModel):
+        return data.to_dict(is_default=is_default, only=only, remove=remove, fieldset=fieldset)
+    if type(data) == list:
+        return [item.to_dict(is_default=is_default, only=only, remove=remove, fieldset=fieldset)
+                if isinstance(item, SchemaBaseModel) else item if fieldset is None else fieldset.filter(item)
+                for item in data]
+    if fieldset is not None:
+        return fieldset.filter(data)
+    return data
+
+
+def json_response(data, status=200, is_default=False, only=[], remove=[], fieldset=None, **kwargs):
+    """
+    HttpResponse of data encoded as JSON.
+
+    A SchemaModel, or a list of them, goes through to_dict with
+    is_default/only/remove/fieldset; models nested in plain data use
+    __json__. kwargs go to HttpResponse.
+    """
+    kwargs.setdefault("content_type", JSON_CONTENT_TYPE)
+    return HttpResponse(dumps(to_data(data, is_default, only, remove, fieldset)), status=status, **kwargs)
@@ -0,0 +1,142 @@
+import re
+import inspect
+import threading
+
+from django.conf.urls import url
+from django.http import HttpResponse
+
+PARAM_SEGMENT = "([^/]+)"
+
+# async def handlers only exist on python 3.5+
+iscoroutinefunction = getattr(inspect, "iscoroutinefunction", lambda func: False)
+
+
+class _Node(object):
+    __slots__ = ("children", "param", "handlers")
+
+    def __init__(self):
+        self.children = {}
+        self.param = None
+        self.handlers = None
+
+
+class Router(object):
+    """Segment trie over _Swagger.handlers.
+
+    All swagger_api paths are served from one Django pattern; a request is
+    resolved to its {method: handler} map with a single walk over the path
+    segments. Path values are passed positionally to the handler, where the
+    declared PATH fields convert them. Paths with a parameter inside a
+    segment, like /files/{name}.json, are matched by their regex instead.
+    """
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.root = None
+        self.patterns = []
+        self.size = -1
+        self.lock = threading.Lock()
+
+    def build(self):
+        root = _Node()
+        patterns = []
+        # a snapshot, swagger_api may register more while this runs
+        items = list(self.handlers.items())
+        for url_path, methods in items:
+            node = root
+            # PARAM_SEGMENT itself contains a '/', mark it before splitting
+            segments = url_path.replace(PARAM_SEGMENT, "\0").lstrip('/').split('/')
+            if any("\0" in segment and segment != "\0" for segment in segments):
+                patterns.append((re.compile(r"^%s$" % url_path.lstrip('/')), methods))
+                continue
+            for segment in segments:
+                if segment == "\0":
+                    if node.param is None:
+                        node.param = _Node()
+                    node = node.param
+                else:
+                    node = node.children.setdefault(segment, _Node())
+            # the same dict object as in handlers, later methods show up too
+            node.handlers = methods
+        self.root = root
+        self.patterns = patterns
+        self.size = len(items)
+
+    def _walk(self, node, segments, index, args):
+        if index == len(segments):
+            return node.handlers
+        segment = segments[index]
+        child = node.children.get(segment)
+        if child is not None:
+            handlers = self._walk(child, segments, index + 1, args)
+            if handlers is not None:
+                return handlers
+        if node.param is not None and segment:
+            args.append(segment)
+            handlers = self._walk(node.param, segments, index + 1, args)
+            if handlers is not None:
+                return handlers
+            args.pop()
+        return None
+
+    def lookup(self, path):
+        """Return ({method: handler}, args) of path.
+
+        Raises LookupError when no path matches.
+        """
+        if self.size != len(self.handlers):
+            with self.lock:
+                if self.size != len(self.handlers):
+                    self.build()
+        path = path.lstrip('/')
+        args = []
+        handlers = self._walk(self.root, path.split('/'), 0, args)
+        if handlers is None:
+            for pattern, methods in self.patterns:
+                match = pattern.match(path)
+                if match:
+                    return methods, list(match.groups())
+            raise LookupError(path)
+        return handlers, args
+
+    def is_async(self, path):
+        """Whether path resolves to a path with an async def handler."""
+        try:
+            handlers, _ = self.lookup(path)
+        except LookupError:
+            return False
+        return any(iscoroutinefunction(handler) for handler in handlers.values())
+
+    def resolve(self, path, method):
+        """Return (handler, args), handler is None when the method is not allowed.
+
+        Raises LookupError when no path matches.
+        """
+        handlers, args = self.lookup(path)
+        return handlers.get(method.lower()), args
+
+    def dispatch(self, request, path="", **kwags):
+        try:
+            handler, args = self.resolve(path, str(request.method))
+        except LookupError:
+            return HttpResponse(status=404)
+        if handler is None:
+            return HttpResponse(status=405)
+        if iscoroutinefunction(handler):
+            # declared after django_urls, when no async pattern was mounted
+            from openapi.asyncview import run_async
+            return run_async(handler, [request] + args, kwags)
+        return handler(request, *args, **kwags)
+
+    def django_urls(self, prefix=""):
+        """Catch-all patterns, mount them last or under their own prefix.
+
+        Paths with an async def handler get an async view, matched first;
+        every other path keeps the sync view, so one async handler does
+        not move the sync ones to a thread.
+        """
+        patterns = [url(r"^%s(?P<path>.*)$" % prefix, self.dispatch)]
+        if any(iscoroutinefunction(handler) for methods in self.handlers.values() for handler in methods.values()):
+            from openapi.asyncview import async_router_url
+            patterns.insert(0, async_router_url(self, prefix))
+        return patterns
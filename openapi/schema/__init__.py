@@ -1,23 +1,98 @@
+from timeit import default_timer
 from .field import *
+from .compiler import compile_init
+from .compact import CompactSchemaModel, compact_model
+from .batch import BatchValidationError, validate_many as batch_validate_many
+from .serializer import projection_key, get_serializer
+from .fieldset import Fieldset, allowed_paths
+from . import profiling
+
+
+def _attribute_names(cls):
+    """
+    The names dir(cls) would list, dunders left out, from the __dict__ of
+    each class in the MRO. Bases built by schema_model already remember
+    theirs in __schema_attrs__, so their own MRO is not walked again.
+    """
+    names = set()
+    covered = set()
+    for klass in cls.__mro__:
+        if klass in covered or klass is object:
+            continue
+        remembered = klass.__dict__.get("__schema_attrs__")
+        if remembered is not None:
+            names.update(remembered)
+            covered.update(klass.__mro__)
+        else:
+            names.update(name for name in klass.__dict__ if not name.startswith('__'))
+    return sorted(names)
+
+
+def _remember_attrs(model, attrs):
+    # the non-callable attributes seen on cls plus those the model adds
+    attrs = set(attrs)
+    for name in model.__dict__:
+        if not name.startswith('__') and not callable(getattr(model, name)):
+            attrs.add(name)
+    model.__schema_attrs__ = frozenset(attrs)
+    return model
+
+
+def schema_model(cls=None, is_default=False, compiled=False, compact=False):
+    """
+    @schema_model
+    class Query(object):
+        start = IntField()
+
+    compiled=True builds one specialized __init__ per model at decoration
+    time instead of interpreting validate_props on every instantiation.
+
+    @schema_model(compiled=True)
+    class Query(object):
+        start = IntField()
+
+    compact=True keeps values in fixed __slots__ instead of a per-instance
+    __dict__ (always compiled). The generated class derives from
+    CompactSchemaModel rather than from the decorated class.
+    """
+    if cls is None:
+        return lambda cls: schema_model(cls, is_default=is_default, compiled=compiled, compact=compact)
 
-def schema_model(cls, is_default=False):
     if not isinstance(cls, type):
         raise ValueError("{} is not object.".format(cls.__name__))
 
+    used = profiling.profiler
+    if used is None:
+        return _build_model(cls, is_default, compiled, compact)
+    start = default_timer()
+    model = _build_model(cls, is_default, compiled, compact)
+    used.record("model", "{}.{}".format(cls.__module__, cls.__name__), default_timer() - start)
+    return model
+
+
+def _build_model(cls, is_default, compiled, compact):
     validate_props = {}
     required_props = {}
-    for field_name in dir(cls):
-        if not field_name.startswith('__'):
-            field_value = getattr(cls, field_name)
+    attrs = []
+    for field_name in _attribute_names(cls):
+        field_value = getattr(cls, field_name)
+        if not callable(field_value):
+            attrs.append(field_name)
             if isinstance(field_value, Field):
+                field_value.freeze()
                 alisa_name =  field_value.get_name()
                 if alisa_name:
                     field_name = alisa_name
                 if field_value.get_required():
                     required_props[field_name] = field_value.get_required()
-            if not callable(field_value):
-                validate_props[field_name] = field_value
+            validate_props[field_name] = field_value
+
+    if compact:
+        return _remember_attrs(compact_model(cls, validate_props, required_props, is_default), attrs)
     
+    # to_dict functions by projection_key, see openapi.schema.serializer
+    serializers = {}
+
     class SchemaModel(cls, SchemaBaseModel):
         __doc__ = cls.__doc__
         __name__ = cls.__name__
@@ -46,6 +121,15 @@ def schema_model(cls, is_default=False):
         def get_validate_func_map(self):
             return validate_props
 
+        @classmethod
+        def validate_many(model, rows):
+            """Validate a list of row dicts column by column, see openapi.schema.batch."""
+            def new_instance(pairs):
+                obj = model.__new__(model)
+                obj.__dict__.update(pairs)
+                return obj
+            return batch_validate_many(model, rows, validate_props, required_props, is_default, new_instance)
+
         def __getattr__(self, item):
             if item in self.__dict__:
                 return self.__dict__[item]
@@ -83,28 +167,18 @@ def schema_model(cls, is_default=False):
                     rst.append(value)
             return rst
 
-        def to_dict(self, is_default=False, only=[], remove=[]):
-            _dict = {}
-            last_only = set(only).difference(set(remove))
-            last_remove = set(remove).difference(set(only))
-            for attr in self.__dict__:
-                if (last_only and not attr in last_only) or attr in last_remove:
-                    continue
-                if not attr.startswith('_'):
-                    value = getattr(self, attr)
-                    if type(value) == list:
-                        value = self.__list_to_dict__(value,is_default=is_default,only=only, remove=remove)
-                    elif isinstance(value, SchemaBaseModel):
-                        value = value.to_dict(is_default=is_default,only=only, remove=remove)
-                    elif value is None:
-                        default_field = validate_props.get(attr, None)
-                        if isinstance(default_field, Field) and is_default:
-                            value = default_field.get_default()
-                    _dict[attr] = value
-            return _dict
+        def to_dict(self, is_default=False, only=[], remove=[], fieldset=None):
+            if fieldset is not None:
+                return self.__serialize__(fieldset.key(is_default))
+            return self.__serialize__(projection_key(is_default, only, remove))
+
+        def __serialize__(self, key):
+            return get_serializer(serializers, validate_props, key)(self)
         
         def to_json(self):
-            self.to_dict(is_default=True)
+            return self.to_dict(is_default=True)
         
     SchemaModel.__name__ = cls.__name__
-    return SchemaModel
\ No newline at end of file
+    if compiled:
+        SchemaModel.__init__ = compile_init(cls.__name__, validate_props, required_props, is_default)
+    return _remember_attrs(SchemaModel, attrs)
@@ -0,0 +1,213 @@
+from array import array
+
+from .field import Field, IntField, FloatField, StringField, string_types
+
+# set by load_numpy, on the first validate_many call
+numpy = None
+_numpy_loaded = False
+
+_MISSING = object()
+
+
+def load_numpy():
+    """numpy when it is installed, else None; imported once, on first use."""
+    global numpy, _numpy_loaded
+    if not _numpy_loaded:
+        try:
+            import numpy as module
+        except ImportError:
+            module = None
+        numpy = module
+        _numpy_loaded = True
+    return numpy
+
+
+class BatchValidationError(ValueError):
+    """Raised by validate_many, errors is a list of (row index, message)."""
+    def __init__(self, errors):
+        self.errors = errors
+        rows = len(set(index for index, _ in errors))
+        ValueError.__init__(self, "{} rows failed validation, first error at row {}: {}".format(
+            rows, errors[0][0], errors[0][1]))
+
+
+def _vector(values, typecode):
+    """Pack a column of numbers for bulk comparisons."""
+    try:
+        if numpy is not None:
+            return numpy.asarray(values, dtype=numpy.float64 if typecode == 'd' else numpy.int64)
+        return array(typecode, values)
+    except (OverflowError, TypeError, ValueError):
+        return values
+
+
+def _select(indexes, vector, bound, lower):
+    """Return the row indexes whose value is below (lower) or above bound."""
+    if numpy is not None and isinstance(vector, numpy.ndarray):
+        mask = vector < bound if lower else vector > bound
+        return [indexes[i] for i in numpy.flatnonzero(mask)]
+    if lower and min(vector) >= bound or not lower and max(vector) <= bound:
+        return []
+    if lower:
+        return [i for i, v in zip(indexes, vector) if v < bound]
+    return [i for i, v in zip(indexes, vector) if v > bound]
+
+
+def _not_in(indexes, vector, values, enums):
+    if numpy is not None and isinstance(vector, numpy.ndarray):
+        try:
+            return [indexes[i] for i in numpy.flatnonzero(numpy.isin(vector, enums, invert=True))]
+        except (TypeError, ValueError):
+            pass
+    try:
+        enums = set(enums)
+    except TypeError:
+        pass
+    return [i for i, v in zip(indexes, values) if v not in enums]
+
+
+def _check_range(label, indexes, vector, min_value, max_value, errors):
+    if not indexes:
+        return
+    if min_value is not None:
+        for i in _select(indexes, vector, min_value, True):
+            errors.append((i, "{} should be larger than {}".format(label, min_value)))
+    if max_value is not None:
+        for i in _select(indexes, vector, max_value, False):
+            errors.append((i, "{} should be smaller than {}".format(label, max_value)))
+
+
+def _validate_number_column(field, label, indexes, raw, errors):
+    cast, typecode, type_name = (int, 'q', 'integer') if type(field) is IntField else (float, 'd', 'float')
+    try:
+        values = list(map(cast, raw))
+    except (ValueError, TypeError):
+        values, valid = [], []
+        for i, v in zip(indexes, raw):
+            try:
+                values.append(cast(v))
+                valid.append(i)
+            except (ValueError, TypeError):
+                errors.append((i, "{} should be {} type".format(label, type_name)))
+        indexes = valid
+
+    vector = _vector(values, typecode)
+    _check_range(label, indexes, vector, field.min_value, field.max_value, errors)
+    if field.enums and indexes:
+        for i in _not_in(indexes, vector, values, field.enums):
+            errors.append((i, "{} should be in {}".format(label, field.enums)))
+    return indexes, values
+
+
+def _validate_string_column(field, label, indexes, raw, errors):
+    valid, values = [], []
+    for i, v in zip(indexes, raw):
+        if type(v) in string_types:
+            valid.append(i)
+            values.append(v)
+        else:
+            errors.append((i, "{} should be string type".format(label)))
+
+    if valid and (field.min_length is not None or field.max_length is not None):
+        lengths = list(map(len, values))
+        vector = _vector(lengths, 'q')
+        if field.min_length is not None:
+            for i in _select(valid, vector, field.min_length, True):
+                errors.append((i, "{} should be at least {} characters long".format(label, field.min_length)))
+        if field.max_length is not None:
+            for i in _select(valid, vector, field.max_length, False):
+                errors.append((i, "{} maximum length should not exceed {} characters".format(label, field.max_length)))
+    if field.matcher is not None:
+        match = field.matcher
+        for i, v in zip(valid, values):
+            if match(v) is None:
+                errors.append((i, '{}: {} is NOT fully matched pattern.'.format(label, field.pattern)))
+    if field.format_checker is not None:
+        check = field.format_checker
+        for i, v in zip(valid, values):
+            if not check(v):
+                errors.append((i, "{} should be {} format".format(label, field.format)))
+    if field.enums and valid:
+        for i in _not_in(valid, values, values, field.enums):
+            errors.append((i, "{} should be in {}".format(label, field.enums)))
+    return valid, values
+
+
+def _validate_column(field, label, indexes, raw, errors):
+    """Validate one column, return (indexes, values) of converted values."""
+    if type(field) in (IntField, FloatField):
+        return _validate_number_column(field, label, indexes, raw, errors)
+    if type(field) is StringField:
+        return _validate_string_column(field, label, indexes, raw, errors)
+
+    validator = field.compile(label)
+    valid, values = [], []
+    for i, v in zip(indexes, raw):
+        try:
+            values.append(validator(v))
+            valid.append(i)
+        except ValueError as e:
+            errors.append((i, str(e)))
+    return valid, values
+
+
+def validate_many(model, rows, validate_props, required_props, is_default, new_instance):
+    """Validate a list of row dicts column by column.
+
+    Each column's constraints are checked across all rows in one pass.
+    new_instance(pairs) builds a model instance from already validated
+    (name, value) pairs in validate_props order. Raises BatchValidationError
+    listing every failing row.
+    """
+    load_numpy()
+    errors = []
+    records = {}
+    for index, row in enumerate(rows):
+        if isinstance(row, model):
+            continue
+        if not isinstance(row, dict):
+            errors.append((index, "<{}> row should be object type".format(model.__name__)))
+            continue
+        records[index] = row
+
+    columns = {}
+    for field_name, field_type in validate_props.items():
+        if not isinstance(field_type, Field):
+            continue
+        label = "<{}.{}>".format(model.__name__, field_name)
+        indexes, raw = [], []
+        for index, row in records.items():
+            value = row.get(field_name)
+            if value is not None:
+                indexes.append(index)
+                raw.append(value)
+            elif field_name in required_props:
+                try:
+                    field_type.required_missing(field_name)
+                except ValueError as e:
+                    errors.append((index, str(e)))
+        indexes, values = _validate_column(field_type, label, indexes, raw, errors)
+        columns[field_name] = dict(zip(indexes, values))
+
+    if errors:
+        errors.sort(key=lambda error: error[0])
+        raise BatchValidationError(errors)
+
+    instances = []
+    for index, row in enumerate(rows):
+        if index not in records:
+            instances.append(row)
+            continue
+        pairs = []
+        for field_name, field_type in validate_props.items():
+            if isinstance(field_type, Field):
+                value = columns[field_name].get(index, _MISSING)
+                if value is not _MISSING:
+                    pairs.append((field_name, value))
+                elif is_default:
+                    pairs.append((field_name, field_type.get_default()))
+            else:
+                value = row.get(field_name)
+                pairs.append((field_name, value if value else field_type))
+        instances.append(new_instance(pairs))
+    return instances
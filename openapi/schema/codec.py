@@ -0,0 +1,120 @@
+# encoding: utf-8
+"""
+The JSON backend used to parse field values and request bodies and to
+encode responses.
+
+The first installed of orjson, ujson and simplejson is used, stdlib json
+otherwise; use_json_backend("json") (or any of the others) pins one.
+dumps always returns compact UTF-8 bytes and encodes SchemaModel
+instances through their __json__.
+"""
+import json
+
+BACKENDS = ("orjson", "ujson", "simplejson", "json")
+
+
+def json_default(obj):
+    if hasattr(obj, "__json__"):
+        return obj.__json__()
+    raise TypeError("{!r} is not JSON serializable".format(obj))
+
+
+class JSONCodec(object):
+    """loads(str or bytes) and dumps(obj) -> bytes of one backend."""
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return "<JSONCodec {}>".format(self.name)
+
+
+def _orjson():
+    import orjson
+
+    def dumps(obj):
+        # int keys, e.g. responses: 200: in a docstring, are written as strings like json does
+        return orjson.dumps(obj, default=json_default, option=orjson.OPT_NON_STR_KEYS)
+    return JSONCodec("orjson", orjson.loads, dumps)
+
+
+def _ujson():
+    import ujson
+
+    def dumps(obj):
+        # ujson only calls default on recent versions, convert models first
+        return ujson.dumps(_encodable(obj), ensure_ascii=False).encode("utf-8")
+    return JSONCodec("ujson", ujson.loads, dumps)
+
+
+def _simplejson():
+    import simplejson
+
+    def dumps(obj):
+        return simplejson.dumps(obj, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return JSONCodec("simplejson", simplejson.loads, dumps)
+
+
+def _stdlib():
+    def loads(value):
+        # bytes are accepted from Python 3.6
+        if isinstance(value, bytes) and not isinstance(value, str):
+            value = value.decode("utf-8")
+        return json.loads(value)
+
+    def dumps(obj):
+        return json.dumps(obj, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return JSONCodec("json", loads, dumps)
+
+
+_FACTORIES = {"orjson": _orjson, "ujson": _ujson, "simplejson": _simplejson, "json": _stdlib}
+
+
+def _encodable(obj):
+    if isinstance(obj, (list, tuple)):
+        return [_encodable(value) for value in obj]
+    if isinstance(obj, dict):
+        return dict((key, _encodable(value)) for key, value in obj.items())
+    if hasattr(obj, "__json__"):
+        return _encodable(obj.__json__())
+    return obj
+
+
+def get_json_backend(name):
+    """The codec of backend name, raises ImportError when it is not installed."""
+    if name not in _FACTORIES:
+        raise ValueError("JSON backend should be one of {}".format(", ".join(BACKENDS)))
+    return _FACTORIES[name]()
+
+
+def available_json_backends():
+    names = []
+    for name in BACKENDS:
+        try:
+            get_json_backend(name)
+            names.append(name)
+        except ImportError:
+            pass
+    return names
+
+
+def use_json_backend(name=None):
+    """Switch the backend, None picks the fastest installed one. Returns the codec."""
+    global codec
+    if name is None:
+        name = available_json_backends()[0]
+    codec = get_json_backend(name)
+    return codec
+
+
+codec = use_json_backend()
+
+
+def loads(value):
+    return codec.loads(value)
+
+
+def dumps(obj):
+    return codec.dumps(obj)
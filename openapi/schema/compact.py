@@ -0,0 +1,133 @@
+import re
+
+from .field import Field, SchemaBaseModel
+from .compiler import compile_validate_plan
+from .batch import validate_many as batch_validate_many
+from .serializer import projection_key, get_serializer
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_MISSING = object()
+
+
+class CompactSchemaModel(SchemaBaseModel):
+    """Base of the classes built by schema_model(compact=True).
+
+    Values live in fixed slots derived from validate_props, so instances
+    carry no per-instance __dict__.
+    """
+    __slots__ = ()
+    _validate_props = {}
+    _serializers = {}
+
+    @classmethod
+    def get_validate_func_map(cls):
+        return cls._validate_props
+
+    def __setattr__(self, name, value):
+        if getattr(self, name, _MISSING) is _MISSING:
+            raise AttributeError("No such attribute: {}".format(name))
+        validator = self._validate_props.get(name, None)
+        if isinstance(validator, Field):
+            value = validator.validate(name, value)
+        object.__setattr__(self, name, value)
+
+    def __getitem__(self, item):
+        if item in self.__slots__:
+            return getattr(self, item, None)
+
+    def __str__(self):
+        return self.__name__
+
+    def __repr__(self):
+        return "<{}.{}>".format(__package__, self.__name__)
+
+    def __json__(self):
+        return self.to_dict()
+
+    def __list_to_dict__(self, lst, is_default=True, only=[], remove=[]):
+        rst = []
+        for value in lst:
+            if type(value) == list:
+                rst.append(self.__list_to_dict__(value, is_default=is_default, only=only, remove=remove))
+            elif isinstance(value, SchemaBaseModel):
+                rst.append(value.to_dict(is_default=is_default, only=only, remove=remove))
+            else:
+                rst.append(value)
+        return rst
+
+    def to_dict(self, is_default=False, only=[], remove=[], fieldset=None):
+        if fieldset is not None:
+            return self.__serialize__(fieldset.key(is_default))
+        return self.__serialize__(projection_key(is_default, only, remove))
+
+    def __serialize__(self, key):
+        return get_serializer(self._serializers, self._validate_props, key, compact=True)(self)
+
+    def to_json(self):
+        return self.to_dict(is_default=True)
+
+
+def compact_model(cls, validate_props, required_props, is_default=False):
+    """Build a __slots__ backed model class for `cls`.
+
+    Methods and plain attributes of `cls` are copied onto the new class,
+    which derives from CompactSchemaModel rather than from `cls`.
+    """
+    for field_name in validate_props:
+        if not _IDENTIFIER.match(field_name):
+            raise ValueError("{}.{} is not a valid attribute name for compact model.".format(cls.__name__, field_name))
+
+    namespace = {}
+    for klass in reversed(cls.__mro__):
+        # skip object, the base models and classes generated by schema_model
+        if klass in (object, SchemaBaseModel, CompactSchemaModel) or 'get_validate_func_map' in vars(klass):
+            continue
+        for key, value in vars(klass).items():
+            if key in ('__dict__', '__weakref__', '__slots__') or key in validate_props:
+                continue
+            namespace[key] = value
+    namespace.update({
+        "__slots__": tuple(validate_props),
+        "__doc__": cls.__doc__,
+        "__name__": cls.__name__,
+        "__module__": cls.__module__,
+        "_validate_props": validate_props,
+        "_serializers": {},
+    })
+    model = type(cls.__name__, (CompactSchemaModel,), namespace)
+
+    plan = tuple((field_name, validator, default, vars(model)[field_name].__set__)
+                 for field_name, validator, default in compile_validate_plan(cls.__name__, validate_props))
+    required = tuple((field_name, validate_props[field_name].required_missing)
+                     for field_name in required_props if isinstance(validate_props.get(field_name), Field))
+
+    def __init__(self, **kwags):
+        get = kwags.get
+        for field_name, validator, default, set_slot in plan:
+            value = get(field_name)
+            if validator is None:
+                set_slot(self, value if value else default)
+            elif value is not None:
+                set_slot(self, validator(value))
+            elif is_default:
+                set_slot(self, default)
+
+        for field_name, required_missing in required:
+            if get(field_name) is None:
+                required_missing(field_name)
+
+    setters = dict((field_name, set_slot) for field_name, _, _, set_slot in plan)
+
+    def new_instance(pairs):
+        obj = object.__new__(model)
+        for field_name, value in pairs:
+            setters[field_name](obj, value)
+        return obj
+
+    def validate_many(cls, rows):
+        """Validate a list of row dicts column by column, see openapi.schema.batch."""
+        return batch_validate_many(cls, rows, validate_props, required_props, is_default, new_instance)
+
+    model.__init__ = __init__
+    model.validate_many = classmethod(validate_many)
+    return model
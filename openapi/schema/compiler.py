@@ -0,0 +1,46 @@
+from .field import Field
+
+
+def compile_validate_plan(cls_name, validate_props):
+    """Flatten validate_props into a tuple of (name, validator, default).
+
+    validator is None for plain class attributes, in which case default is
+    the class attribute value itself.
+    """
+    plan = []
+    for field_name, field_type in validate_props.items():
+        if isinstance(field_type, Field):
+            validator = field_type.compile("<{}.{}>".format(cls_name, field_name))
+            plan.append((field_name, validator, field_type.get_default()))
+        else:
+            plan.append((field_name, None, field_type))
+    return tuple(plan)
+
+
+def compile_init(cls_name, validate_props, required_props, is_default=False):
+    """Build a specialized SchemaModel.__init__ for one model.
+
+    Constraints, defaults, alias names and nested models are resolved once
+    here instead of on every instantiation.
+    """
+    plan = compile_validate_plan(cls_name, validate_props)
+    required = tuple((field_name, validate_props[field_name].required_missing)
+                     for field_name in required_props if isinstance(validate_props.get(field_name), Field))
+
+    def __init__(self, **kwags):
+        _dict = self.__dict__
+        get = kwags.get
+        for field_name, validator, default in plan:
+            value = get(field_name)
+            if validator is None:
+                _dict[field_name] = value if value else default
+            elif value is not None:
+                _dict[field_name] = validator(value)
+            elif is_default:
+                _dict[field_name] = default
+
+        for field_name, required_missing in required:
+            if get(field_name) is None:
+                required_missing(field_name)
+
+    return __init__
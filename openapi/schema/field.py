@@ -1,10 +1,16 @@
 import re
 import sys
-import json
 from abc import ABCMeta,abstractmethod
+from .formats import get_format_checker
+from . import codec as json_codec
+
+if sys.version_info.major == 2:
+    string_types = (str, unicode)
+else:
+    string_types = (str,)
 
 class SchemaBaseModel(object):
-    pass
+    __slots__ = ()
 
 class Field():
     name = None
@@ -12,6 +18,33 @@ class Field():
     required = False
     enums = []
     __metaclass__ = ABCMeta
+    _frozen = False
+
+    def __setattr__(self, name, value):
+        if self._frozen:
+            raise AttributeError("{} is frozen, declare a new field instead of setting {}.".format(
+                self.__class__.__name__, name))
+        self.__dict__[name] = value
+
+    def freeze(self):
+        """
+        Make the field and its nested fields read-only.
+
+        Done once the field is declared in a schema_model or swagger_api, so
+        the same instance can validate requests from many threads; per-call
+        options such as to_dict are arguments of validate instead.
+        """
+        if not self._frozen:
+            self.__dict__["_frozen"] = True
+            for value in self.__dict__.values():
+                if isinstance(value, Field):
+                    value.freeze()
+                elif type(value) in (list, tuple):
+                    for item in value:
+                        if isinstance(item, Field):
+                            item.freeze()
+        return self
+
     def get_name(self):
         return self.name
     
@@ -42,18 +75,21 @@ class Field():
         return flag
     
     def get_value_from_str(self, value):
-        if sys.version_info.major == 2:
-            if type(value) in (str, unicode):
-                value = json.loads(value)
-        else:
-            if type(value) == str:
-                value = json.loads(value)
+        if type(value) in string_types or type(value) is bytes:
+            value = json_codec.loads(value)
         return value
     
     @abstractmethod
     def validate(self, name, value):
         return value
 
+    def compile(self, name):
+        """Return a one-argument validator with `name` bound ahead of time."""
+        validate = self.validate
+        def validator(value):
+            return validate(name, value)
+        return validator
+
 class AnyField(Field):
     def __init__(self, name=None, description="", default=None, required=False):
         self.default = default
@@ -100,6 +136,27 @@ class IntField(Field):
         self.checkin_enums(name, value)
         
         return value
+
+    def compile(self, name):
+        default, required = self.default, self.required
+        min_value, max_value, enums = self.min_value, self.max_value, self.enums
+        def validator(value):
+            if value is None:
+                if required:
+                    raise ValueError('"{}" is missing.'.format(name))
+                return default
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError("{} should be integer type".format(name))
+            if min_value is not None and min_value > value:
+                raise ValueError("{} should be larger than {}".format(name, min_value))
+            if max_value is not None and max_value < value:
+                raise ValueError("{} should be smaller than {}".format(name, max_value))
+            if enums and value not in enums:
+                raise ValueError("{} should be in {}".format(name, enums))
+            return value
+        return validator
     
 class FloatField(Field):
     def __init__(self,name=None, description="", default=0.0, required=False, min_value=None, max_value=None, format="", enums=[]):
@@ -132,6 +189,27 @@ class FloatField(Field):
         
         self.checkin_enums(name, value)
         return value
+
+    def compile(self, name):
+        default, required = self.default, self.required
+        min_value, max_value, enums = self.min_value, self.max_value, self.enums
+        def validator(value):
+            if value is None:
+                if required:
+                    raise ValueError('"{}" is missing.'.format(name))
+                return default
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError("{} should be float type".format(name))
+            if min_value is not None and min_value > value:
+                raise ValueError("{} should be larger than {}".format(name, min_value))
+            if max_value is not None and max_value < value:
+                raise ValueError("{} should be smaller than {}".format(name, max_value))
+            if enums and value not in enums:
+                raise ValueError("{} should be in {}".format(name, enums))
+            return value
+        return validator
     
 class BoolField(Field):
     def __init__(self,name=None, description="", default=False, required=False):
@@ -151,19 +229,44 @@ class BoolField(Field):
             else:
                 return self.default
         try:
-            if sys.version_info.major == 2:
-                if type(value) in (str, unicode):
-                    value = valueBool[value.lower()]
-            else:
-                if type(value) == str:
-                    value = valueBool[value.lower()]
+            if type(value) in string_types:
+                value = valueBool[value.lower()]
         except:
             raise ValueError("{} should be bool type".format(name))
         
         if type(value) != bool:
             raise ValueError("{} should be bool type".format(name))
         return value
+
+    def compile(self, name):
+        default, required = self.default, self.required
+        valueBool = {
+            "true": True,
+            "false": False
+        }
+        def validator(value):
+            if value is None:
+                if required:
+                    raise ValueError('"{}" is missing.'.format(name))
+                return default
+            if type(value) in string_types:
+                value = valueBool.get(value.lower())
+            if type(value) != bool:
+                raise ValueError("{} should be bool type".format(name))
+            return value
+        return validator
     
+def _full_matcher(compiled):
+    """compiled.fullmatch, a match that must end at the end of the value before Python 3.4."""
+    if hasattr(compiled, "fullmatch"):
+        return compiled.fullmatch
+
+    def fullmatch(value):
+        m = compiled.match(value)
+        return m if m is not None and m.end() == len(value) else None
+    return fullmatch
+
+
 class StringField(Field):
     def __init__(self,name=None, description="", default='',required=False,min_length=None,max_length=None, pattern=None, format="", enums=[]):
         self.default = default
@@ -175,6 +278,14 @@ class StringField(Field):
         self.description = description
         self.enums = enums
         self.format = format
+        # compiled once per field, matching the whole value
+        self.matcher = None
+        if pattern is not None:
+            try:
+                self.matcher = _full_matcher(re.compile(pattern))
+            except re.error:
+                raise ValueError('{}: {} is NOT a valid pattern.'.format(name, pattern))
+        self.format_checker = get_format_checker(format) if format else None
 
     def validate(self, name, value):
         if value is None:
@@ -183,12 +294,8 @@ class StringField(Field):
             else:
                 return self.default
             
-        if sys.version_info.major == 2:
-            if not type(value) in (str,unicode):
-                raise ValueError("{} should be string type".format(name))
-        else:
-            if type(value) != str:
-                raise ValueError("{} should be string type".format(name))
+        if not type(value) in string_types:
+            raise ValueError("{} should be string type".format(name))
         
         length = len(value)
         if self.min_length is not None and self.min_length > length:
@@ -197,20 +304,44 @@ class StringField(Field):
         if self.max_length is not None and self.max_length < length:
             raise ValueError("{} maximum length should not exceed {} characters".format(name, self.max_length))
         
-        if self.pattern is not None:
-            try:
-                m = re.match(self.pattern, value)
-                if m is None or m.end() < len(value):
-                    raise ValueError('{}: {} is NOT fully matched pattern.'.format(name, self.pattern))
-            except re.error:
-                raise ValueError('{}: {} is NOT a valid pattern.'.format(name, self.pattern))
+        if self.matcher is not None and self.matcher(value) is None:
+            raise ValueError('{}: {} is NOT fully matched pattern.'.format(name, self.pattern))
+
+        if self.format_checker is not None and not self.format_checker(value):
+            raise ValueError("{} should be {} format".format(name, self.format))
             
         self.checkin_enums(name, value)
 
         return value
+
+    def compile(self, name):
+        default, required = self.default, self.required
+        min_length, max_length, enums = self.min_length, self.max_length, self.enums
+        pattern, matcher = self.pattern, self.matcher
+        format, format_checker = self.format, self.format_checker
+        def validator(value):
+            if value is None:
+                if required:
+                    raise ValueError('"{}" is missing.'.format(name))
+                return default
+            if not type(value) in string_types:
+                raise ValueError("{} should be string type".format(name))
+            length = len(value)
+            if min_length is not None and min_length > length:
+                raise ValueError("{} should be at least {} characters long".format(name, min_length))
+            if max_length is not None and max_length < length:
+                raise ValueError("{} maximum length should not exceed {} characters".format(name, max_length))
+            if matcher is not None and matcher(value) is None:
+                raise ValueError('{}: {} is NOT fully matched pattern.'.format(name, pattern))
+            if format_checker is not None and not format_checker(value):
+                raise ValueError("{} should be {} format".format(name, format))
+            if enums and value not in enums:
+                raise ValueError("{} should be in {}".format(name, enums))
+            return value
+        return validator
     
 class ListField(Field):
-    def __init__(self,item_field,name=None, description="", default=[],required=False,min_items=None,max_items=None, is_to_dict=False):
+    def __init__(self,item_field,name=None, description="", default=[],required=False,min_items=None,max_items=None, is_to_dict=False, batch=False):
         self.default = default
         self.name = name
         self.required = required
@@ -219,13 +350,21 @@ class ListField(Field):
         self.item_field = item_field
         self.description = description
         self.is_to_dict = is_to_dict
+        # validate SchemaModel items column by column with item_field.validate_many
+        self.batch = batch
 
-    def validate(self, name, value):
+    def is_batch(self):
+        return self.batch and isinstance(self.item_field, type) and issubclass(self.item_field, SchemaBaseModel)
+
+    def validate(self, name, value, to_dict=None):
+        """to_dict=None follows is_to_dict."""
         if value is None:
             if self.required:
                 raise ValueError('"{}" is missing.'.format(name))
             else:
                 return self.default
+        if to_dict is None:
+            to_dict = self.is_to_dict
 
         try:
             value = self.get_value_from_str(value)
@@ -241,21 +380,73 @@ class ListField(Field):
         if self.max_items is not None and len(value) > self.max_items:
             raise ValueError('{}\'s maximum length should not exceed {} characters.'.format(name, self.max_items))
 
+        if self.is_batch():
+            values = self.item_field.validate_many(value)
+            return [v.to_dict() for v in values] if to_dict else values
+
         values = []
         for v in value:
             if isinstance(self.item_field, Field):
                 values.append(self.item_field.validate(name,v))
             elif issubclass(self.item_field, SchemaBaseModel):
                 if isinstance(v, self.item_field):
-                    values.append(v.to_dict() if self.is_to_dict else v)
+                    values.append(v.to_dict() if to_dict else v)
                 else:
-                    values.append(self.item_field(**v).to_dict() if self.is_to_dict else self.item_field(**v))
+                    values.append(self.item_field(**v).to_dict() if to_dict else self.item_field(**v))
             elif issubclass(self.item_field, Field):
                 values.append(self.item_field().validate(name, v))
             else:
                 raise ValueError("The {} should be <{}> type.".format(name, self.item_field))
         return values
 
+    def compile_item(self, name, to_dict=None):
+        """Validator for a single item, to_dict=None follows is_to_dict."""
+        item_field = self.item_field
+        if to_dict is None:
+            to_dict = self.is_to_dict
+        if isinstance(item_field, Field):
+            return item_field.compile(name)
+        elif isinstance(item_field, type) and issubclass(item_field, SchemaBaseModel):
+            def validate_item(v):
+                if not isinstance(v, item_field):
+                    v = item_field(**v)
+                return v.to_dict() if to_dict else v
+            return validate_item
+        elif isinstance(item_field, type) and issubclass(item_field, Field):
+            return item_field().compile(name)
+        def validate_item(v):
+            raise ValueError("The {} should be <{}> type.".format(name, item_field))
+        return validate_item
+
+    def compile(self, name, to_dict=None):
+        item_field = self.item_field
+        if to_dict is None:
+            to_dict = self.is_to_dict
+        validate_item = None if self.is_batch() else self.compile_item(name, to_dict)
+        default, required = self.default, self.required
+        min_items, max_items = self.min_items, self.max_items
+        get_value_from_str = self.get_value_from_str
+        def validator(value):
+            if value is None:
+                if required:
+                    raise ValueError('"{}" is missing.'.format(name))
+                return default
+            try:
+                value = get_value_from_str(value)
+            except Exception as e:
+                raise ValueError("{} should be list type: {}".format(name, e))
+            if type(value) != list:
+                raise ValueError("{} should be list type: {}".format(name, type(value)))
+            if min_items is not None and len(value) < min_items:
+                raise ValueError('{} should be at least {} items.'.format(name, min_items))
+            if max_items is not None and len(value) > max_items:
+                raise ValueError('{}\'s maximum length should not exceed {} characters.'.format(name, max_items))
+            if validate_item is None:
+                values = item_field.validate_many(value)
+                return [v.to_dict() for v in values] if to_dict else values
+            return [validate_item(v) for v in value]
+        return validator
+
 class ObjectField(Field):
     def __init__(self,classobj, name=None, description="", default={}, required=False, is_to_dict=False):
         self.default = default
@@ -265,12 +456,15 @@ class ObjectField(Field):
         self.description = description
         self.is_to_dict = is_to_dict
 
-    def validate(self, name, value):
+    def validate(self, name, value, to_dict=None):
+        """to_dict=None follows is_to_dict."""
         if value is None:
             if self.required:
                 raise ValueError('"{}" is missing.'.format(name))
             else:
                 return self.default
+        if to_dict is None:
+            to_dict = self.is_to_dict
             
         try:
             value = self.get_value_from_str(value)
@@ -279,9 +473,9 @@ class ObjectField(Field):
             
         if issubclass(self.classobj, SchemaBaseModel):
             if isinstance(value, SchemaBaseModel):
-                return value.to_dict if self.is_to_dict else value
+                return value.to_dict() if to_dict else value
             obj = self.classobj(**value)
-            return obj.to_dict() if self.is_to_dict else obj
+            return obj.to_dict() if to_dict else obj
         else:
             raise ValueError("{} should be <SchemaModel> type".format(name))
         
@@ -296,12 +490,15 @@ class AnyOfField(Field):
         self.description = description
         self.is_to_dict = is_to_dict
 
-    def validate(self, name, value):
+    def validate(self, name, value, to_dict=None):
+        """to_dict=None follows is_to_dict."""
         if value is None:
             if self.required:
                 raise ValueError('"{}" is missing.'.format(name))
             else:
                 return self.default
+        if to_dict is None:
+            to_dict = self.is_to_dict
             
         for field in self.fields:
             if isinstance(field, Field):
@@ -309,10 +506,10 @@ class AnyOfField(Field):
             elif issubclass(field, SchemaBaseModel):
                 value = self.get_value_from_str(value)
                 if isinstance(value,field):
-                    return value.to_dict if self.is_to_dict else value
+                    return value.to_dict() if to_dict else value
                 else:
                     if self.check_attr(field, value):
-                        return field(**value).to_dict() if self.is_to_dict else field(**value)
+                        return field(**value).to_dict() if to_dict else field(**value)
             else:
                 raise ValueError("{} should be any of <SchemaModel> or <Field> type.".format(name))
             
@@ -335,7 +532,10 @@ class AllOfField(Field):
         self.description = description
         self.is_to_dict = is_to_dict
 
-    def validate(self, name, values):
+    def validate(self, name, values, to_dict=None):
+        """to_dict=None follows is_to_dict."""
+        if to_dict is None:
+            to_dict = self.is_to_dict
         validations = []
         if value is None:
             if self.required:
@@ -349,10 +549,10 @@ class AllOfField(Field):
                 elif issubclass(field, SchemaBaseModel):
                     value = self.get_value_from_str(value)
                     if isinstance(value,field):
-                        validations.append(value.to_dict() if self.is_to_dict else value)
+                        validations.append(value.to_dict() if to_dict else value)
                     else:
                         if self.check_attr(field, value):
-                            validations.append(field(**value).to_dict() if self.is_to_dict else field(**value))
+                            validations.append(field(**value).to_dict() if to_dict else field(**value))
                 else:
                     raise ValueError("{} should be all of <SchemaModel> or <Field> type.".format(name))
         if len(self.fields) != len(validations):
@@ -0,0 +1,145 @@
+# encoding: utf-8
+"""
+Sparse fieldsets: the properties a client asked for, as dotted paths.
+
+    fieldset = Fieldset.parse(allowed_paths(Article), fields="id,author.name", exclude="")
+    article.to_dict(fieldset=fieldset)   # {"id": ..., "author": {"name": ...}}
+
+A path names a property as serialized (the alias when a field has one);
+"author" keeps the whole nested object, "author.name" only that property
+of it. exclude removes paths from what is left. The serializers of
+openapi.schema.serializer skip everything else, nested models included,
+so unrequested values are never converted.
+"""
+from .field import Field, ListField, ObjectField, SchemaBaseModel
+
+# longest path listed by allowed_paths, a.b.c.d
+MAX_DEPTH = 4
+# projection keys built from a Fieldset start with this marker
+FIELDSET = "fields"
+
+
+def nested_model(field):
+    """The model class a field holds (directly, in an ObjectField or as list items), or None."""
+    while isinstance(field, (ListField, ObjectField)):
+        field = field.item_field if isinstance(field, ListField) else field.classobj
+    if isinstance(field, type) and issubclass(field, SchemaBaseModel):
+        return field
+    return None
+
+
+def allowed_paths(model, max_depth=MAX_DEPTH):
+    """
+    Every path of model up to max_depth, in declaration order.
+
+    A model already on the way down is not entered again, so recursive
+    models stop at their first repetition.
+    """
+    paths = []
+
+    def walk(model, prefix, depth, stack):
+        for name, field in model.get_validate_func_map().items():
+            if name.startswith('_') or not isinstance(field, Field):
+                continue
+            path = prefix + name
+            paths.append(path)
+            child = nested_model(field)
+            if child is not None and depth < max_depth and child not in stack:
+                walk(child, path + ".", depth + 1, stack + (child,))
+
+    walk(model, "", 1, (model,))
+    return paths
+
+
+def _split(value):
+    if value is None:
+        return []
+    if not isinstance(value, (list, tuple)):
+        value = value.split(",")
+    return [path.strip() for path in value if path and path.strip()]
+
+
+def _add(tree, path):
+    """Add a dotted path to a {name: subtree or None (whole)} tree."""
+    names = path.split(".")
+    for name in names[:-1]:
+        if name in tree and tree[name] is None:
+            return
+        tree = tree.setdefault(name, {})
+    tree[names[-1]] = None
+
+
+def _freeze(tree):
+    return tuple(sorted((name, None if sub is None else _freeze(sub)) for name, sub in tree.items()))
+
+
+class Fieldset(object):
+    """Validated fields/exclude paths, see Fieldset.parse."""
+
+    def __init__(self, fields=(), exclude=()):
+        include = {}
+        for path in fields:
+            _add(include, path)
+        removed = {}
+        for path in exclude:
+            _add(removed, path)
+        # None includes every property
+        self.include = _freeze(include) if fields else None
+        self.exclude = _freeze(removed)
+
+    @classmethod
+    def parse(cls, allowed, fields=None, exclude=None):
+        """
+        A Fieldset of comma separated paths (or lists of them), None when
+        both are empty. ValueError names the first path not in allowed.
+        """
+        fields, exclude = _split(fields), _split(exclude)
+        if not fields and not exclude:
+            return None
+        for param, paths in (("fields", fields), ("exclude", exclude)):
+            for path in paths:
+                if path not in allowed:
+                    raise ValueError("{} should be paths among {}, got {}".format(param, ", ".join(allowed), path))
+        return cls(fields, exclude)
+
+    def key(self, is_default=False):
+        """The projection key of openapi.schema.serializer."""
+        return (FIELDSET, is_default, self.include, self.exclude)
+
+    def filter(self, data):
+        """Apply the fieldset to plain dicts and lists of them."""
+        return _filter(data, self.include, self.exclude)
+
+    def __json__(self):
+        return [self.include, self.exclude]
+
+    def __eq__(self, other):
+        return isinstance(other, Fieldset) and (self.include, self.exclude) == (other.include, other.exclude)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.include, self.exclude))
+
+    def __repr__(self):
+        return "Fieldset(include={!r}, exclude={!r})".format(self.include, self.exclude)
+
+
+def _filter(data, include, exclude):
+    if type(data) == list:
+        return [_filter(value, include, exclude) for value in data]
+    if not isinstance(data, dict):
+        return data
+    include = dict(include) if include is not None else None
+    exclude = dict(exclude)
+    rst = {}
+    for name, value in data.items():
+        if include is not None and name not in include:
+            continue
+        if name in exclude and exclude[name] is None:
+            continue
+        sub_include = include.get(name) if include is not None else None
+        sub_exclude = exclude.get(name) or ()
+        rst[name] = _filter(value, sub_include, sub_exclude) if sub_include is not None or sub_exclude else value
+    return rst
@@ -0,0 +1,87 @@
+import re
+import socket
+import datetime
+
+_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})\Z")
+_DATE_TIME = re.compile(r"(\d{4})-(\d{2})-(\d{2})[Tt ](\d{2}):(\d{2}):(\d{2})(?:\.\d+)?(?:[Zz]|[+-](\d{2}):(\d{2}))\Z")
+_UUID = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\Z")
+_EMAIL = re.compile(r"[^@\s]+@[^@\s.]+(?:\.[^@\s.]+)+\Z")
+_URI = re.compile(r"[A-Za-z][A-Za-z0-9+.\-]*:[^\s]*\Z")
+
+
+def _is_date(year, month, day):
+    try:
+        datetime.date(int(year), int(month), int(day))
+    except ValueError:
+        return False
+    return True
+
+
+def check_date(value):
+    m = _DATE.match(value)
+    return m is not None and _is_date(*m.groups())
+
+
+def check_date_time(value):
+    m = _DATE_TIME.match(value)
+    if m is None:
+        return False
+    year, month, day, hour, minute, second, offset_hour, offset_minute = m.groups()
+    if int(hour) > 23 or int(minute) > 59 or int(second) > 60:
+        return False
+    if offset_hour is not None and (int(offset_hour) > 23 or int(offset_minute) > 59):
+        return False
+    return _is_date(year, month, day)
+
+
+def check_uuid(value):
+    return _UUID.match(value) is not None
+
+
+def check_email(value):
+    return _EMAIL.match(value) is not None
+
+
+def check_ipv4(value):
+    parts = value.split('.')
+    if len(parts) != 4:
+        return False
+    for part in parts:
+        if not part or part.strip('0123456789') or len(part) > 3 or int(part) > 255 or (len(part) > 1 and part[0] == '0'):
+            return False
+    return True
+
+
+def check_ipv6(value):
+    try:
+        socket.inet_pton(socket.AF_INET6, value)
+    except (socket.error, ValueError, UnicodeError):
+        return False
+    return True
+
+
+def check_uri(value):
+    return _URI.match(value) is not None
+
+
+FORMAT_CHECKERS = {
+    "date": check_date,
+    "date-time": check_date_time,
+    "uuid": check_uuid,
+    "email": check_email,
+    "ipv4": check_ipv4,
+    "ipv6": check_ipv6,
+    "uri": check_uri,
+}
+
+
+def register_format(name, checker):
+    """Register checker(value) -> bool for StringField(format=name).
+
+    Fields resolve their checker when declared, so register before use.
+    """
+    FORMAT_CHECKERS[name] = checker
+
+
+def get_format_checker(name):
+    return FORMAT_CHECKERS.get(name)
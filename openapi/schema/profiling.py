@@ -0,0 +1,116 @@
+# encoding: utf-8
+"""
+Where import time goes: schema_model and swagger_api registration.
+
+Disabled by default, the decorators only check that `profiler` is None.
+
+    from openapi.schema import profiling
+    profiler = profiling.enable()
+    import myapp.api
+    openapi.warmup()
+    print(profiler.report())
+
+or from the command line, see openapi.importcost:
+
+    python -m openapi.importcost --settings mysite.settings --module myapp.api
+
+Recorded are the seconds spent decorating each model and each endpoint,
+and the totals of docstring YAML parsing and of spec generation (the
+fragments swagger_api defers to warmup(), YAML parsing excluded).
+"""
+import threading
+from timeit import default_timer
+
+# the enabled profiler, None when registration is not profiled
+profiler = None
+
+
+class RegistrationProfiler(object):
+    """Seconds per model and endpoint, and totals by kind."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            # kind ("model", "endpoint") -> {name: seconds}
+            self.items = {"model": {}, "endpoint": {}}
+            # kind ("yaml", "spec") -> seconds
+            self.totals = {"yaml": 0.0, "spec": 0.0}
+
+    def record(self, kind, name, seconds):
+        with self.lock:
+            items = self.items.setdefault(kind, {})
+            items[name] = items.get(name, 0.0) + seconds
+
+    def add(self, kind, seconds):
+        with self.lock:
+            self.totals[kind] = self.totals.get(kind, 0.0) + seconds
+
+    def as_dict(self):
+        with self.lock:
+            models = dict(self.items["model"])
+            endpoints = dict(self.items["endpoint"])
+            yaml_seconds = self.totals["yaml"]
+            spec_seconds = self.totals["spec"]
+        return {
+            "models": models,
+            "endpoints": endpoints,
+            "totals": {
+                "models": sum(models.values()),
+                "endpoints": sum(endpoints.values()),
+                "yaml": yaml_seconds,
+                "schema": max(spec_seconds - yaml_seconds, 0.0),
+            },
+        }
+
+    def report(self, limit=10):
+        """Totals, then the `limit` slowest models and endpoints."""
+        data = self.as_dict()
+        totals = data["totals"]
+        lines = [
+            "schema_model     {:>10.2f} ms  {} models".format(totals["models"] * 1e3, len(data["models"])),
+            "swagger_api      {:>10.2f} ms  {} endpoints".format(totals["endpoints"] * 1e3, len(data["endpoints"])),
+            "YAML parsing     {:>10.2f} ms".format(totals["yaml"] * 1e3),
+            "schema generation{:>10.2f} ms".format(totals["schema"] * 1e3),
+        ]
+        for title, items in (("slowest models", data["models"]), ("slowest endpoints", data["endpoints"])):
+            if not items:
+                continue
+            lines.append("")
+            lines.append(title)
+            for name, seconds in sorted(items.items(), key=lambda item: -item[1])[:limit]:
+                lines.append("  {:>10.3f} ms  {}".format(seconds * 1e3, name))
+        return "\n".join(lines) + "\n"
+
+
+def enable(new_profiler=None):
+    """Start profiling registration, return the profiler."""
+    global profiler
+    profiler = new_profiler if new_profiler is not None else RegistrationProfiler()
+    return profiler
+
+
+def disable():
+    global profiler
+    profiler = None
+
+
+class timed(object):
+    """Add the seconds of a block to the total of kind, when profiling."""
+    __slots__ = ("kind", "used", "start")
+
+    def __init__(self, kind):
+        self.kind = kind
+
+    def __enter__(self):
+        self.used = profiler
+        if self.used is not None:
+            self.start = default_timer()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.used is not None:
+            self.used.add(self.kind, default_timer() - self.start)
+        return False
@@ -0,0 +1,110 @@
+from .field import Field, SchemaBaseModel
+from .fieldset import FIELDSET
+
+_MISSING = object()
+
+# projections cached per model class, beyond this they are built per call
+MAX_SERIALIZERS = 256
+
+
+def projection_key(is_default=False, only=[], remove=[]):
+    return (is_default, tuple(only), tuple(remove))
+
+
+def _projection_plan(validate_props, key):
+    """(name, default, key of the nested value) of every emitted property."""
+    plan = []
+    if key[0] == FIELDSET:
+        # Fieldset.key(): paths, nested models get the subtree of their name
+        _, is_default, include, exclude = key
+        include = dict(include) if include is not None else None
+        exclude = dict(exclude)
+        for name, field in validate_props.items():
+            if (include is not None and not name in include) or name.startswith('_'):
+                continue
+            if name in exclude and exclude[name] is None:
+                continue
+            sub_include = include.get(name) if include is not None else None
+            sub_exclude = exclude.get(name) or ()
+            if sub_include is not None or sub_exclude:
+                child = (FIELDSET, is_default, sub_include, sub_exclude)
+            else:
+                child = projection_key(is_default)
+            default = field.get_default() if is_default and isinstance(field, Field) else None
+            plan.append((name, default, child))
+        return tuple(plan)
+
+    # only/remove apply by name at every level
+    is_default, only, remove = key
+    last_only = set(only).difference(set(remove))
+    last_remove = set(remove).difference(set(only))
+    for name, field in validate_props.items():
+        if (last_only and not name in last_only) or name in last_remove or name.startswith('_'):
+            continue
+        default = field.get_default() if is_default and isinstance(field, Field) else None
+        plan.append((name, default, key))
+    return tuple(plan)
+
+
+def build_serializer(validate_props, key, compact=False):
+    """
+    Build the to_dict function of one model for one projection.
+
+    key is projection_key(is_default, only, remove) or Fieldset.key(). The
+    emitted names and their defaults are resolved here; nested models are
+    serialized through their own cached serializers, with the same key
+    for only/remove and with the subtree of their name for a Fieldset.
+    """
+    plan = _projection_plan(validate_props, key)
+
+    def convert_list(lst, key):
+        rst = []
+        for value in lst:
+            if type(value) == list:
+                rst.append(convert_list(value, key))
+            elif isinstance(value, SchemaBaseModel):
+                rst.append(value.__serialize__(key))
+            else:
+                rst.append(value)
+        return rst
+
+    if compact:
+        def serialize(obj):
+            _dict = {}
+            for name, default, child in plan:
+                value = getattr(obj, name, _MISSING)
+                if value is _MISSING:
+                    continue
+                if type(value) == list:
+                    value = convert_list(value, child)
+                elif isinstance(value, SchemaBaseModel):
+                    value = value.__serialize__(child)
+                elif value is None:
+                    value = default
+                _dict[name] = value
+            return _dict
+    else:
+        def serialize(obj):
+            values = obj.__dict__
+            _dict = {}
+            for name, default, child in plan:
+                if name in values:
+                    value = values[name]
+                    if type(value) == list:
+                        value = convert_list(value, child)
+                    elif isinstance(value, SchemaBaseModel):
+                        value = value.__serialize__(child)
+                    elif value is None:
+                        value = default
+                    _dict[name] = value
+            return _dict
+    return serialize
+
+
+def get_serializer(serializers, validate_props, key, compact=False):
+    serializer = serializers.get(key)
+    if serializer is None:
+        serializer = build_serializer(validate_props, key, compact)
+        if len(serializers) < MAX_SERIALIZERS:
+            serializers[key] = serializer
+    return serializer
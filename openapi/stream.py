@@ -0,0 +1,178 @@
+import json
+import codecs
+
+from django.http import StreamingHttpResponse
+from openapi.schema.field import ListField, SchemaBaseModel
+from openapi.schema import codec as json_codec
+from openapi.schema.codec import json_default
+
+CHUNK_SIZE = 64 * 1024
+JSON_CONTENT_TYPE = "application/json"
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+_WHITESPACE = " \t\n\r"
+_NUMBER_TAIL = "0123456789.eE+-"
+_decoder = json.JSONDecoder()
+# longest token the decoder rejects when cut short: a \uXXXX escape
+_LONGEST_TOKEN = 6
+
+
+class JSONStreamError(ValueError):
+    """The body is not a well-formed JSON array."""
+    pass
+
+
+def _truncated(buf, error):
+    """Whether more input could fix a decode error, i.e. it is at the end of buf."""
+    pos = getattr(error, "pos", None)
+    if pos is None or error.msg.startswith("Unterminated string"):
+        return True
+    # a literal or escape cut at the end is reported where it starts
+    return len(buf) - pos < _LONGEST_TOKEN
+
+
+class _Reader(object):
+    """Text buffer over a binary file-like object, filled on demand."""
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.buf = self.buf[self.pos:] + self.decoder.decode(b"", True)
+        else:
+            if not isinstance(chunk, bytes):
+                chunk = chunk.encode("utf-8")
+            self.buf = self.buf[self.pos:] + self.decoder.decode(chunk)
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, "" at the end of input."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return ""
+
+    def value(self):
+        """Decode the next JSON value, reading until a delimiter follows it."""
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except ValueError as e:
+                if _truncated(self.buf, e) and self.fill():
+                    continue
+                raise JSONStreamError(str(e))
+            # a number cut at the end of the buffer may continue in the next chunk
+            if self.eof or end < len(self.buf) and self.buf[end] not in _NUMBER_TAIL:
+                self.pos = end
+                return value
+            self.fill()
+
+
+def iter_json_array(fp, chunk_size=CHUNK_SIZE, allow_empty=False):
+    """
+    Yield the elements of a top-level JSON array read incrementally from fp.
+
+    Only the current element and one chunk are held in memory.
+    """
+    reader = _Reader(fp, chunk_size)
+    first = reader.peek()
+    if first == "" and allow_empty:
+        return
+    if first != "[":
+        raise JSONStreamError("request body should be a JSON array")
+    reader.pos += 1
+    if reader.peek() == "]":
+        reader.pos += 1
+    else:
+        while True:
+            reader.peek()
+            yield reader.value()
+            delimiter = reader.peek()
+            reader.pos += 1
+            if delimiter == "]":
+                break
+            if delimiter != ",":
+                raise JSONStreamError("request body is not a valid JSON array")
+    if reader.peek() != "":
+        raise JSONStreamError("request body has extra data after the JSON array")
+
+
+def iter_validated_items(fp, field, name=None, chunk_size=CHUNK_SIZE):
+    """
+    Validate the items of a JSON array body one by one as they are read.
+
+    Stops at the first invalid item or as soon as max_items is exceeded;
+    min_items is checked once the array ends.
+    """
+    name = name or field.name or field.__class__.__name__
+    validate_item = field.compile_item(name, to_dict=True)
+    count = 0
+    try:
+        for item in iter_json_array(fp, chunk_size, allow_empty=not field.required):
+            count += 1
+            if field.max_items is not None and count > field.max_items:
+                raise ValueError('{}\'s maximum length should not exceed {} characters.'.format(name, field.max_items))
+            yield validate_item(item)
+    except JSONStreamError as e:
+        raise ValueError("{} should be list type: {}".format(name, e))
+    if field.min_items is not None and count < field.min_items:
+        raise ValueError('{} should be at least {} items.'.format(name, field.min_items))
+
+
+def request_body_stream_validator(request, validate_model, chunk_size=CHUNK_SIZE):
+    """Like request_body_validator, but binds a generator of validated items."""
+    if not isinstance(validate_model, ListField) or not validate_model.name:
+        raise Exception("Streaming request body needs a named ListField.")
+    return {validate_model.name: iter_validated_items(request, validate_model, chunk_size=chunk_size)}
+
+
+def iter_json(items, ndjson=False, chunk_size=CHUNK_SIZE, is_default=False, only=[], remove=[], fieldset=None):
+    """
+    Encode items, SchemaModel instances or plain values, as a JSON array or
+    NDJSON lines, yielding byte chunks of roughly chunk_size.
+
+    Only one item is turned into a dict at a time. Items are encoded by
+    the configured JSON backend, see openapi.schema.codec.
+    """
+    separator = b"\n" if ndjson else b","
+    parts, size = [] if ndjson else [b"["], 0
+    first = True
+    for item in items:
+        if isinstance(item, SchemaBaseModel):
+            item = item.to_dict(is_default=is_default, only=only, remove=remove, fieldset=fieldset)
+        data = json_codec.dumps(item)
+        if ndjson:
+            parts.append(data)
+            parts.append(separator)
+        else:
+            if not first:
+                parts.append(separator)
+            parts.append(data)
+        first = False
+        size += len(data) + 1
+        if size >= chunk_size:
+            yield b"".join(parts)
+            parts, size = [], 0
+    if not ndjson:
+        parts.append(b"]")
+    if parts:
+        yield b"".join(parts)
+
+
+def streaming_response(items, ndjson=False, status=200, **to_dict_kwargs):
+    """StreamingHttpResponse over iter_json, to_dict_kwargs go to SchemaModel.to_dict."""
+    return StreamingHttpResponse(iter_json(items, ndjson, **to_dict_kwargs), status=status,
+                                 content_type=NDJSON_CONTENT_TYPE if ndjson else JSON_CONTENT_TYPE)
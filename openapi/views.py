@@ -0,0 +1,168 @@
+import io
+import gzip
+import hashlib
+import threading
+
+import yaml
+from django.http import HttpResponse, HttpResponseNotModified, HttpResponseNotFound
+
+from collections import OrderedDict
+
+from openapi import _Swagger, gen_swagger_doc, gen_swagger_shard
+from openapi.media import parse_accept
+from openapi.schema import codec as json_codec
+
+CONTENT_TYPES = {
+    "json": "application/json",
+    "yaml": "application/yaml",
+}
+
+
+class _SpecDumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+    # shared fragments would otherwise be written as &id001 anchors
+    def ignore_aliases(self, data):
+        return True
+
+
+def _gzip(content):
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", mtime=0) as f:
+        f.write(content)
+    return buf.getvalue()
+
+
+def _etag(content):
+    return '"{}"'.format(hashlib.sha1(content).hexdigest())
+
+
+class SpecCache(object):
+    """
+    The spec serialized once per format, with gzip variants and ETags.
+
+    It is rebuilt on the next request after any swagger_api or
+    register_swagger_* declaration.
+    """
+
+    def __init__(self, build=None, **setup_kwargs):
+        self.build = build or (lambda: gen_swagger_doc(**setup_kwargs))
+        self.lock = threading.Lock()
+        self.generation = None
+        self.variants = {}
+
+    def encode(self, doc):
+        variants = {}
+        artifact = _Swagger.artifact
+        if artifact is not None and doc is artifact.doc:
+            content = artifact.content
+        else:
+            content = json_codec.dumps(doc)
+        for fmt, content in (
+            ("json", content),
+            ("yaml", yaml.dump(doc, Dumper=_SpecDumper, default_flow_style=False, allow_unicode=True).encode("utf-8")),
+        ):
+            etag = _etag(content)
+            variants[(fmt, False)] = (content, etag)
+            variants[(fmt, True)] = (_gzip(content), etag[:-1] + '-gzip"')
+        return variants
+
+    def get(self, fmt="json", gzipped=False):
+        """Return (content, etag) for fmt, "json" or "yaml"."""
+        if self.generation != _Swagger.generation:
+            with self.lock:
+                if self.generation != _Swagger.generation:
+                    generation = _Swagger.generation
+                    self.variants = self.encode(self.build())
+                    self.generation = generation
+        return self.variants[(fmt, gzipped)]
+
+
+def _accepts_gzip(request):
+    """Whether Accept-Encoding allows gzip, a q of 0 refuses it."""
+    qualities = dict(parse_accept(request.META.get("HTTP_ACCEPT_ENCODING", "")))
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0) > 0
+
+
+def _if_none_match(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+
+def serve_spec(request, cache, fmt=None):
+    """Answer a spec request from cache, with 304 on If-None-Match."""
+    if fmt is None:
+        fmt = request.GET.get("format")
+        if fmt is None:
+            fmt = "yaml" if "yaml" in request.META.get("HTTP_ACCEPT", "") else "json"
+    if fmt not in CONTENT_TYPES:
+        return HttpResponse(status=406)
+    gzipped = _accepts_gzip(request)
+    content, etag = cache.get(fmt, gzipped)
+    if _if_none_match(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=CONTENT_TYPES[fmt])
+        if gzipped:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = etag
+    response["Vary"] = "Accept, Accept-Encoding"
+    return response
+
+
+def swagger_spec_view(fmt=None, **setup_kwargs):
+    """
+    Django view serving the spec, setup_kwargs are those of swagger_setup.
+
+    urlpatterns.append(url(r'^docs$', swagger_spec_view(title="demo", version="1.0.0")))
+
+    The format comes from fmt, ?format=json|yaml or the Accept header.
+    """
+    cache = SpecCache(**setup_kwargs)
+
+    def spec_view(request):
+        return serve_spec(request, cache, fmt)
+    spec_view.cache = cache
+    return spec_view
+
+
+def swagger_shard_view(fmt=None, max_shards=128, **setup_kwargs):
+    """
+    Django view serving the spec of one tag or path prefix, see gen_swagger_shard.
+
+    view = swagger_shard_view(title="demo", version="1.0.0")
+    urlpatterns += [
+        url(r'^docs/tags/(?P<tag>[^/]+)$', view),
+        url(r'^docs/paths/(?P<prefix>.*)$', view),
+    ]
+
+    ?tag= and ?prefix= work too. Each shard is built on its first request
+    and cached on its own like swagger_spec_view; up to max_shards are
+    kept, the oldest is dropped first. Unknown shards are 404.
+    """
+    caches = OrderedDict()
+    lock = threading.Lock()
+
+    def shard_view(request, tag=None, prefix=None):
+        tag = tag or request.GET.get("tag") or None
+        prefix = prefix if prefix is not None else request.GET.get("prefix")
+        if prefix is not None:
+            prefix = "/" + prefix.lstrip("/")
+        key = (tag, prefix)
+        with lock:
+            cache = caches.get(key)
+            if cache is None:
+                cache = caches[key] = SpecCache(build=lambda: gen_swagger_shard(tag=tag, prefix=prefix, **setup_kwargs))
+                while len(caches) > max_shards:
+                    caches.popitem(last=False)
+        try:
+            return serve_spec(request, cache, fmt)
+        except LookupError:
+            with lock:
+                caches.pop(key, None)
+            return HttpResponseNotFound()
+    shard_view.caches = caches
+    return shard_view
@@ -7,6 +7,12 @@ import logging
 path = os.path.dirname(__file__)
 
 sys.path.append(os.path.dirname(os.path.abspath(path)))
+
+from django.conf import settings
+if not settings.configured:
+    settings.configure(DEBUG=True, ALLOWED_HOSTS=["*"], ROOT_URLCONF=__name__)
+urlpatterns = []
+
 from test_schema import (
     test_list_object_validate,
     test_list_validate,
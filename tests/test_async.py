@@ -0,0 +1,67 @@
+# encoding: utf-8
+import time
+import asyncio
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, route_hander, _Swagger
+from openapi.router import Router, iscoroutinefunction
+from openapi.schema.field import IntField
+
+factory = RequestFactory()
+
+
+@swagger_api(path="/async/items/{id}", method="get",
+             parameters=[(IntField(name="id", min_value=1), "path"), (IntField(name="delay"), "query")])
+async def get_item(request, id, delay=0):
+    await asyncio.sleep(delay / 1000.0)
+    return HttpResponse("item {} {}".format(id, type(id).__name__))
+
+
+@swagger_api(path="/async/items/{id}", method="delete", parameters=[(IntField(name="id"), "path")])
+def delete_item(request, id):
+    return HttpResponse("deleted {}".format(id))
+
+
+def test_async_api():
+    assert(iscoroutinefunction(get_item))
+    assert(not iscoroutinefunction(delete_item))
+    response = asyncio.run(get_item(factory.get("/"), "3"))
+    assert(response.content == b"item 3 int")
+    try:
+        asyncio.run(get_item(factory.get("/"), "0"))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_async_route_hander():
+    hander = route_hander("/async/items/([^/]+)")
+    assert(iscoroutinefunction(hander))
+    assert(asyncio.run(hander(factory.get("/"), "4")).content == b"item 4 int")
+    # sync handlers of the same path run in a thread
+    assert(asyncio.run(hander(factory.delete("/"), "4")).content == b"deleted 4")
+    assert(asyncio.run(hander(factory.post("/"), "4")).status_code == 405)
+
+    patterns = Router(_Swagger.handlers).django_urls()
+    dispatch = patterns[0].callback
+    assert(iscoroutinefunction(dispatch))
+    assert(asyncio.run(dispatch(factory.get("/"), "async/items/5")).content == b"item 5 int")
+    assert(asyncio.run(dispatch(factory.get("/"), "async/nothing")).status_code == 404)
+    # only paths with an async def handler take the async view
+    assert(patterns[0].resolve("async/items/5").kwargs == {"path": "async/items/5"})
+    assert(patterns[0].resolve("router/users/me") is None and patterns[0].resolve("async/nothing") is None)
+    assert(not iscoroutinefunction(patterns[1].callback))
+    assert(patterns[1].callback(factory.get("/"), "async/items/6").content == b"item 6 int")
+
+
+def test_async_concurrency():
+    hander = route_hander("/async/items/([^/]+)")
+
+    async def run(count):
+        return await asyncio.gather(*[hander(factory.get("/", {"delay": "100"}), str(i + 1)) for i in range(count)])
+    start = time.time()
+    responses = asyncio.run(run(500))
+    assert(len(responses) == 500 and responses[-1].content == b"item 500 int")
+    # 500 requests of 100ms each overlap on one thread
+    assert(time.time() - start < 5)
@@ -0,0 +1,39 @@
+# encoding: utf-8
+import json
+
+from openapi import bulk
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField
+
+
+@schema_model
+class Row(object):
+    id = IntField(required=True, min_value=1)
+    name = StringField(max_length=5)
+
+
+def test_bulk_jsonl(tmp_path):
+    source = tmp_path / "dump.jsonl"
+    lines = [json.dumps({"id": i + 1, "name": "n"}) for i in range(25)]
+    lines[3] = '{"id": 0}'
+    lines[10] = '{"id": 2, "name": "too long"}'
+    lines[17] = '{"id": '
+    source.write_text("\n".join(lines) + "\n")
+    rejects = tmp_path / "rejects.jsonl"
+    for workers in (1, 2):
+        assert(bulk.main(["test_bulk:Row", str(source), "--rejects", str(rejects),
+                          "--workers", str(workers), "--chunk-size", "4"]) == 1)
+        result = [json.loads(line) for line in rejects.read_text().splitlines()]
+        assert([r["line"] for r in result] == [4, 11, 18])
+        assert(result[0]["record"] == '{"id": 0}' and "larger than" in result[0]["error"])
+        assert(result[2]["error"].startswith("invalid JSON"))
+
+
+def test_bulk_csv(tmp_path):
+    source = tmp_path / "dump.csv"
+    source.write_text("id,name\n1,a\nx,b\n3,\n")
+    summary = bulk.run("test_bulk.Row", [str(source)], workers=1)
+    assert(summary["records"] == 3 and summary["rejected"] == 1)
+    rejects = []
+    bulk.run("test_bulk:Row", [str(source)], type("F", (), {"write": lambda self, s: rejects.append(json.loads(s))})(), 1)
+    assert(rejects == [{"file": str(source), "line": 3, "error": "<Row.id> should be integer type", "record": {"id": "x", "name": "b"}}])
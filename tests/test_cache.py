@@ -0,0 +1,125 @@
+# encoding: utf-8
+import asyncio
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, gen_swagger_doc
+from openapi.cache import ResponseCache, LRUBackend, DjangoCacheBackend
+from openapi.media import media_response, register_media_codec, unregister_media_codec
+from openapi.schema.field import IntField, StringField
+
+factory = RequestFactory()
+
+calls = []
+item_cache = ResponseCache(ttl=30, max_entries=2, vary=["Accept-Language"])
+
+
+@swagger_api(path="/cache/items/{id}", method="get",
+             parameters=[(IntField(name="id"), "path"), (StringField(name="q"), "query")], cache=item_cache)
+def get_item(request, id, q=None):
+    calls.append((id, q))
+    return HttpResponse("{} {}".format(id, q), content_type="text/plain")
+
+
+@swagger_api(path="/cache/async", method="get", parameters=[(IntField(name="n"), "query")], cache=60)
+async def get_async(request, n=0):
+    calls.append(n)
+    return HttpResponse("n" * n)
+
+
+def test_cache_keyed_on_validated_parameters():
+    del calls[:]
+    item_cache.clear()
+    first = get_item(factory.get("/", {"q": "a"}), "01")
+    again = get_item(factory.get("/", {"q": "a"}), "1")
+    assert(calls == [(1, "a")] and again.content == first.content == b"1 a")
+    assert(again["Content-Type"] == "text/plain" and again["Cache-Control"] == "public, max-age=30")
+    assert(again["ETag"] == first["ETag"] and again["Vary"] == "Accept-Language")
+    not_modified = get_item(factory.get("/", {"q": "a"}, HTTP_IF_NONE_MATCH=first["ETag"]), "1")
+    assert(not_modified.status_code == 304 and calls == [(1, "a")])
+
+    get_item(factory.get("/", {"q": "a"}, HTTP_ACCEPT_LANGUAGE="fr"), "1")
+    get_item(factory.get("/", {"q": "b"}), "1")
+    assert(len(calls) == 3)
+    # max_entries=2, the first entry was evicted
+    get_item(factory.get("/", {"q": "a"}), "1")
+    assert(len(calls) == 4)
+
+
+@swagger_api(path="/cache/media", method="get", parameters=[(IntField(name="n"), "query")], cache=60)
+def get_media(request, n=0):
+    calls.append(n)
+    return media_response(request, {"n": n}, media_types=["application/x-cache-test"])
+
+
+@swagger_api(path="/cache/secured", method="get", security=[{"token": []}], cache=60)
+def get_secured(request):
+    calls.append(request.META.get("HTTP_AUTHORIZATION"))
+    return HttpResponse(request.META.get("HTTP_AUTHORIZATION"))
+
+
+def test_cache_keeps_handler_vary():
+    del calls[:]
+    register_media_codec("application/x-cache-test", lambda value: value, lambda obj: repr(obj).encode("utf-8"))
+    try:
+        binary = get_media(factory.get("/", {"n": "1"}, HTTP_ACCEPT="application/x-cache-test"))
+        text = get_media(factory.get("/", {"n": "1"}, HTTP_ACCEPT="application/json"))
+        assert(binary["Content-Type"] == "application/x-cache-test" and text["Content-Type"] == "application/json")
+        hit = get_media(factory.get("/", {"n": "1"}, HTTP_ACCEPT="application/json"))
+        assert(hit.content == text.content and hit["Vary"] == "Accept" and calls == [1, 1])
+    finally:
+        unregister_media_codec("application/x-cache-test")
+
+
+def test_secured_cache_is_private():
+    del calls[:]
+    alice = get_secured(factory.get("/", HTTP_AUTHORIZATION="alice"))
+    bob = get_secured(factory.get("/", HTTP_AUTHORIZATION="bob"))
+    assert(alice.content == b"alice" and bob.content == b"bob" and calls == ["alice", "bob"])
+    assert(get_secured(factory.get("/", HTTP_AUTHORIZATION="alice")).content == b"alice" and len(calls) == 2)
+    assert(alice["Cache-Control"] == "private, max-age=60" and "Authorization" in alice["Vary"])
+
+
+def test_cache_key_needs_json_values():
+    cache = ResponseCache(ttl=5)
+    handler = cache.wrap(lambda request, x: HttpResponse(), "GET /object")
+    try:
+        handler(factory.get("/"), object())
+        assert False
+    except TypeError:
+        pass
+
+
+def test_async_cache():
+    del calls[:]
+    for _ in range(2):
+        response = asyncio.run(get_async(factory.get("/", {"n": "3"})))
+        assert(response.content == b"nnn")
+    assert(calls == [3])
+
+
+def test_lru_backend_expiry():
+    backend = LRUBackend(max_entries=10)
+    backend.set("a", 1, -1)
+    backend.set("b", 2, 10)
+    assert(backend.get("a") is None and backend.get("b") == 2)
+
+
+def test_django_cache_backend():
+    cache = ResponseCache(ttl=5, backend=DjangoCacheBackend())
+    handler = cache.wrap(lambda request, x: HttpResponse(str(x)), "GET /django")
+    first = handler(factory.get("/"), 1)
+    assert(cache.lookup("GET /django", factory.get("/"), (1,), {})[1].content == first.content)
+    assert(handler(factory.get("/"), 1)["ETag"] == first["ETag"])
+
+
+def test_cache_in_spec():
+    operation = gen_swagger_doc()["paths"]["/cache/items/{id}"]["get"]
+    assert(operation["x-cache"] == {"ttl": 30, "vary": ["Accept-Language"], "private": False})
+    assert(set(operation["responses"]["200"]["headers"]) == {"ETag", "Cache-Control"})
+    assert("304" in operation["responses"])
+    try:
+        swagger_api(path="/cache/post", method="post", cache=10)
+        assert False
+    except ValueError:
+        pass
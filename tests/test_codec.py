@@ -0,0 +1,66 @@
+# encoding: utf-8
+import json
+
+from django.test import RequestFactory
+from django.http import HttpResponse
+from openapi import request_body_validator, swagger_api
+from openapi.views import swagger_spec_view
+from openapi.response import json_response
+from openapi.stream import iter_json
+from openapi.schema import schema_model, codec
+from openapi.schema.field import IntField, StringField, ListField, ObjectField, AnyOfField
+
+factory = RequestFactory()
+
+
+@schema_model
+class Point(object):
+    x = IntField()
+    label = StringField()
+
+
+@swagger_api(path="/codec/int-keys", method="get")
+def get_int_keys(request):
+    """
+    unquoted status codes parse as int keys
+    ---
+    responses:
+      200:
+        description: OK
+    """
+    return HttpResponse()
+
+
+def test_json_backends():
+    names = codec.available_json_backends()
+    assert(names[-1] == "json" and codec.codec.name == names[0])
+    try:
+        codec.get_json_backend("yaml")
+        assert False
+    except ValueError:
+        pass
+    try:
+        for name in names:
+            codec.use_json_backend(name)
+            assert(ListField(item_field=IntField()).validate("v", b"[1, 2]") == [1, 2])
+            assert(ListField(item_field=Point).compile("v", to_dict=True)('[{"x": 1}]') == [{"x": 1}])
+            assert(ObjectField(Point).validate("v", u'{"x": 2, "label": "é"}', to_dict=True) == {"x": 2, "label": u"é"})
+            assert(AnyOfField([Point]).validate("v", '{"x": 3}', to_dict=True) == {"x": 3})
+            try:
+                ListField(item_field=IntField()).validate("v", "[1,")
+                assert False
+            except ValueError:
+                pass
+
+            request = factory.post("/", u'[{"x": 1, "label": "é"}]'.encode("utf-8"), content_type="application/json")
+            assert(request_body_validator(request, ListField(name="points", item_field=Point)) == {"points": [{"x": 1, "label": u"é"}]})
+
+            response = json_response([Point(x=1), {"nested": Point(x=2)}], status=201, remove=["label"])
+            assert(response.status_code == 201 and response["Content-Type"] == "application/json")
+            assert(json.loads(response.content) == [{"x": 1}, {"nested": {"x": 2}}])
+            assert(json.loads(b"".join(iter_json([Point(x=1, label="a"), 2]))) == [{"x": 1, "label": "a"}, 2])
+            # int keys are written as strings, as stdlib json does
+            assert(json.loads(json_response({200: "ok"}).content) == {"200": "ok"})
+            assert(json.loads(swagger_spec_view()(factory.get("/docs")).content)["paths"]["/codec/int-keys"])
+    finally:
+        codec.use_json_backend()
@@ -0,0 +1,70 @@
+# encoding: utf-8
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, gen_swagger_doc, _Swagger
+from openapi.export import export_spec, use_spec_artifact, main
+from openapi.schema.field import IntField
+from openapi.views import swagger_spec_view
+
+factory = RequestFactory()
+
+
+@swagger_api(path="/export/items/{id}", method="get", parameters=[(IntField(name="id", min_value=1), "path")])
+def get_item(request, id):
+    return HttpResponse(str(id))
+
+
+def test_export_and_artifact(tmp_path):
+    path = str(tmp_path / "openapi.json")
+    digest = export_spec(path, title="exported", version="1.0.0")
+    content = open(path, "rb").read()
+    assert(export_spec(path, title="exported", version="1.0.0") == digest)
+    assert(open(path + ".sha256").read().split() == [digest, "openapi.json"])
+    assert(list(json.loads(content)) == sorted(json.loads(content)))
+    assert(main(["--module", "test_export", "--output", str(tmp_path / "cli.yaml"), "--title", "cli"]) == 0)
+
+    try:
+        artifact = use_spec_artifact(path)
+        assert(gen_swagger_doc(title="ignored") is artifact.doc)
+        assert(artifact.doc["info"]["title"] == "exported")
+
+        @swagger_api(path="/export/late", method="get", parameters=[(IntField(name="n", max_value=3), "query")])
+        def late(request, n=0):
+            return HttpResponse(str(n))
+        # the fragment waits unbuilt, validation still runs
+        assert(_Swagger.pending)
+        gen_swagger_doc()
+        assert(_Swagger.pending)
+        assert(late(factory.get("/", {"n": "2"})).content == b"2")
+        try:
+            late(factory.get("/", {"n": "5"}))
+            assert False
+        except ValueError:
+            pass
+
+        response = swagger_spec_view(title="ignored")(factory.get("/docs"))
+        assert(response.content == content)
+        assert("/export/late" not in json.loads(response.content)["paths"])
+
+        with open(path, "ab") as f:
+            f.write(b" ")
+        try:
+            use_spec_artifact(path)
+            assert False
+        except ValueError:
+            pass
+        open(path + ".sha256", "w").close()
+        try:
+            use_spec_artifact(path)
+            assert False
+        except ValueError as e:
+            assert("empty" in str(e))
+        assert(use_spec_artifact(str(tmp_path / "cli.yaml")).doc["info"]["title"] == "cli")
+    finally:
+        use_spec_artifact(None)
+    doc = gen_swagger_doc()
+    assert(doc["info"]["title"] == "")
+    # endpoints declared while the artifact was in use are built now
+    assert("/export/late" in doc["paths"] and "/export/items/{id}" in doc["paths"])
@@ -0,0 +1,93 @@
+# encoding: utf-8
+import json
+
+from django.test import RequestFactory
+from openapi import swagger_api, gen_swagger_doc
+from openapi.response import json_response
+from openapi.schema import schema_model, Fieldset, allowed_paths
+from openapi.schema.field import IntField, StringField, ListField, ObjectField
+
+factory = RequestFactory()
+
+
+@schema_model
+class Author(object):
+    id = IntField()
+    name = StringField()
+    email = StringField(name="mail")
+
+
+@schema_model(compact=True)
+class Comment(object):
+    id = IntField()
+    text = StringField()
+    author = ObjectField(Author)
+
+
+@schema_model
+class Article(object):
+    id = IntField()
+    title = StringField()
+    author = ObjectField(Author)
+    comments = ListField(item_field=Comment)
+
+
+ARTICLE = {"id": 1, "title": "t", "author": {"id": 2, "name": "a", "mail": "a@x"},
+           "comments": [{"id": 3, "text": "c", "author": {"id": 4, "name": "b", "mail": "b@x"}}]}
+
+
+@swagger_api(path="/fieldset/articles", method="get", responses=[{"response": ListField(item_field=Article)}],
+             sparse_fields=True)
+def list_articles(request, fieldset=None):
+    return json_response([Article(**ARTICLE)], fieldset=fieldset)
+
+
+def test_allowed_paths():
+    paths = allowed_paths(Article)
+    assert(paths[0] == "author" and set(paths[1:4]) == {"author.id", "author.mail", "author.name"})
+    assert("comments.author.mail" in paths and "email" not in paths)
+
+
+def test_fieldset_serialization():
+    article = Article(**ARTICLE)
+    allowed = allowed_paths(Article)
+    fieldset = Fieldset.parse(allowed, "id, author.name,comments.author.id")
+    assert(article.to_dict(fieldset=fieldset) == {
+        "id": 1, "author": {"name": "a"}, "comments": [{"author": {"id": 4}}]})
+    fieldset = Fieldset.parse(allowed, exclude="comments,author.mail")
+    assert(article.to_dict(fieldset=fieldset) == {"id": 1, "title": "t", "author": {"id": 2, "name": "a"}})
+    fieldset = Fieldset.parse(allowed, ["author", "author.id"], ["author.name"])
+    assert(article.to_dict(fieldset=fieldset) == {"author": {"id": 2, "mail": "a@x"}})
+    assert(fieldset.filter(ARTICLE) == {"author": {"id": 2, "mail": "a@x"}})
+    assert(Fieldset.parse(allowed, "", None) is None)
+    # the usual only/remove still apply by name at every level
+    assert(article.to_dict(only=["id"]) == {"id": 1})
+    try:
+        Fieldset.parse(allowed, "author.password")
+        assert False
+    except ValueError as e:
+        assert("author.password" in str(e))
+
+
+def test_sparse_fields_endpoint():
+    response = list_articles(factory.get("/", {"fields": "title,comments.text"}))
+    assert(json.loads(response.content) == [{"title": "t", "comments": [{"text": "c"}]}])
+    response = list_articles(factory.get("/"))
+    assert(json.loads(response.content) == [ARTICLE])
+    try:
+        list_articles(factory.get("/", {"exclude": "nope"}))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_sparse_fields_in_spec():
+    parameters = gen_swagger_doc()["paths"]["/fieldset/articles"]["get"]["parameters"]
+    fields = [p for p in parameters if p["name"] in ("fields", "exclude")]
+    assert(len(fields) == 2 and fields[0]["schema"]["items"]["enum"] == allowed_paths(Article))
+    assert(fields[0]["style"] == "form" and fields[0]["explode"] is False)
+    try:
+        swagger_api(path="/fieldset/none", sparse_fields=True)
+        assert False
+    except ValueError:
+        pass
@@ -0,0 +1,123 @@
+# encoding: utf-8
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, gen_request_body, gen_response
+from openapi.media import (
+    MSGPACK_CONTENT_TYPE,
+    CBOR_CONTENT_TYPE,
+    register_media_codec,
+    unregister_media_codec,
+    get_media_codec,
+    available_media_types,
+    parse_accept,
+    negotiate,
+    media_response,
+)
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, FloatField, ListField
+
+factory = RequestFactory()
+
+# stands in for a binary format in environments without msgpack/cbor2
+TEST_CONTENT_TYPE = "application/x-test-json"
+register_media_codec(TEST_CONTENT_TYPE, lambda value: json.loads(value.decode("utf-8")),
+                     lambda obj: json.dumps(obj, sort_keys=True).encode("utf-8"))
+
+
+@schema_model
+class Sample(object):
+    id = IntField(min_value=1)
+    value = FloatField()
+
+
+# the built-in codecs only, whatever other modules registered
+MEDIA_TYPES = [TEST_CONTENT_TYPE] + [t for t in available_media_types() if t in (MSGPACK_CONTENT_TYPE, CBOR_CONTENT_TYPE)]
+
+
+def teardown_module():
+    unregister_media_codec(TEST_CONTENT_TYPE)
+
+
+@swagger_api(path="/media/samples", method="post", request_body=ListField(name="rows", item_field=Sample),
+             responses=[{"response": ListField(item_field=Sample)}], media_types=MEDIA_TYPES)
+def post_samples(request, rows):
+    return media_response(request, rows, media_types=MEDIA_TYPES)
+
+
+def test_accept_negotiation():
+    assert(parse_accept("application/json;q=0.5, application/msgpack") ==
+           [("application/msgpack", 1.0), ("application/json", 0.5)])
+    request = factory.get("/", HTTP_ACCEPT="application/cbor;q=0, application/msgpack;q=0.9, */*;q=0.1")
+    assert(negotiate(request, [CBOR_CONTENT_TYPE, MSGPACK_CONTENT_TYPE]) == MSGPACK_CONTENT_TYPE)
+    assert(negotiate(request, [CBOR_CONTENT_TYPE]) == "application/json")
+    assert(negotiate(factory.get("/"), [MSGPACK_CONTENT_TYPE]) == "application/json")
+
+
+def test_binary_bodies():
+    rows = [{"id": 1, "value": 0.5}, {"id": 2, "value": 1.5}]
+    for content_type in MEDIA_TYPES:
+        codec = get_media_codec(content_type)
+        request = factory.post("/", codec.dumps(rows), content_type=content_type, HTTP_ACCEPT=content_type)
+        response = post_samples(request)
+        assert(response["Content-Type"] == content_type and response["Vary"] == "Accept")
+        assert(codec.loads(response.content) == rows)
+        try:
+            post_samples(factory.post("/", codec.dumps([{"id": 0}]), content_type=content_type))
+            assert False
+        except ValueError:
+            pass
+    response = post_samples(factory.post("/", json.dumps(rows), content_type="application/json"))
+    assert(response["Content-Type"] == "application/json" and json.loads(response.content) == rows)
+
+
+@swagger_api(path="/media/sample", method="post", request_body=Sample, media_types=MEDIA_TYPES)
+def post_sample(request, **sample):
+    return media_response(request, sample, media_types=MEDIA_TYPES)
+
+
+def test_model_bodies():
+    for content_type in ["application/json"] + MEDIA_TYPES:
+        dumps = json.dumps if content_type == "application/json" else get_media_codec(content_type).dumps
+        # unknown keys, "self" included, are left out instead of reaching the constructor
+        body = dumps({"id": 1, "value": 0.5, "self": 1, "other": 2})
+        response = post_sample(factory.post("/", body, content_type=content_type, HTTP_ACCEPT="application/json"))
+        assert(json.loads(response.content) == {"id": 1, "value": 0.5})
+        for bad in ([1], {"id": 0}):
+            try:
+                post_sample(factory.post("/", dumps(bad), content_type=content_type))
+                assert False
+            except ValueError:
+                pass
+
+
+def test_media_types_in_spec():
+    body = gen_request_body(Sample, media_types=[MSGPACK_CONTENT_TYPE])
+    assert(list(body["content"]) == ["application/json", MSGPACK_CONTENT_TYPE])
+    assert(body["content"][MSGPACK_CONTENT_TYPE] == body["content"]["application/json"])
+    response = gen_response(Sample, media_types=[CBOR_CONTENT_TYPE])["200"]
+    assert(list(response["content"]) == ["application/json", CBOR_CONTENT_TYPE])
+    stream = gen_response(Sample, stream=True, media_types=[CBOR_CONTENT_TYPE])["200"]
+    assert(list(stream["content"]) == ["application/json"])
+    try:
+        swagger_api(path="/media/unknown", media_types=["application/x-unknown"])
+        assert False
+    except ValueError:
+        pass
+
+
+def test_missing_codec_package_fails_at_declaration():
+    from openapi import media
+
+    def missing():
+        import no_such_codec_package
+    media._FACTORIES["application/x-missing"] = missing
+    try:
+        assert("application/x-missing" not in available_media_types())
+        swagger_api(path="/media/missing", method="post", media_types=["application/x-missing"])
+        assert False
+    except ImportError:
+        pass
+    finally:
+        media._FACTORIES.pop("application/x-missing")
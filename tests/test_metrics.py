@@ -0,0 +1,63 @@
+# encoding: utf-8
+import asyncio
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, metrics
+from openapi.schema.field import IntField, ListField
+
+factory = RequestFactory()
+
+
+@swagger_api(path="/metrics/items/{id}", method="post",
+             parameters=[(IntField(name="id", min_value=1), "path"), (IntField(name="limit", max_value=10), "query")],
+             request_body=ListField(name="rows", item_field=IntField()))
+def post_items(request, id, limit=0, rows=None):
+    with metrics.timer("serialize"):
+        content = "{} {}".format(id, rows)
+    return HttpResponse(content)
+
+
+@swagger_api(path="/metrics/async", method="get", parameters=[(IntField(name="n"), "query")])
+async def get_async(request, n=0):
+    return HttpResponse("n" * n)
+
+
+def call(view, *args, **kwargs):
+    try:
+        view(*args, **kwargs)
+        assert False
+    except ValueError:
+        pass
+
+
+def test_metrics_collector():
+    collector = metrics.enable()
+    try:
+        assert(post_items(factory.post("/", "[1, 2]", content_type="application/json"), "3").content == b"3 [1, 2]")
+        call(post_items, factory.post("/", "[1]", content_type="application/json"), "0")
+        call(post_items, factory.post("/?limit=11", "[1]", content_type="application/json"), "3")
+        call(post_items, factory.post("/", '["x"]', content_type="application/json"), "3")
+        asyncio.run(get_async(factory.get("/", {"n": "5"})))
+    finally:
+        metrics.disable()
+
+    operation = "POST /metrics/items/{id}"
+    assert(collector.phases[(operation, "bind")].count == 4)
+    assert(collector.phases[(operation, "validate")].count == 2)
+    assert(collector.phases[(operation, "handler")].count == 1)
+    assert(collector.phases[(operation, "serialize")].count == 1)
+    assert(collector.failures == {(operation, "id"): 1, (operation, "limit"): 1, (operation, "rows"): 1})
+    assert(collector.sizes[(operation, "request")].count == 4)
+    assert(collector.sizes[(operation, "response")].sum == 8)
+    assert(collector.sizes[("GET /metrics/async", "response")].sum == 5)
+
+    text = collector.prometheus_text()
+    assert('openapi_validation_failures_total{operation="POST /metrics/items/{id}",field="limit"} 1' in text)
+    assert('openapi_phase_seconds_count{operation="GET /metrics/async",phase="handler"} 1' in text)
+    assert('openapi_payload_bytes_bucket{operation="POST /metrics/items/{id}",direction="response",le="+Inf"} 1' in text)
+
+    # disabled again, nothing is recorded
+    post_items(factory.post("/", "[1]", content_type="application/json"), "3")
+    assert(collector.phases[(operation, "handler")].count == 1)
+    assert(metrics.metrics_view(factory.get("/")).status_code == 404)
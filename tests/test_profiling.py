@@ -0,0 +1,100 @@
+# encoding: utf-8
+from django.http import HttpResponse
+from openapi import swagger_api, warmup
+from openapi.schema import schema_model, profiling
+from openapi.schema.field import Field, IntField, StringField, ListField
+
+
+def scan_dir(cls):
+    """The dir() scan schema_model used to do."""
+    props = {}
+    for name in dir(cls):
+        if not name.startswith('__'):
+            value = getattr(cls, name)
+            if isinstance(value, Field) and value.get_name():
+                name = value.get_name()
+            if not callable(value):
+                props[name] = value
+    return list(props.items())
+
+
+class Mixin(object):
+    LIMIT = 10
+    _hidden = "x"
+
+    @property
+    def size(self):
+        return 1
+
+    @classmethod
+    def build(cls):
+        return cls()
+
+    @staticmethod
+    def helper():
+        return 1
+
+
+def make_base():
+    class Base(object):
+        id = IntField(required=True)
+        title = StringField(name="Title")
+    return Base
+
+
+def test_attribute_names_match_dir():
+    Base = make_base()
+    base = schema_model(Base)
+
+    @schema_model
+    class Child(base, Mixin):
+        extra = IntField()
+        title = StringField(max_length=3)
+
+    @schema_model(compiled=True)
+    class GrandChild(Child):
+        LIMIT = IntField()
+        note = "plain"
+
+    @schema_model(compact=True)
+    class Compact(object):
+        a = IntField()
+        b = StringField(name="B")
+
+    @schema_model
+    class FromCompact(Compact):
+        c = IntField()
+
+    for cls, model in ((Base, base), (Child.__mro__[1], Child), (GrandChild.__mro__[1], GrandChild),
+                       (FromCompact.__mro__[1], FromCompact)):
+        assert(list(model.get_validate_func_map().items()) == scan_dir(cls))
+    assert(GrandChild(id=1, extra=2, LIMIT=3).to_dict()["LIMIT"] == 3)
+
+
+def test_registration_profiler():
+    used = profiling.enable()
+    try:
+        @schema_model
+        class Profiled(object):
+            rows = ListField(item_field=IntField())
+
+        @swagger_api(path="/profiled/items", method="post", request_body=Profiled)
+        def post_profiled(request, **kwargs):
+            """
+            profiled endpoint
+            ---
+            summary: profiled
+            responses:
+              '200':
+                description: OK
+            """
+            return HttpResponse()
+        warmup()
+    finally:
+        profiling.disable()
+    data = used.as_dict()
+    assert([name.split(".")[-1] for name in data["models"]] == ["Profiled"])
+    assert(list(data["endpoints"]) == ["POST /profiled/items"])
+    assert(data["totals"]["yaml"] > 0 and data["totals"]["schema"] >= 0)
+    report = used.report()
+    assert("POST /profiled/items" in report and "YAML parsing" in report)
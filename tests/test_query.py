@@ -0,0 +1,41 @@
+# encoding: utf-8
+from django.test import RequestFactory
+from openapi import compile_query_validator, query_validator
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, ListField, ObjectField
+
+factory = RequestFactory()
+
+
+@schema_model
+class Page(object):
+    page = IntField(min_value=1)
+    size = IntField(max_value=100)
+
+
+def test_query_binding():
+    bind = compile_query_validator({"QUERY": [
+        IntField(name="start", min_value=0),
+        StringField(name="q"),
+        ListField(name="ids", item_field=IntField()),
+        ListField(name="pages", item_field=Page),
+    ]})
+    params = bind(factory.get("/", {"start": ["1", "5"], "q": "abc", "ids": ["1", "2"], "other": "x"}))
+    assert(params == {"start": 5, "q": "abc", "ids": [1, 2]})
+    assert(bind(factory.get("/?ids=[3,4]")) == {"ids": [3, 4]})
+    assert(bind(factory.get("/", {"pages": '[{"page": 2}]'})) == {"pages": [{"page": 2}]})
+    # POST form values come after the query string ones
+    request = factory.post("/?start=1&ids=1", {"start": "2", "ids": "2"})
+    assert(bind(request) == {"start": 2, "ids": [1, 2]})
+    try:
+        bind(factory.get("/", {"start": "-1"}))
+        assert False
+    except ValueError:
+        pass
+
+
+def test_query_binding_objects():
+    validators = {"QUERY": [ObjectField(Page, name="paging"), Page]}
+    params = query_validator(factory.get("/", {"page": "2", "size": "10", "tag": ["a", "b"]}), validators)
+    assert(params == {"paging": {"page": 2, "size": 10}, "page": 2, "size": 10})
+
@@ -0,0 +1,61 @@
+# encoding: utf-8
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, _Swagger
+from openapi.router import Router, iscoroutinefunction
+from openapi.schema.field import IntField, StringField
+
+factory = RequestFactory()
+
+@swagger_api(path="/router/users/{id}", method="get", parameters=[(IntField(name="id", min_value=1), "path")])
+def get_user(request, id):
+    return HttpResponse("get {} {}".format(id, type(id).__name__))
+
+@swagger_api(path="/router/users/{id}", method="delete", parameters=[(IntField(name="id"), "path")])
+def delete_user(request, id):
+    return HttpResponse("delete {}".format(id))
+
+@swagger_api(path="/router/users/me", method="get")
+def get_me(request):
+    return HttpResponse("me")
+
+@swagger_api(path="/router/users/{id}/books/{name}", method="get",
+             parameters=[(IntField(name="id"), "path"), (StringField(name="name"), "path")])
+def get_book(request, id, name):
+    return HttpResponse("{} {}".format(id, name))
+
+@swagger_api(path="/router/files/{name}.json", method="get", parameters=[(StringField(name="name"), "path")])
+def get_file(request, name):
+    return HttpResponse("file {}".format(name))
+
+
+def test_router_dispatch():
+    router = Router(_Swagger.handlers)
+    assert(router.dispatch(factory.get("/router/users/12"), "router/users/12").content == b"get 12 int")
+    assert(router.dispatch(factory.delete("/router/users/12"), "router/users/12").content == b"delete 12")
+    assert(router.dispatch(factory.get("/router/users/me"), "router/users/me").content == b"me")
+    assert(router.dispatch(factory.get("/"), "router/users/3/books/abc").content == b"3 abc")
+    assert(router.dispatch(factory.post("/"), "router/users/12").status_code == 405)
+    assert(router.dispatch(factory.get("/"), "router/users/12/books").status_code == 404)
+    assert(router.dispatch(factory.get("/"), "router/users/").status_code == 404)
+    # a parameter inside a segment falls back to the path regex
+    assert(router.dispatch(factory.get("/"), "router/files/report.json").content == b"file report")
+    assert(router.dispatch(factory.get("/"), "router/files/report.xml").status_code == 404)
+
+    handler, args = router.resolve("/router/users/7/books/x", "GET")
+    assert(args == ["7", "x"])
+
+    @swagger_api(path="/router/late/{id}", method="get", parameters=[(IntField(name="id"), "path")])
+    def late(request, id):
+        return HttpResponse("late {}".format(id))
+    assert(router.dispatch(factory.get("/"), "router/late/5").content == b"late 5")
+
+
+def test_router_django_urls():
+    patterns = _Swagger.gen_django_urls(use_router=True, prefix="/api/")
+    # a second, async pattern first once any async def handler is registered, see test_async
+    assert(len(patterns) in (1, 2) and not iscoroutinefunction(patterns[-1].callback))
+    match = [m for m in (p.resolve("api/router/users/me") for p in patterns) if m][0]
+    assert(not iscoroutinefunction(match.func))
+    response = match.func(factory.get("/api/router/users/me"), *match.args, **match.kwargs)
+    assert(response.content == b"me")
@@ -1,5 +1,5 @@
 # encoding: utf-8
-from openapi.schema import schema_model, SchemaBaseModel
+from openapi.schema import schema_model, SchemaBaseModel, BatchValidationError
 from openapi.schema.field import IntField, StringField, ListField,ObjectField,FloatField,AnyOfField, AllOfField, BoolField
 # import simplejson as json
 import json
@@ -148,11 +148,174 @@ def test_default_params():
     s = ServerDemo2(hello="ssd", **opts)
     assert(s.to_dict() ==  {'is_default': True, 'params': []})
 
+
+@schema_model(compiled=True)
+class CompiledDemo(object):
+    age = IntField(default=0, required=True, min_value=10, max_value=20)
+    name = StringField(default="test123", max_length=10)
+    ratio = FloatField(name="rate", min_value=0.0)
+    enabled = BoolField()
+    ids = ListField(item_field=IntField)
+    servers = ListField(item_field=Server)
+    foos = ObjectField(Foo)
+    demo = 1
+
+def test_compiled_model():
+    data = CompiledDemo(age="11", rate=0.5, enabled="true", ids=["1", 2], servers=[{"port": 8080}], foos={"double": 2})
+    assert(data.to_dict() == {'age': 11, 'demo': 1, 'enabled': True, 'foos': {'double': 2.0}, 'ids': [1, 2], 'rate': 0.5, 'servers': [{'port': 8080}]})
+    assert(isinstance(data.servers[0], Server))
+
+    for kwags in ({}, {"age": 9}, {"age": 10, "name": "x" * 11}, {"age": 10, "enabled": "yes"}, {"age": 10, "ids": [1, "a"]}):
+        try:
+            CompiledDemo(**kwags)
+            assert False, kwags
+        except ValueError:
+            pass
+
+@schema_model(is_default=True, compiled=True)
+class CompiledDefault(object):
+    name = StringField(default="test123")
+
+def test_compiled_default():
+    assert(CompiledDefault().to_dict() == {'name': 'test123'})
+
+
+@schema_model(compact=True)
+class CompactServer(Server):
+    tags = ListField(item_field=StringField)
+    bars = ObjectField(classobj=Bar)
+    demo = 1
+
+    def address(self):
+        return "{}:{}".format(self.host, self.port)
+
+def test_compact_model():
+    s = CompactServer(host="127.0.0.1", port="8080", bars={"bar": "b"})
+    assert(not hasattr(s, '__dict__'))
+    assert(s.address() == "127.0.0.1:8080")
+    assert(s.to_dict() == {'bars': {'bar': 'b'}, 'demo': 1, 'host': '127.0.0.1', 'port': 8080})
+    assert(s.to_dict(only=['host']) == {'host': '127.0.0.1'})
+    assert(json.dumps(s, default=lambda obj: obj.__json__()) == json.dumps(s.to_dict()))
+    assert(s['port'] == 8080 and s['protocol'] is None)
+
+    s.port = "9090"
+    assert(s.port == 9090)
+    try:
+        s.protocol = "https"
+        assert False
+    except AttributeError:
+        pass
+    try:
+        CompactServer(port=1)
+        assert False
+    except ValueError:
+        pass
+
+    data = ListField(CompactServer).validate('servers', [{"host": "a.example.com"}, {"port": 81}])
+    assert([d.to_dict() for d in data] == [{'demo': 1, 'host': 'a.example.com'}, {'demo': 1, 'port': 81}])
+
+
+def test_validate_many():
+    rows = [{"host": "a.example.com", "port": "8080"}, {"protocol": "https"}, Server(port=81)]
+    for model in (Server, CompactServer):
+        data = model.validate_many(rows[:2])
+        assert([d.to_dict() for d in data] == [model(**row).to_dict() for row in rows[:2]])
+    assert(Server.validate_many(rows)[2] is rows[2])
+
+    try:
+        Server.validate_many([{"port": 1}, {"host": "ok"}, {"port": "x", "host": "h"}, {"port": 70000}, "row"])
+        assert False
+    except BatchValidationError as e:
+        assert([index for index, _ in e.errors] == [0, 2, 2, 3, 4])
+        assert(e.errors[0][1] == "<Server.port> should be larger than 2")
+
+    data = ListField(item_field=Server, batch=True, is_to_dict=True).validate('servers', [{"port": 8080}])
+    assert(data == [{'port': 8080}])
+
+
+def test_string_pattern_and_format():
+    field = StringField(name="code", pattern=r"a|ab")
+    assert(field.validate("code", "ab") == "ab")
+    assert(field.compile("code")("a") == "a")
+    for value in ("abc", "b"):
+        try:
+            field.validate("code", value)
+            assert False
+        except ValueError:
+            pass
+    try:
+        StringField(pattern="(")
+        assert False
+    except ValueError:
+        pass
+    # global inline flags must stay at the start of the pattern
+    field = StringField(name="x", pattern="(?i)abc")
+    assert(field.validate("x", "ABC") == "ABC")
+    try:
+        field.validate("x", "abcd")
+        assert False
+    except ValueError:
+        pass
+
+    samples = {
+        "date": ("2024-02-29", "2023-02-29"),
+        "date-time": ("2024-01-01T10:20:30.5+08:00", "2024-01-01T24:00:00Z"),
+        "uuid": ("123e4567-e89b-12d3-a456-426614174000", "123e4567e89b12d3a456426614174000"),
+        "email": ("tom@example.com", "tom@example"),
+        "ipv4": ("192.168.0.1", "192.168.0.256"),
+        "ipv6": ("::1", "1::2::3"),
+        "uri": ("https://example.com/a?b=1", "example.com"),
+    }
+    # only ASCII digits are IPv4 octets
+    assert(not StringField(format="ipv4").format_checker(u"1.2.3.\u0664"))
+    for format, (good, bad) in samples.items():
+        field = StringField(format=format)
+        assert(field.validate(format, good) == good)
+        for validate in (lambda v: field.validate(format, v), field.compile(format)):
+            try:
+                validate(bad)
+                assert False, (format, bad)
+            except ValueError:
+                pass
+    # unknown formats are documented only
+    assert(StringField(format="password").validate("password", "x") == "x")
+
+
+def test_serializer_cache():
+    @schema_model
+    class Tag(object):
+        name = StringField()
+        weight = IntField(default=1)
+
+    @schema_model
+    class Post(object):
+        title = StringField(default="untitled")
+        tags = ListField(item_field=Tag)
+        top = ObjectField(Tag)
+
+    post = Post(tags=[{"name": "a"}], top={"name": "b"})
+    assert(post.to_dict() == {"tags": [{"name": "a"}], "top": {"name": "b"}})
+    assert(post.to_dict(is_default=True) == post.to_dict())
+    assert(post.to_dict(only=["title"], remove=["tags"]) == {})
+    # the projection applies to nested models too
+    assert(post.to_dict(only=["tags"]) == {"tags": [{}]})
+    assert(list(post.to_dict(remove=["top"]).keys()) == ["tags"])
+
+    for compact in (False, True):
+        @schema_model(compact=compact)
+        class Item(object):
+            id = IntField()
+            note = StringField(default="-")
+        item = Item(id=3, note="x")
+        assert(item.to_dict() == {"id": 3, "note": "x"})
+        assert(item.to_dict(remove=["note"]) == {"id": 3})
+        assert(item.to_dict(only=["note"]) == {"note": "x"})
+        if compact:
+            assert(len(Item._serializers) == 3)
+
+
 if __name__ == '__main__':
     test_validate()
     test_list_validate()
     test_list_object_validate()
     test_object_validate()
-
-
-   
\ No newline at end of file
@@ -0,0 +1,193 @@
+# encoding: utf-8
+from openapi import swagger_api, swagger_setup, warmup, register_swagger_object_model, _Swagger
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField
+
+
+def test_lazy_spec():
+    @register_swagger_object_model
+    @schema_model
+    class LazyUser(object):
+        name = StringField(max_length=20)
+
+    @swagger_api(path="/spec/lazy/{id}", method="get", parameters=[(IntField(name="id"), "path")])
+    def lazy(request, id):
+        """
+        ---
+        summary: lazy endpoint
+        responses:
+          '200':
+            description: OK
+        """
+
+    assert("/spec/lazy/{id}" not in _Swagger.paths)
+    assert("LazyUser" not in _Swagger.models)
+    warmup()
+    assert(not _Swagger.pending)
+    assert(_Swagger.paths["/spec/lazy/{id}"]["get"]["summary"] == "lazy endpoint")
+    assert(_Swagger.models["LazyUser"] == {"type": "object", "properties": {"name": {"type": "string", "maxLength": 20}}})
+
+    @swagger_api(path="/spec/lazy/{id}", method="delete", parameters=[(IntField(name="id"), "path")])
+    def lazy_delete(request, id):
+        pass
+
+    doc = swagger_setup(title="lazy")["swagger_doc"]
+    assert(sorted(doc["paths"]["/spec/lazy/{id}"]) == ["delete", "get"])
+
+
+def test_spec_view():
+    import gzip
+    import json
+    from django.test import RequestFactory
+    from openapi.views import swagger_spec_view
+
+    factory = RequestFactory()
+    view = swagger_spec_view(title="cached", version="1.0.0")
+    response = view(factory.get("/docs"))
+    assert(response.status_code == 200 and response["Content-Type"] == "application/json")
+    assert(json.loads(response.content)["info"]["title"] == "cached")
+    etag = response["ETag"]
+    assert(view(factory.get("/docs", HTTP_IF_NONE_MATCH=etag)).status_code == 304)
+
+    response = view(factory.get("/docs", HTTP_ACCEPT_ENCODING="gzip, deflate"))
+    assert(response["Content-Encoding"] == "gzip" and response["ETag"] != etag)
+    assert(json.loads(gzip.decompress(response.content))["info"]["title"] == "cached")
+    for encoding in ("gzip;q=0, deflate", "identity", "*;q=0.5, gzip;q=0"):
+        assert(not view(factory.get("/docs", HTTP_ACCEPT_ENCODING=encoding)).has_header("Content-Encoding"))
+    assert(view(factory.get("/docs", HTTP_ACCEPT_ENCODING="br, *;q=0.1"))["Content-Encoding"] == "gzip")
+
+    response = view(factory.get("/docs", {"format": "yaml"}))
+    assert(response["Content-Type"] == "application/yaml" and b"title: cached" in response.content)
+
+    @swagger_api(path="/spec/cached", method="get")
+    def cached(request):
+        pass
+
+    response = view(factory.get("/docs", HTTP_IF_NONE_MATCH=etag))
+    assert(response.status_code == 200 and response["ETag"] != etag)
+    assert("/spec/cached" in json.loads(response.content)["paths"])
+
+
+def test_doc_cache(tmp_path):
+    from openapi import build_swagger_docs
+    from openapi.doccache import SwaggerDocCache, doc_cache
+
+    doc = """
+    ---
+    summary: cached
+    responses:
+      '200':
+        description: OK
+    """
+    first = build_swagger_docs(doc)
+    first["summary"] = "changed"
+    hits = doc_cache.hits
+    assert(build_swagger_docs(doc)["summary"] == "cached")
+    assert(doc_cache.hits == hits + 1)
+
+    path = str(tmp_path / "docs.cache")
+    cache = SwaggerDocCache()
+    cache.configure(path)
+    cache.load("summary: persisted")
+    cache.save()
+    restarted = SwaggerDocCache()
+    restarted.configure(path)
+    assert(restarted.load("summary: persisted") == {"summary": "persisted"})
+    assert(restarted.stats()["hits"] == 1 and restarted.stats()["misses"] == 0)
+
+
+def test_component_registry():
+    from openapi import gen_model_doc
+    from openapi.schema.field import ListField, ObjectField
+
+    @schema_model
+    class TreeLeaf(object):
+        value = IntField()
+
+    @schema_model
+    class TreeNode(object):
+        """A node"""
+        name = StringField()
+        leaf = ObjectField(TreeLeaf)
+
+    # self reference, only possible once the class exists
+    TreeNode.get_validate_func_map()["children"] = ListField(item_field=TreeNode)
+
+    schema = gen_model_doc(TreeNode)
+    assert(schema is gen_model_doc(TreeNode))
+    assert(schema["properties"]["children"] == {"type": "array", "items": {"$ref": "#/components/schemas/TreeNode"}})
+    assert(schema["properties"]["leaf"] == {"$ref": "#/components/schemas/TreeLeaf"})
+    assert(_Swagger.models["TreeLeaf"] == {"type": "object", "properties": {"value": {"type": "integer"}}})
+    assert(_Swagger.models["TreeNode"] is schema)
+
+
+def test_spec_shards():
+    import json
+    from django.test import RequestFactory
+    from openapi import gen_swagger_shard
+    from openapi.schema.field import ObjectField, ListField
+    from openapi.views import swagger_shard_view
+
+    @schema_model
+    class ShardAddress(object):
+        city = StringField()
+
+    @schema_model
+    class ShardUser(object):
+        name = StringField()
+        address = ObjectField(ShardAddress)
+
+    @schema_model
+    class ShardInvoice(object):
+        total = IntField()
+
+    @register_swagger_object_model
+    @schema_model
+    class ShardUnused(object):
+        note = StringField()
+
+    @swagger_api(path="/shard/users", method="post", tags=["shard-users"], request_body=ListField(name="users", item_field=ShardUser))
+    def users(request, users):
+        pass
+
+    @swagger_api(path="/shard/users/{id}/invoices", method="get", tags=["shard-billing"],
+                 parameters=[(IntField(name="id"), "path")], responses=[{"response": ListField(item_field=ShardInvoice)}])
+    def invoices(request, id):
+        pass
+
+    shard = gen_swagger_shard(tag="shard-users", title="users", tags=[{"name": "shard-users"}, {"name": "shard-billing"}])
+    assert(list(shard["paths"]) == ["/shard/users"])
+    assert(sorted(shard["components"]["schemas"]) == ["ShardAddress"])
+    assert(shard["tags"] == [{"name": "shard-users"}])
+    shard = gen_swagger_shard(prefix="/shard/users/")
+    assert(list(shard["paths"]) == ["/shard/users/{id}/invoices"])
+    assert("ShardUnused" not in shard["components"]["schemas"])
+    # prefixes match whole segments
+    assert(list(gen_swagger_shard(prefix="/shard/users/{id}/invoices")["paths"]) == ["/shard/users/{id}/invoices"])
+    for prefix in ("/shard/user", "/shard/users/{id}/inv"):
+        try:
+            gen_swagger_shard(prefix=prefix)
+            assert False, prefix
+        except LookupError:
+            pass
+    try:
+        gen_swagger_shard(tag="shard-nobody")
+        assert False
+    except LookupError:
+        pass
+
+    factory = RequestFactory()
+    view = swagger_shard_view(title="shards")
+    response = view(factory.get("/"), tag="shard-billing")
+    assert(list(json.loads(response.content)["paths"]) == ["/shard/users/{id}/invoices"])
+    response = view(factory.get("/", {"prefix": "shard/users"}))
+    assert(sorted(json.loads(response.content)["paths"]) == ["/shard/users", "/shard/users/{id}/invoices"])
+    assert(view(factory.get("/"), tag="shard-nobody").status_code == 404)
+    assert(set(view.caches) == set([(None, "/shard/users"), ("shard-billing", None)]))
+    etag = view(factory.get("/"), tag="shard-billing")["ETag"]
+
+    @swagger_api(path="/shard/invoices", method="get", tags=["shard-billing"])
+    def all_invoices(request):
+        pass
+    response = view(factory.get("/", HTTP_IF_NONE_MATCH=etag), tag="shard-billing")
+    assert(response.status_code == 200 and "/shard/invoices" in json.loads(response.content)["paths"])
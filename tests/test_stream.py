@@ -0,0 +1,109 @@
+# encoding: utf-8
+import io
+import json
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api
+from openapi.stream import iter_json_array, iter_validated_items
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, ListField
+
+factory = RequestFactory()
+
+
+@schema_model
+class StreamItem(object):
+    id = IntField(required=True, min_value=1)
+    name = StringField(max_length=8)
+
+
+def test_iter_json_array():
+    data = [1, 23456, "a,]b", {"x": [1, {"y": "é"}]}, None, 1.5e3, True]
+    raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    for chunk_size in (1, 2, 7, 1024):
+        assert(list(iter_json_array(io.BytesIO(raw), chunk_size)) == data)
+    assert(list(iter_json_array(io.BytesIO(b" [ ] "))) == [])
+    for bad in (b"", b"{}", b"[1 2]", b"[1,", b"[1] x"):
+        try:
+            list(iter_json_array(io.BytesIO(bad), 2))
+            assert False, bad
+        except ValueError:
+            pass
+
+
+def test_malformed_element_fails_fast():
+    class Body(io.BytesIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return io.BytesIO.read(self, size)
+
+    for bad in (b'[1, x, ', b'[{"a" 2}, ', b'["\\q", '):
+        body = Body(bad + b'{"a": 1}, ' * 100000 + b'1]')
+        try:
+            list(iter_json_array(body, 16))
+            assert False, bad
+        except ValueError:
+            pass
+        assert(body.reads < 5)
+
+
+def test_iter_validated_items():
+    field = ListField(item_field=StreamItem, name="items", max_items=3)
+    body = io.BytesIO(b'[{"id": 1}, {"id": "2", "name": "b"}]')
+    assert(list(iter_validated_items(body, field, chunk_size=4)) == [{"id": 1}, {"id": 2, "name": "b"}])
+
+    class Body(io.BytesIO):
+        reads = 0
+        def read(self, size=-1):
+            Body.reads += 1
+            return io.BytesIO.read(self, size)
+
+    body = Body(b'[{"id": 1}, {"id": 0}, ' + b'{"id": 3}, ' * 1000 + b'{"id": 4}]')
+    items = iter_validated_items(body, field, chunk_size=16)
+    assert(next(items) == {"id": 1})
+    try:
+        next(items)
+        assert False
+    except ValueError as e:
+        assert("larger than 1" in str(e))
+    assert(Body.reads < 5)
+
+    body = io.BytesIO(b'[' + b'{"id": 1},' * 3 + b'{"id": 1}]')
+    try:
+        list(iter_validated_items(body, field))
+        assert False
+    except ValueError as e:
+        assert("maximum" in str(e))
+
+
+def test_stream_request_body():
+    @swagger_api(path="/stream/items", method="post", stream_request_body=True,
+                 request_body=ListField(item_field=StreamItem, name="items"))
+    def upload(request, items):
+        return HttpResponse(str(sum(item["id"] for item in items)))
+
+    request = factory.post("/stream/items", data=json.dumps([{"id": i} for i in range(1, 101)]),
+                           content_type="application/json")
+    assert(upload(request).content == b"5050")
+
+
+def test_streaming_response():
+    from openapi import gen_response
+    from openapi.stream import iter_json, streaming_response
+
+    items = [StreamItem(id=i, name="n{}".format(i)) for i in range(1, 4)] + [{"id": 9}]
+    for chunk_size in (1, 1024):
+        raw = b"".join(iter_json(iter(items), chunk_size=chunk_size))
+        assert(json.loads(raw) == [{"id": 1, "name": "n1"}, {"id": 2, "name": "n2"}, {"id": 3, "name": "n3"}, {"id": 9}])
+    assert(b"".join(iter_json([])) == b"[]")
+
+    response = streaming_response(iter(items), ndjson=True, only=["id"])
+    assert(response["Content-Type"] == "application/x-ndjson")
+    lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+    assert([json.loads(line) for line in lines] == [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 9}])
+
+    doc = gen_response(ListField(item_field=StreamItem), content_type="application/x-ndjson", stream=True)
+    media = doc["200"]["content"]["application/x-ndjson"]
+    assert(media["x-stream"] is True and media["schema"]["properties"]["id"] == {"type": "integer", "minimum": 1})
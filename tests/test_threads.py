@@ -0,0 +1,82 @@
+# encoding: utf-8
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.http import HttpResponse
+from django.test import RequestFactory
+from openapi import swagger_api, gen_swagger_doc, _Swagger
+from openapi.router import Router
+from openapi.schema import schema_model
+from openapi.schema.field import IntField, StringField, ListField
+
+factory = RequestFactory()
+
+
+@schema_model
+class Line(object):
+    sku = StringField(required=True, max_length=8)
+    qty = IntField(min_value=1)
+
+
+body = ListField(name="lines", item_field=Line)
+
+
+@swagger_api(path="/threads/orders/{id}", method="post", request_body=body,
+             parameters=[(IntField(name="id", min_value=1), "path"), (ListField(name="tags", item_field=StringField()), "query")])
+def post_order(request, id, lines=None, tags=None):
+    return HttpResponse(json.dumps({"id": id, "lines": lines, "tags": tags}))
+
+
+def test_frozen_fields():
+    assert(body.is_to_dict is False)
+    for field in (body, body.item_field.get_validate_func_map()["qty"]):
+        try:
+            field.is_to_dict = True
+            assert False
+        except AttributeError:
+            pass
+
+
+def test_thread_stress():
+    router = Router(_Swagger.handlers)
+    stop = threading.Event()
+
+    def declare():
+        # registrations and spec builds racing with the requests
+        count = 0
+        while not stop.is_set():
+            if count < 20:
+                @swagger_api(path="/threads/late{}/{}".format(threading.get_ident(), count), method="get")
+                def late(request):
+                    return HttpResponse("late")
+            gen_swagger_doc(title="stress")
+            count += 1
+        return count
+
+    def order(i):
+        lines = [{"sku": "s{}".format(i % 100), "qty": i % 7 + 1}]
+        request = factory.post("/?tags=t{}&tags=x".format(i), json.dumps(lines), content_type="application/json")
+        if i % 5 == 0:
+            response = router.dispatch(request, "threads/orders/{}".format(i + 1))
+        else:
+            response = post_order(request, str(i + 1))
+        assert(json.loads(response.content) == {"id": i + 1, "lines": lines, "tags": ["t{}".format(i), "x"]})
+        try:
+            post_order(factory.post("/", '[{"qty": 1}]', content_type="application/json"), str(i + 1))
+            assert False
+        except ValueError:
+            pass
+        return i
+
+    with ThreadPoolExecutor(max_workers=4) as declarers:
+        futures = [declarers.submit(declare) for _ in range(2)]
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            assert(sorted(pool.map(order, range(1500))) == list(range(1500)))
+        stop.set()
+        declared = sum(min(20, future.result()) for future in futures)
+
+    doc = gen_swagger_doc(title="stress")
+    assert("/threads/orders/{id}" in doc["paths"])
+    assert(len([path for path in doc["paths"] if path.startswith("/threads/late")]) == declared)
+    assert(body.is_to_dict is False)